@@ -0,0 +1,106 @@
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+FIXTURES = Path(__file__).parent.parent / "tests" / "fixtures"
+
+Route = Callable[[re.Match, Dict[str, List[str]]], Tuple[int, Any]]
+
+
+def fixture(name: str) -> Dict[str, Any]:
+    return json.loads((FIXTURES / f"{name}.json").read_text())
+
+
+class StandInServer:
+    """A local HTTP server standing in for app.mode.com in benchmarks."""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.routes: List[Tuple[re.Pattern, Route]] = []
+        self.connections = 0
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/api"
+
+    def route(self, pattern: str, handler: Route) -> None:
+        self.routes.append((re.compile(f"^/api/[^/]+{pattern}$"), handler))
+
+    def reset(self) -> None:
+        with self._lock:
+            self.connections = 0
+            self.requests = 0
+
+    def __enter__(self) -> "StandInServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler(self) -> type:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def setup(self) -> None:
+                super().setup()
+                with server._lock:
+                    server.connections += 1
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+            def do_GET(self) -> None:
+                with server._lock:
+                    server.requests += 1
+                if server.latency:
+                    time.sleep(server.latency)
+
+                url = urlsplit(self.path)
+                for pattern, handler in server.routes:
+                    match = pattern.match(url.path)
+                    if match:
+                        status, body = handler(match, parse_qs(url.query))
+                        break
+                else:
+                    status, body = 404, {"error": "not found"}
+
+                payload = body if isinstance(body, bytes) else json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_POST(self) -> None:
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                self.do_GET()
+
+        return Handler
+
+
+def serve_fixture(name: str, overrides: Optional[Dict[str, str]] = None) -> Route:
+    body = fixture(name)
+
+    def handler(match: re.Match, query: Dict[str, List[str]]) -> Tuple[int, Any]:
+        return 200, {
+            **body,
+            **{k: match.group(v) for k, v in (overrides or {}).items()},
+        }
+
+    return handler
@@ -0,0 +1,57 @@
+"""Turning a large listing of report runs into columns: validated models and a
+``.dict()`` loop, as analysts do today, vs ``build_columns`` on the raw items,
+and on to an Arrow table when pyarrow is installed.
+
+    poetry run python benchmarks/bench_columns.py [runs]
+"""
+import importlib.util
+import sys
+import time
+
+from _server import fixture
+
+from mode_client.columns import build_columns
+from mode_client.models import ReportRun
+from mode_client.timestamps import parse_timestamp
+
+STATES = ["succeeded", "failed", "running_notebook", "pending"]
+
+
+def synthetic_runs(count):
+    run = fixture("report_run")
+    return [
+        {**run, "token": f"r{i:08x}", "state": STATES[i % len(STATES)]}
+        for i in range(count)
+    ]
+
+
+def dict_loop(items):
+    """The status quo, with the timestamps parsed so both sides match."""
+    rows = [ReportRun.parse_obj(item).dict() for item in items]
+    columns = {name: [row[name] for row in rows] for name in rows[0]}
+    for name in ("created_at", "updated_at", "completed_at"):
+        columns[name] = [parse_timestamp(v) if v else None for v in columns[name]]
+    return columns
+
+
+def main(count: int) -> None:
+    items = synthetic_runs(count)
+    methods = {
+        ".dict() loop": dict_loop,
+        "build_columns": lambda items: build_columns(ReportRun, items),
+    }
+    if importlib.util.find_spec("pyarrow"):
+        methods["to_arrow"] = lambda items: build_columns(ReportRun, items).to_arrow()
+
+    print(f"{count:,} report runs")
+    baseline = None
+    for label, build in methods.items():
+        start = time.perf_counter()
+        build(items)
+        seconds = time.perf_counter() - start
+        baseline = baseline or seconds
+        print(f"{label:<14} {seconds:>7.2f}s {baseline / seconds:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
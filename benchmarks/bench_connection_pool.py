@@ -0,0 +1,45 @@
+"""Compare per-call clients against one pooled ModeClient.
+
+Each fresh ModeBaseClient opens its own connection (and, against
+app.mode.com, its own TLS handshake). The stand-in server counts accepted
+connections so the number of handshakes saved is visible directly.
+
+    poetry run python benchmarks/bench_connection_pool.py [n_requests]
+"""
+import sys
+import time
+
+from _server import StandInServer, serve_fixture
+
+from mode_client import ModeClient
+from mode_client.clients import ModeReportClient
+
+
+def main(n: int) -> None:
+    with StandInServer() as server:
+        server.route(r"/reports/(\w+)", serve_fixture("report", {"token": 1}))
+
+        start = time.perf_counter()
+        for i in range(n):
+            client = ModeReportClient("ws", "t", "p", base_url=server.base_url)
+            client.get(f"report{i}")
+            client.close()
+        fresh = time.perf_counter() - start
+        fresh_connections = server.connections
+
+        server.reset()
+        start = time.perf_counter()
+        with ModeClient("ws", "t", "p", base_url=server.base_url) as client:
+            for i in range(n):
+                client.report.get(f"report{i}")
+        pooled = time.perf_counter() - start
+        pooled_connections = server.connections
+
+    print(f"{'mode':<8} {'requests':>8} {'connections':>12} {'seconds':>8}")
+    print(f"{'fresh':<8} {n:>8} {fresh_connections:>12} {fresh:>8.3f}")
+    print(f"{'pooled':<8} {n:>8} {pooled_connections:>12} {pooled:>8.3f}")
+    print(f"handshakes saved: {fresh_connections - pooled_connections}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
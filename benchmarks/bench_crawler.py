@@ -0,0 +1,77 @@
+"""Wall-clock time of snapshotting a synthetic workspace with WorkspaceCrawler
+at increasing concurrency, against a stand-in server with per-request latency.
+
+    poetry run python benchmarks/bench_crawler.py [spaces] [reports_per_space] [latency]
+"""
+import sys
+import tempfile
+from pathlib import Path
+
+from _server import StandInServer, fixture
+
+from mode_client import ModeClient, WorkspaceCrawler
+
+
+def listing(key, name, tokens, **fields):
+    item = fixture(name)
+    return 200, {
+        "_embedded": {
+            key: [
+                {**item, "token": token, **{f: v(token) for f, v in fields.items()}}
+                for token in tokens
+            ]
+        }
+    }
+
+
+def main(spaces: int, reports: int, latency: float) -> None:
+    run = fixture("report_run")
+    routes = {
+        r"/spaces": lambda m, q: listing(
+            "spaces", "space", [f"s{i}" for i in range(spaces)]
+        ),
+        r"/definitions": lambda m, q: listing("definitions", "definition", ["d"]),
+        r"/spaces/(\w+)/reports": lambda m, q: listing(
+            "reports",
+            "report",
+            [f"{m.group(1)}r{i}" for i in range(reports)],
+            last_successful_run_token=lambda token: f"{token}x",
+        ),
+        r"/reports/(\w+)/queries": lambda m, q: listing(
+            "queries", "query", [f"{m.group(1)}q{i}" for i in range(3)]
+        ),
+        r"/reports/\w+/runs/(\w+)": lambda m, q: (200, {**run, "token": m.group(1)}),
+        r"/reports/\w+/runs/(\w+)/query_runs": lambda m, q: listing(
+            "query_runs", "query_run", [f"{m.group(1)}qr{i}" for i in range(3)]
+        ),
+    }
+
+    print(
+        f"{'concurrency':>11} {'tasks':>6} {'records':>8} {'seconds':>8} {'tasks/s':>8}"
+    )
+    with StandInServer(latency=latency) as server:
+        for pattern, handler in routes.items():
+            server.route(pattern, handler)
+
+        for concurrency in (1, 4, 8, 16):
+            snapshot = Path(tempfile.mkdtemp()) / "snapshot.jsonl"
+            with ModeClient(
+                "ws", "t", "p", base_url=server.base_url, max_connections=16
+            ) as client:
+                crawler = WorkspaceCrawler(client, snapshot, concurrency=concurrency)
+                progress = crawler.run()
+                crawler.snapshot.close()
+
+            print(
+                f"{concurrency:>11} {progress.done:>6} {progress.records:>8,}"
+                f" {progress.elapsed:>8.2f} {progress.tasks_per_second:>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(
+        int(args[0]) if args else 5,
+        int(args[1]) if len(args) > 1 else 20,
+        float(args[2]) if len(args) > 2 else 0.05,
+    )
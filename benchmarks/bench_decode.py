@@ -0,0 +1,94 @@
+"""Decoding listing pages built from the recorded fixtures with each installed
+JSON backend, on its own and followed by pydantic validation, vs msgspec
+decoding straight into the models, and a client's whole GET of a page with
+``json_decoder="json"`` and ``"msgspec"``.
+
+    poetry run python benchmarks/bench_decode.py [objects]
+"""
+import json
+import sys
+import time
+from typing import List
+
+import httpx
+from _server import fixture
+from pydantic import parse_obj_as
+
+from mode_client import ModeClient
+from mode_client.clients import call, paged
+from mode_client.decoders import DECODERS, MsgspecDecoder
+from mode_client.models import Query, QueryRun, Report, ReportRun, Space
+
+LISTINGS = {
+    "reports": ("report", Report),
+    "spaces": ("space", Space),
+    "queries": ("query", Query),
+    "query_runs": ("query_run", QueryRun),
+    "report_runs": ("report_run", ReportRun),
+}
+
+
+def installed():
+    for name, cls in DECODERS.items():
+        try:
+            yield name, cls()
+        except ImportError:
+            print(f"{name} is not installed, skipping it")
+
+
+def client_listing(decoder, page, model, key):
+    """A client's whole GET of one listing page, from the transport's bytes."""
+    client = ModeClient(
+        "ws",
+        "t",
+        "p",
+        transport=httpx.MockTransport(
+            lambda request: httpx.Response(200, content=page)
+        ),
+        json_decoder=decoder,
+    )
+    listing = call("GET", "/listing", paged(model, key))
+    return lambda: client.report._send(listing)
+
+
+def main(objects: int) -> None:
+    decoders = dict(installed())
+    print(f"{'listing':<12} {'method':<24} {'objects/s':>10}")
+    for key, (name, model) in LISTINGS.items():
+        page = json.dumps({"_embedded": {key: [fixture(name)] * 100}}).encode()
+        pages = max(1, objects // 100)
+
+        methods = {}
+        for label, decoder in decoders.items():
+            methods[label] = lambda d=decoder: d.decode(page)
+        for label, decoder in decoders.items():
+            methods[f"{label}+parse_obj_as"] = lambda d=decoder: parse_obj_as(
+                List[model], d.decode(page)["_embedded"][key]
+            )
+        if isinstance(decoders.get("msgspec"), MsgspecDecoder):
+            msgspec = decoders["msgspec"]
+            methods["msgspec decode_models"] = lambda: msgspec.decode_models(
+                page, model, key
+            )
+        for label in ("json", "msgspec"):
+            if label in decoders:
+                methods[f"{label} client"] = client_listing(label, page, model, key)
+
+        rates = {}
+        for label, decode in methods.items():
+            start = time.perf_counter()
+            for _ in range(pages):
+                decode()
+            rates[label] = pages * 100 / (time.perf_counter() - start)
+
+        # Relative to what clients do by default: stdlib json, then pydantic.
+        baseline = rates["json+parse_obj_as"]
+        for label, per_second in rates.items():
+            print(
+                f"{key:<12} {label:<24} {per_second:>10,.0f}"
+                f"  {per_second / baseline:>5.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
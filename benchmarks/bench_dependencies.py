@@ -0,0 +1,68 @@
+"""Impact analysis on a DependencyGraph of a large synthetic workspace: a cold
+and a cached lookup, and updating one query, against scanning every query's
+SQL for references.
+
+    poetry run python benchmarks/bench_dependencies.py [queries]
+"""
+import random
+import sys
+import time
+
+from mode_client.dependencies import DependencyGraph, definition_references
+
+DEFINITIONS = 500
+
+
+def timed(label, run):
+    start = time.perf_counter()
+    result = run()
+    print(f"{label:<14} {(time.perf_counter() - start) * 1000:>9.2f} ms")
+    return result
+
+
+def main(count: int) -> None:
+    rng = random.Random(0)
+    definitions = [
+        {
+            "token": f"d{i}",
+            "name": f"definition_{i}",
+            "source": f"SELECT * FROM {{{{ @definition_{i - 1} }}}}" if i % 10 else "",
+        }
+        for i in range(DEFINITIONS)
+    ]
+    queries = [
+        {
+            "token": f"q{i}",
+            "raw_query": " JOIN ".join(
+                f"{{{{ @definition_{d} }}}}" for d in rng.sample(range(DEFINITIONS), 3)
+            ),
+        }
+        for i in range(count)
+    ]
+
+    graph = DependencyGraph()
+    start = time.perf_counter()
+    graph.add_definitions(definitions)
+    for i, query in enumerate(queries):
+        graph.add_query(query, f"r{i // 4}")
+    print(f"{count:,} queries graphed in {time.perf_counter() - start:.2f}s")
+
+    impact = timed("impact", lambda: graph.impact("d20"))
+    timed("cached", lambda: graph.impact("d20"))
+    timed("update query", lambda: graph.add_query(queries[0], "r0"))
+    timed(
+        "scan (direct)",
+        lambda: [
+            q
+            for q in queries
+            if "definition_20" in definition_references(q["raw_query"])
+        ],
+    )
+    print(
+        f"d20 reaches {len(impact.definitions)} definitions, "
+        f"{len(impact.queries):,} queries and {len(impact.reports):,} reports"
+    )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
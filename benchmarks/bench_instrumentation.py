@@ -0,0 +1,67 @@
+"""Per-request cost of instrumentation: none, hooks only, the built-in
+metrics, and metrics plus a hook, over an in-process transport so only the
+client's own work is timed; the best of five rounds is shown.
+
+    poetry run python benchmarks/bench_instrumentation.py [requests]
+"""
+import sys
+import time
+
+import httpx
+from _server import fixture
+
+from mode_client import ModeClient
+from mode_client.instrumentation import Instrumentation
+from mode_client.stats import RequestStats
+
+
+def main(count: int) -> None:
+    body = fixture("report_run")
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, json=body))
+
+    def hooked():
+        instrumentation = Instrumentation()
+        instrumentation.on("response", lambda event, stats: None)
+        return instrumentation
+
+    setups = {
+        "none": lambda: None,
+        "no metrics": lambda: Instrumentation(metrics=False),
+        "metrics": Instrumentation,
+        "metrics + hook": hooked,
+    }
+
+    print(f"{count:,} requests")
+    baseline = None
+    for label, setup in setups.items():
+        client = ModeClient(
+            "ws", "t", "p", transport=transport, instrumentation=setup()
+        )
+        report_run = client.report_run
+        for _ in range(100):
+            report_run.get("r", "run")
+
+        rounds = []
+        for _ in range(5):
+            start = time.perf_counter()
+            for _ in range(count // 5):
+                report_run.get("r", "run")
+            rounds.append(time.perf_counter() - start)
+        micros = min(rounds) / (count // 5) * 1e6
+        baseline = baseline or micros
+        print(f"{label:<15} {micros:>7.1f} us/request {micros / baseline - 1:>+7.1%}")
+
+    # The events of one request on their own, free of the transport's noise.
+    for label, setup in list(setups.items())[1:]:
+        instrumentation = setup()
+        stats = RequestStats("GET", "/reports/r/runs/run", template="/reports/{report}")
+        start = time.perf_counter()
+        for _ in range(count):
+            for event in ("request", "response", "parse"):
+                instrumentation.emit(event, stats)
+        micros = (time.perf_counter() - start) / count * 1e6
+        print(f"{label:<15} {micros:>7.2f} us/request in events")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5_000)
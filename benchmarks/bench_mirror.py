@@ -0,0 +1,89 @@
+"""Audit questions answered from a Mirror of a large synthetic workspace: each
+helper's time, against the requests the same question takes through the API.
+
+    poetry run python benchmarks/bench_mirror.py [reports]
+"""
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from _server import fixture
+
+from mode_client.mirror import Mirror
+from mode_client.snapshot import SnapshotRecord, Task
+
+SPACES = 50
+DATA_SOURCES = 20
+NOW = datetime(2022, 12, 31, tzinfo=timezone.utc)
+
+
+def populate(mirror, count):
+    # Records are stored without their links, as a sync stores them.
+    report, query = fixture("report"), fixture("query")
+    del report["_links"], query["_links"]
+    per_space = count // SPACES
+    for s in range(SPACES):
+        space = f"s{s:03d}"
+        reports = [
+            {
+                **report,
+                "token": f"{space}r{r:05d}",
+                "space_token": space,
+                "last_successfully_run_at": f"2022-{r % 12 + 1:02d}-15T12:00:00Z",
+            }
+            for r in range(per_space)
+        ]
+        mirror.commit(
+            Task("reports", (space,)),
+            [SnapshotRecord("report", item["token"], space, item) for item in reports],
+            [],
+        )
+        for i, item in enumerate(reports):
+            queries = [
+                {
+                    **query,
+                    "token": f"{item['token']}q{q}",
+                    "data_source_id": str((i + q) % DATA_SOURCES),
+                }
+                for q in range(3)
+            ]
+            mirror.commit(
+                Task("queries", (item["token"],)),
+                [
+                    SnapshotRecord("query", q["token"], item["token"], q)
+                    for q in queries
+                ],
+                [],
+            )
+
+
+def main(count: int) -> None:
+    mirror = Mirror(Path(tempfile.mkdtemp()) / "mirror.db")
+    start = time.perf_counter()
+    populate(mirror, count)
+    print(f"{count:,} reports mirrored in {time.perf_counter() - start:.1f}s")
+
+    # A crawl lists the spaces, each space's reports and each report's queries.
+    crawl = 1 + SPACES + count
+    questions = {
+        "reports_using": (lambda: mirror.reports_using("7"), crawl),
+        "stale_reports": (
+            lambda: mirror.stale_reports(timedelta(days=90), now=NOW),
+            1 + SPACES,
+        ),
+        "reports(space)": (lambda: mirror.reports("s007"), 1),
+    }
+    print(f"{'question':<16} {'ms':>8} {'results':>8} {'API requests':>13}")
+    for label, (ask, requests) in questions.items():
+        start = time.perf_counter()
+        results = ask()
+        ms = (time.perf_counter() - start) * 1000
+        print(f"{label:<16} {ms:>8.1f} {len(results):>8,} {requests:>13,}")
+
+    mirror.close()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
@@ -0,0 +1,79 @@
+"""Objects per second and bytes per object when parsing the recorded fixtures
+with full validation (parse_obj, and parse_obj_as over a page) vs the
+``validate=False`` path, with and without touching ``links`` afterwards.
+
+    poetry run python benchmarks/bench_parse.py [objects]
+"""
+import sys
+import time
+import tracemalloc
+from typing import List
+
+from _server import fixture
+from pydantic import parse_obj_as
+
+from mode_client.lazy import construct_models
+from mode_client.models import (
+    Account,
+    Definition,
+    Query,
+    QueryRun,
+    Report,
+    ReportRun,
+    Space,
+)
+
+MODELS = {
+    "account": Account,
+    "report": Report,
+    "space": Space,
+    "query": Query,
+    "query_run": QueryRun,
+    "report_run": ReportRun,
+    "definition": Definition,
+}
+
+
+def measure(parse, page, objects):
+    pages = max(1, objects // len(page))
+    start = time.perf_counter()
+    for _ in range(pages):
+        parse(page)
+    per_second = pages * len(page) / (time.perf_counter() - start)
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = [parse(page) for _ in range(10)]
+    per_object = (tracemalloc.get_traced_memory()[0] - before) / (10 * len(page))
+    tracemalloc.stop()
+    del kept
+
+    return per_second, per_object
+
+
+def main(objects: int) -> None:
+    print(f"{'model':<11} {'method':<18} {'objects/s':>10} {'bytes/obj':>10}")
+    for name, model in MODELS.items():
+        page = [fixture(name)] * 100
+
+        def touch_links(items):
+            return [item.links.self.href for item in items] and items
+
+        methods = {
+            "parse_obj": lambda page: [model.parse_obj(item) for item in page],
+            "parse_obj_as": lambda page: parse_obj_as(List[model], page),
+            "lazy": lambda page: construct_models(model, page),
+            "lazy+links": lambda page: touch_links(construct_models(model, page)),
+        }
+        baseline = None
+        for label, parse in methods.items():
+            per_second, per_object = measure(parse, page, objects)
+            baseline = baseline or per_second
+            print(
+                f"{name:<11} {label:<18} {per_second:>10,.0f} {per_object:>10,.0f}"
+                f"  {per_second / baseline:>5.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
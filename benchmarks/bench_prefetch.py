@@ -0,0 +1,59 @@
+"""Wall-clock time of a 200-page report run listing with and without prefetching.
+
+The stand-in server sleeps before every response to mimic API latency.
+
+    poetry run python benchmarks/bench_prefetch.py [pages] [latency_seconds]
+"""
+import sys
+import time
+
+from _server import StandInServer, fixture
+
+from mode_client import ModeClient
+
+PER_PAGE = 30
+
+
+def main(pages: int, latency: float) -> None:
+    run = fixture("report_run")
+
+    def runs(match, query):
+        page = int(query["page"][0])
+        body = {
+            "pagination": {
+                "page": page,
+                "per_page": PER_PAGE,
+                "count": PER_PAGE,
+                "total_pages": pages,
+                "total_count": pages * PER_PAGE,
+            },
+            "_embedded": {"report_runs": [run] * PER_PAGE},
+        }
+        return 200, body
+
+    print(f"{'prefetch':>8} {'runs':>6} {'seconds':>8} {'speedup':>8}")
+    with StandInServer(latency=latency) as server:
+        server.route(r"/reports/(\w+)/runs", runs)
+        with ModeClient("ws", "t", "p", base_url=server.base_url) as client:
+            baseline = None
+            for prefetch in (0, 2, 4, 8, 16):
+                start = time.perf_counter()
+                count = sum(
+                    1
+                    for _ in client.report_run.iter_runs(
+                        "r", per_page=PER_PAGE, prefetch=prefetch
+                    )
+                )
+                elapsed = time.perf_counter() - start
+                baseline = baseline or elapsed
+                print(
+                    f"{prefetch:>8} {count:>6} {elapsed:>8.3f} "
+                    f"{baseline / elapsed:>7.1f}x"
+                )
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 200,
+        float(sys.argv[2]) if len(sys.argv) > 2 else 0.02,
+    )
@@ -0,0 +1,58 @@
+"""Memory and build time for a large listing of synthetic reports, kept as
+validated models, ``validate=False`` models, and compact records with and
+without their links.
+
+    poetry run python benchmarks/bench_records.py [reports]
+"""
+import sys
+import time
+import tracemalloc
+
+from _server import fixture
+
+from mode_client.lazy import construct_models
+from mode_client.models import Report
+from mode_client.records import ReportRecord, make_records
+
+
+def synthetic_reports(count):
+    report = fixture("report")
+    return [{**report, "token": f"r{i:08x}", "id": i} for i in range(count)]
+
+
+def measure(build, items):
+    start = time.perf_counter()
+    build(items)
+    seconds = time.perf_counter() - start
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build(items)
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del kept
+
+    return seconds, used
+
+
+def main(count: int) -> None:
+    items = synthetic_reports(count)
+    methods = {
+        "parse_obj": lambda items: [Report.parse_obj(item) for item in items],
+        "validate=False": lambda items: construct_models(Report, items),
+        "records+links": lambda items: make_records(ReportRecord, items, True),
+        "records": lambda items: make_records(ReportRecord, items, False),
+    }
+
+    print(f"{count:,} reports")
+    print(f"{'method':<16} {'seconds':>8} {'MiB':>8} {'bytes/obj':>10}")
+    for label, build in methods.items():
+        seconds, used = measure(build, items)
+        print(
+            f"{label:<16} {seconds:>8.2f} {used / 2**20:>8.1f}"
+            f" {used / count:>10,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,77 @@
+"""Throughput of downloading query run results: buffered vs streamed.
+
+The stand-in server serves a generated CSV; peak memory is traced per method.
+
+    poetry run python benchmarks/bench_results.py [megabytes]
+"""
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from _server import StandInServer
+
+from mode_client import ModeClient
+
+ROW = b"12345,2022-06-01T12:00:00.000Z,some text value,3.14159,true\n"
+
+
+def measure(label, size, fn):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+
+    # Traced separately: tracemalloc slows down allocation-heavy parsing.
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{label:<24} {size / 1e6 / elapsed:>8.1f} {peak / 1e6:>9.1f} {result:>10}")
+
+
+def main(megabytes: int) -> None:
+    body = b"id,at,text,value,flag\n" + ROW * (megabytes * 1_000_000 // len(ROW))
+    size = len(body)
+
+    with StandInServer() as server:
+        server.route(
+            r"/reports/r/runs/run/query_runs/qr/results/content.csv",
+            lambda m, q: (200, body),
+        )
+        with ModeClient("ws", "t", "p", base_url=server.base_url) as client:
+            results = "/reports/r/runs/run/query_runs/qr/results/content.csv"
+            print(f"{'method':<24} {'MB/s':>8} {'peak MB':>9} {'result':>10}")
+            measure(
+                "request() (buffered)",
+                size,
+                lambda: len(client.query_run.request("GET", results)),
+            )
+            measure(
+                "stream_results(BytesIO)",
+                size,
+                lambda: client.query_run.stream_results(
+                    "r", "run", "qr", io.BytesIO()
+                ).size,
+            )
+            with tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, "results.csv")
+                measure(
+                    "stream_results(path)",
+                    size,
+                    lambda: client.query_run.stream_results(
+                        "r", "run", "qr", path
+                    ).size,
+                )
+            measure(
+                "iter_result_rows",
+                size,
+                lambda: sum(
+                    1 for _ in client.query_run.iter_result_rows("r", "run", "qr")
+                ),
+            )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
@@ -0,0 +1,72 @@
+"""Wall-clock time of refreshing many parameterized reports: a serial
+create/wait loop vs run_many with a cap on in-flight runs.
+
+Each run on the stand-in server takes ``runtime`` seconds to finish.
+
+    poetry run python benchmarks/bench_run_many.py [jobs] [runtime_seconds]
+"""
+import itertools
+import sys
+import threading
+import time
+
+from _server import StandInServer, fixture
+
+from mode_client import ModeClient, PollPolicy
+
+
+def main(jobs: int, runtime: float) -> None:
+    run = fixture("report_run")
+    tokens = (f"run{i}" for i in itertools.count())
+    finish_at = {}
+    lock = threading.Lock()
+
+    def create(match, query):
+        with lock:
+            token = next(tokens)
+            finish_at[token] = time.monotonic() + runtime
+        return 200, {**run, "token": token, "state": "pending"}
+
+    def get(match, query):
+        done = time.monotonic() >= finish_at[match.group(1)]
+        return 200, {**run, "state": "succeeded" if done else "running_notebook"}
+
+    policy = PollPolicy(min_interval=0.05)
+    batch = [(f"r{i}", {"day": i}) for i in range(jobs)]
+    print(f"{'method':<22} {'jobs':>5} {'seconds':>8} {'requests':>9}")
+    with StandInServer() as server:
+        server.route(r"/reports/\w+/runs", create)
+        server.route(r"/reports/\w+/runs/(\w+)", get)
+        with ModeClient("ws", "t", "p", base_url=server.base_url) as client:
+            start = time.perf_counter()
+            for report, parameters in batch:
+                created = client.report_run.create(report, parameters)
+                client.report_run.wait_for_completion(
+                    report, created.token, expected_runtime=runtime, policy=policy
+                )
+            elapsed = time.perf_counter() - start
+            print(f"{'serial':<22} {jobs:>5} {elapsed:>8.2f} {server.requests:>9}")
+
+            for max_in_flight in (4, 8, 16):
+                server.reset()
+                start = time.perf_counter()
+                jobs_done = sum(
+                    outcome.ok
+                    for outcome in client.report_run.run_many(
+                        [(r, p, runtime) for r, p in batch],
+                        max_in_flight=max_in_flight,
+                        policy=policy,
+                    )
+                )
+                elapsed = time.perf_counter() - start
+                label = f"run_many({max_in_flight})"
+                print(
+                    f"{label:<22} {jobs_done:>5} {elapsed:>8.2f} {server.requests:>9}"
+                )
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 40,
+        float(sys.argv[2]) if len(sys.argv) > 2 else 0.5,
+    )
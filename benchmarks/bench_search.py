@@ -0,0 +1,56 @@
+"""Lookups in a SearchIndex over a large synthetic set of queries, which
+otherwise take downloading every query in the workspace.
+
+    poetry run python benchmarks/bench_search.py [queries]
+"""
+import random
+import sys
+import time
+
+from mode_client.search import SearchIndex
+
+TABLES = [
+    f"{schema}.table_{i}" for schema in ("analytics", "legacy") for i in range(500)
+]
+
+
+def synthetic_sql(rng):
+    tables = rng.sample(TABLES, 3)
+    columns = ", ".join(f"t0.column_{rng.randrange(50)}" for _ in range(8))
+    return (
+        f"-- Weekly rollup {rng.randrange(10_000)}\n"
+        f"SELECT {columns}\nFROM {tables[0]} t0\n"
+        f"JOIN {tables[1]} t1 ON t1.id = t0.id\n"
+        f"LEFT JOIN {tables[2]} t2 ON t2.id = t0.id\n"
+        f"WHERE t0.created_at > '2022-01-01' AND t1.state = 'active'\n"
+        f"GROUP BY 1, 2, 3 ORDER BY 4 DESC LIMIT 1000"
+    )
+
+
+def main(count: int) -> None:
+    rng = random.Random(0)
+    documents = [
+        ("query", f"q{i:06d}", synthetic_sql(rng), f"r{i // 5:06d}", f"Query {i}")
+        for i in range(count)
+    ]
+
+    index = SearchIndex()
+    start = time.perf_counter()
+    index.add_many(documents)
+    print(f"{count:,} queries indexed in {time.perf_counter() - start:.1f}s")
+
+    lookups = {
+        "references": lambda: index.references("legacy.table_42"),
+        "search": lambda: index.search('"legacy.table_42"'),
+        "grep": lambda: index.grep(r"legacy\.table_42\b"),
+    }
+    print(f"{'lookup':<12} {'ms':>8} {'hits':>6}")
+    for label, lookup in lookups.items():
+        start = time.perf_counter()
+        hits = lookup()
+        ms = (time.perf_counter() - start) * 1000
+        print(f"{label:<12} {ms:>8.1f} {len(hits):>6,}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 30_000)
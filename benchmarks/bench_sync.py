@@ -0,0 +1,109 @@
+"""Requests and wall-clock time of a full WorkspaceCrawler snapshot versus an
+incremental WorkspaceSync after a few reports changed, against a stand-in
+server with per-request latency.
+
+    poetry run python benchmarks/bench_sync.py [spaces] [reports_per_space] [changed]
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from _server import StandInServer, fixture
+
+from mode_client import ModeClient, WorkspaceCrawler, WorkspaceSync
+
+PER_PAGE = 30
+
+
+def timestamp(minute):
+    return f"2022-08-30T{minute // 60:02d}:{minute % 60:02d}:00.000Z"
+
+
+def listing(key, name, tokens):
+    item = fixture(name)
+    return 200, {"_embedded": {key: [{**item, "token": token} for token in tokens]}}
+
+
+def main(spaces: int, reports: int, changed: int, latency: float = 0.02) -> None:
+    report = fixture("report")
+    run = fixture("report_run")
+    updated = {f"s{s}r{r}": timestamp(r) for s in range(spaces) for r in range(reports)}
+
+    def space_reports(m, q):
+        space = m.group(1)
+        page, per_page = int(q["page"][0]), int(q["per_page"][0])
+        tokens = sorted(
+            (t for t in updated if t.startswith(f"{space}r")),
+            key=updated.get,
+            reverse=True,
+        )
+        body = {
+            "_embedded": {
+                "reports": [
+                    {
+                        **report,
+                        "token": token,
+                        "updated_at": updated[token],
+                        "last_successful_run_token": f"{token}x",
+                    }
+                    for token in tokens[(page - 1) * per_page : page * per_page]
+                ]
+            }
+        }
+        if page * per_page < len(tokens):
+            href = f"/api/ws/spaces/{space}/reports?page={page + 1}&per_page={per_page}"
+            body["_links"] = {"next_page": {"href": href}}
+        return 200, body
+
+    routes = {
+        r"/spaces": lambda m, q: listing(
+            "spaces", "space", [f"s{i}" for i in range(spaces)]
+        ),
+        r"/definitions": lambda m, q: listing("definitions", "definition", ["d"]),
+        r"/spaces/(\w+)/reports": space_reports,
+        r"/reports/(\w+)/queries": lambda m, q: listing(
+            "queries", "query", [f"{m.group(1)}q{i}" for i in range(3)]
+        ),
+        r"/reports/\w+/runs/(\w+)": lambda m, q: (200, {**run, "token": m.group(1)}),
+        r"/reports/\w+/runs/(\w+)/query_runs": lambda m, q: listing(
+            "query_runs", "query_run", [f"{m.group(1)}qr{i}" for i in range(3)]
+        ),
+    }
+
+    print(f"{'':>16} {'requests':>9} {'seconds':>8}")
+    with StandInServer(latency=latency) as server:
+        for pattern, handler in routes.items():
+            server.route(pattern, handler)
+
+        store = Path(tempfile.mkdtemp()) / "mirror.db"
+        with ModeClient(
+            "ws", "t", "p", base_url=server.base_url, max_connections=16
+        ) as client:
+
+            def measure(label, crawler):
+                server.reset()
+                start = time.perf_counter()
+                crawler.run()
+                elapsed = time.perf_counter() - start
+                crawler.snapshot.close()
+                print(f"{label:>16} {server.requests:>9,} {elapsed:>8.2f}")
+
+            snapshot = Path(tempfile.mkdtemp()) / "snapshot.db"
+            measure("full crawl", WorkspaceCrawler(client, snapshot, concurrency=8))
+            measure("first sync", WorkspaceSync(client, store, 8, per_page=PER_PAGE))
+
+            for i, token in enumerate(list(updated)[:changed]):
+                updated[token] = timestamp(reports + i)
+            measure(
+                f"{changed} changed", WorkspaceSync(client, store, 8, per_page=PER_PAGE)
+            )
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(
+        int(args[0]) if args else 5,
+        int(args[1]) if len(args) > 1 else 100,
+        int(args[2]) if len(args) > 2 else 10,
+    )
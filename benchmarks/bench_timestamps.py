@@ -0,0 +1,67 @@
+"""Timestamps per second with ``parse_timestamp`` vs pydantic's datetime
+parser and ``strptime``, and the cost of sorting report runs by duration when
+every consumer re-parses strings vs models parsed once with
+``parse_timestamps=True``.
+
+    poetry run python benchmarks/bench_timestamps.py [runs]
+"""
+import sys
+import time
+from datetime import datetime
+
+from _server import fixture
+from pydantic.datetime_parse import parse_datetime
+
+from mode_client.models import ReportRun, TimedReportRun
+from mode_client.timestamps import parse_timestamp
+
+VALUE = "2022-08-30T09:01:55.216Z"
+
+
+def timed(label, fn, count, baseline=None):
+    start = time.perf_counter()
+    fn()
+    seconds = time.perf_counter() - start
+    speedup = f"{baseline / seconds:>6.1f}x" if baseline else ""
+    print(f"{label:<28} {count / seconds:>12,.0f}/s {speedup}")
+    return seconds
+
+
+def main(count: int) -> None:
+    values = [VALUE] * count
+    print(f"{count:,} timestamps")
+    baseline = timed(
+        "pydantic parse_datetime", lambda: list(map(parse_datetime, values)), count
+    )
+    timed(
+        "strptime",
+        lambda: [datetime.strptime(v, "%Y-%m-%dT%H:%M:%S.%f%z") for v in values],
+        count,
+        baseline,
+    )
+    timed(
+        "parse_timestamp", lambda: list(map(parse_timestamp, values)), count, baseline
+    )
+
+    data = fixture("report_run")
+    runs = [ReportRun.parse_obj(data) for _ in range(count)]
+    typed = [TimedReportRun.parse_obj(data) for _ in range(count)]
+
+    def reparse_sort():
+        def duration(run):
+            return parse_datetime(run.completed_at) - parse_datetime(run.created_at)
+
+        sorted(runs, key=duration)
+
+    print(f"\nsorting {count:,} report runs by duration")
+    baseline = timed("re-parsing strings", reparse_sort, count)
+    timed(
+        "parse_timestamps=True",
+        lambda: sorted(typed, key=lambda r: r.duration),
+        count,
+        baseline,
+    )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
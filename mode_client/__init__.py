@@ -1 +1,13 @@
+from .async_clients import AsyncModeClient  # noqa: F401
+from .cache import MemoryCache, SqliteCache  # noqa: F401
 from .clients import ModeClient  # noqa: F401
+from .crawler import AsyncWorkspaceCrawler, WorkspaceCrawler  # noqa: F401
+from .dependencies import DependencyGraph  # noqa: F401
+from .instrumentation import Instrumentation  # noqa: F401
+from .mirror import Mirror  # noqa: F401
+from .polling import PollPolicy, WaitTimeout  # noqa: F401
+from .ratelimit import TokenBucket  # noqa: F401
+from .retry import RetryPolicy  # noqa: F401
+from .search import SearchIndex  # noqa: F401
+from .stats import last_request_stats  # noqa: F401
+from .sync import AsyncWorkspaceSync, SyncStore, WorkspaceSync  # noqa: F401
@@ -0,0 +1,1012 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import (
+    Any,
+    AsyncIterator,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Literal,
+    Optional,
+    Type,
+    TypeVar,
+    Union,
+)
+
+import httpx
+
+from mode_client.batch import (
+    DEFAULT_CONCURRENCY,
+    ITEM_ERRORS,
+    MAX_URL_LENGTH,
+    BatchResult,
+    fetch_many_async,
+    lookup_result,
+    unique,
+)
+from mode_client.cache import Cache, request_key
+from mode_client.clients import (
+    DEFAULT_BASE_URL,
+    AccountCalls,
+    BaseClient,
+    Call,
+    DefinitionCalls,
+    QueryCalls,
+    QueryRunCalls,
+    ReportCalls,
+    ReportRunCalls,
+    SpaceCalls,
+    as_raw,
+    as_records,
+)
+from mode_client.columns import Columns, build_columns
+from mode_client.decoders import DecoderName, JsonDecoder, get_decoder
+from mode_client.export import (
+    ExportedResult,
+    ExportManifest,
+    PathLike,
+    discard_partial,
+    finish_export,
+    open_partial,
+    range_headers,
+    range_not_satisfiable,
+    result_path,
+    resume_offset,
+    split_query_runs,
+    start_export,
+    sync_file,
+    write_manifest,
+)
+from mode_client.instrumentation import Instrumentation
+from mode_client.models import (
+    Account,
+    Definition,
+    Query,
+    QueryRun,
+    Report,
+    ReportRun,
+    ReportRuns,
+    Space,
+)
+from mode_client.pagination import (
+    DEFAULT_PER_PAGE,
+    Page,
+    next_page_call,
+    remaining_page_calls,
+)
+from mode_client.polling import DEFAULT_POLL, AsyncRunWaiter, PollPolicy
+from mode_client.ratelimit import TokenBucket
+from mode_client.records import (
+    DefinitionRecord,
+    QueryRecord,
+    QueryRunRecord,
+    ReportRecord,
+    ReportRunRecord,
+    SpaceRecord,
+)
+from mode_client.results import (
+    DEFAULT_CHUNK_SIZE,
+    Destination,
+    ResultFormat,
+    StreamStats,
+    open_destination,
+    row_parser,
+)
+from mode_client.retry import RetryPolicy
+from mode_client.runner import DEFAULT_MAX_IN_FLIGHT, Job, RunBatch, RunOutcome
+from mode_client.search import SearchIndex
+from mode_client.singleflight import AsyncSingleFlight
+from mode_client.stats import RequestStats, record
+
+T = TypeVar("T")
+R = TypeVar("R")
+M = TypeVar("M")
+
+
+def build_async_http_client(
+    token: str,
+    password: str,
+    base_url: str = DEFAULT_BASE_URL,
+    max_connections: Optional[int] = 10,
+    max_keepalive_connections: Optional[int] = 10,
+    keepalive_expiry: Optional[float] = 30.0,
+    http2: bool = False,
+    transport: Optional[httpx.AsyncBaseTransport] = None,
+) -> httpx.AsyncClient:
+    limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_keepalive_connections,
+        keepalive_expiry=keepalive_expiry,
+    )
+    return httpx.AsyncClient(
+        base_url=base_url,
+        auth=httpx.BasicAuth(token, password),
+        timeout=httpx.Timeout(10.0, read=None),
+        limits=limits,
+        http2=http2,
+        transport=transport,
+    )
+
+
+class AsyncModeBaseClient(BaseClient):
+    def __init__(
+        self,
+        workspace: str,
+        token: str,
+        password: str,
+        client: Optional[httpx.AsyncClient] = None,
+        base_url: str = DEFAULT_BASE_URL,
+        rate_limiter: Optional[TokenBucket] = None,
+        retry: Optional[RetryPolicy] = None,
+        cache: Optional[Cache] = None,
+        single_flight: Optional[AsyncSingleFlight] = None,
+        validate: bool = True,
+        parse_timestamps: bool = False,
+        json_decoder: Union[DecoderName, JsonDecoder] = "json",
+        search_index: Optional[SearchIndex] = None,
+        instrumentation: Optional[Instrumentation] = None,
+    ):
+        super().__init__(
+            workspace,
+            rate_limiter,
+            retry,
+            cache,
+            validate,
+            parse_timestamps,
+            json_decoder,
+            search_index,
+            instrumentation,
+        )
+        self.single_flight = single_flight
+        self.owns_client = client is None
+        self.client = client or build_async_http_client(token, password, base_url)
+
+    async def request(
+        self,
+        method: str,
+        resource: str,
+        json: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        refresh: bool = False,
+        template: Optional[str] = None,
+        decode: bool = True,
+    ) -> Any:
+        params = self._clean_params(params)
+
+        stats = RequestStats(method, resource, template=template or resource)
+        record(stats)
+        instrumentation = self.instrumentation
+        if instrumentation:
+            instrumentation.emit("request", stats)
+
+        lookup = self._cache_lookup(method, resource, params, stats, refresh)
+        if lookup and lookup.fresh:
+            assert lookup.entry
+            if instrumentation:
+                instrumentation.emit("cache_hit", stats)
+            return lookup.entry.data
+
+        try:
+            response = await self._send_request(
+                method,
+                resource,
+                stats,
+                json=json,
+                params=params,
+                headers=lookup.headers if lookup else None,
+            )
+            stats.response_bytes = len(response.content)
+        finally:
+            if instrumentation:
+                instrumentation.emit("response", stats)
+
+        return self._handle_response(method, resource, response, lookup, stats, decode)
+
+    async def _send_request(
+        self,
+        method: str,
+        resource: str,
+        stats: RequestStats,
+        json: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        stream: bool = False,
+    ) -> httpx.Response:
+        start = time.perf_counter()
+        request = self.client.build_request(
+            method=method,
+            url=f"{self.prefix}{resource}",
+            json=json,
+            params=params,
+            headers=headers,
+        )
+
+        while True:
+            if self.rate_limiter:
+                stats.rate_limit_wait += await self.rate_limiter.acquire_async()
+
+            try:
+                response = await self.client.send(request, stream=stream)
+            except httpx.TransportError:
+                delay = self._retry_delay(method, stats, start)
+                if delay is None:
+                    raise
+            else:
+                stats.status_code = response.status_code
+                if response.is_success or response.status_code == 304:
+                    break
+
+                delay = self._retry_delay(method, stats, start, response)
+                if delay is None:
+                    break
+
+                await response.aclose()
+
+            stats.retries += 1
+            stats.backoff += delay
+            if self.instrumentation:
+                self.instrumentation.emit("retry", stats)
+            await asyncio.sleep(delay)
+
+        stats.elapsed = time.perf_counter() - start
+
+        return response
+
+    @asynccontextmanager
+    async def stream(
+        self,
+        method: str,
+        resource: str,
+        headers: Optional[Dict[str, str]] = None,
+        template: Optional[str] = None,
+    ) -> AsyncIterator[httpx.Response]:
+        stats = RequestStats(method, resource, template=template or resource)
+        record(stats)
+        instrumentation = self.instrumentation
+        if instrumentation:
+            instrumentation.emit("request", stats)
+
+        start = time.perf_counter()
+        response = None
+        try:
+            response = await self._send_request(
+                method, resource, stats, headers=headers, stream=True
+            )
+            response.raise_for_status()
+            yield response
+        finally:
+            if response is not None:
+                await response.aclose()
+                stats.response_bytes = response.num_bytes_downloaded
+                stats.elapsed = time.perf_counter() - start
+            if instrumentation:
+                instrumentation.emit("response", stats)
+
+    async def _send(self, call: Call[R]) -> R:
+        if self.single_flight and call.method == "GET":
+            # Callers share a response only if they parse it the same way and
+            # agree on bypassing the cache.
+            resource = request_key(f"{self.prefix}{call.path}", call.params)
+            key = (resource, call.parse, call.refresh)
+            return await self.single_flight.do(key, lambda: self._perform(call))
+
+        return await self._perform(call)
+
+    async def _perform(self, call: Call[R]) -> R:
+        kwargs = call.kwargs
+        if self._decodes_typed(call):
+            kwargs["decode"] = False
+        if not self.instrumentation:
+            response = await self.request(call.method, call.path, **kwargs)
+            return self._parse(call, response)
+
+        response = await self.request(
+            call.method, call.path, template=call.template, **kwargs
+        )
+        return self._timed_parse(call, response)
+
+    async def _paginate(
+        self,
+        call: Call[Page[M]],
+        max_items: Optional[int] = None,
+        prefetch: int = 0,
+    ) -> AsyncIterator[M]:
+        if prefetch:
+            pages = self._prefetch_pages(call, prefetch, max_items)
+        else:
+            pages = self._pages(call)
+
+        count = 0
+        async for page in pages:
+            for item in page.items:
+                if max_items is not None and count >= max_items:
+                    return
+
+                count += 1
+                yield item
+
+    async def _pages(self, call: Optional[Call[Page[M]]]) -> AsyncIterator[Page[M]]:
+        while call:
+            page = await self._send(call)
+            yield page
+
+            call = next_page_call(call, page, self.prefix)
+
+    async def _prefetch_pages(
+        self, call: Call[Page[M]], prefetch: int, max_items: Optional[int]
+    ) -> AsyncIterator[Page[M]]:
+        first = await self._send(call)
+        yield first
+
+        calls = remaining_page_calls(call, first, max_items)
+        if calls is None:
+            async for page in self._pages(next_page_call(call, first, self.prefix)):
+                yield page
+            return
+
+        pending: Deque[asyncio.Task[Page[M]]] = deque()
+        try:
+            for page_call in calls:
+                if len(pending) >= prefetch:
+                    yield await pending.popleft()
+                pending.append(asyncio.ensure_future(self._send(page_call)))
+
+            while pending:
+                yield await pending.popleft()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def aclose(self) -> None:
+        if self.owns_client:
+            await self.client.aclose()
+
+    async def __aenter__(self: T) -> T:
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.aclose()
+
+
+class AsyncModeAccountClient(AccountCalls, AsyncModeBaseClient):
+    def __init__(self, _: str, token: str, password: str, **kwargs: Any):
+        super().__init__("", token, password, **kwargs)
+
+    async def get(self, account: str) -> Account:
+        return await self._send(self._get(account))
+
+
+class AsyncModeQueryClient(QueryCalls, AsyncModeBaseClient):
+    async def get(self, report: str, query: str) -> Query:
+        return await self._send(self._get(report, query))
+
+    async def get_many(
+        self,
+        report: str,
+        queries: Iterable[str],
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> BatchResult[Query]:
+        return await fetch_many_async(
+            lambda query: self.get(report, query), queries, concurrency
+        )
+
+    async def list(self, report: str) -> List[Query]:
+        return await self._send(self._list(report))
+
+    def iter_queries(
+        self,
+        report: str,
+        per_page: int = DEFAULT_PER_PAGE,
+        max_items: Optional[int] = None,
+        prefetch: int = 0,
+    ) -> AsyncIterator[Query]:
+        return self._paginate(self._iter(report, per_page), max_items, prefetch)
+
+    def iter_records(
+        self,
+        report: str,
+        per_page: int = DEFAULT_PER_PAGE,
+        max_items: Optional[int] = None,
+        prefetch: int = 0,
+        links: bool = False,
+    ) -> AsyncIterator[QueryRecord]:
+        call = as_records(self._iter(report, per_page), QueryRecord, "queries", links)
+        return self._paginate(call, max_items, prefetch)
+
+    async def columns(
+        self,
+        report: str,
+        per_page: int = DEFAULT_PER_PAGE,
+        max_items: Optional[int] = None,
+        prefetch: int = 0,
+    ) -> Columns:
+        call = as_raw(self._iter(report, per_page), "queries")
+        items = [item async for item in self._paginate(call, max_items, prefetch)]
+        return build_columns(Query, items)
+
+    async def create(
+        self, report: str, raw_query: str, data_source_id: int, name: str
+    ) -> None:
+        await self._send(self._create(report, raw_query, data_source_id, name))
+
+    async def update(
+        self,
+        report: str,
+        query: str,
+        raw_query: Optional[str] = None,
+        data_source_id: Optional[int] = None,
+        name: Optional[str] = None,
+    ) -> Query:
+        return await self._send(
+            self._update(report, query, raw_query, data_source_id, name)
+        )
+
+    async def delete(self, report: str, query: str) -> None:
+        await self._send(self._delete(report, query))
+
+
+class AsyncModeQueryRunClient(QueryRunCalls, AsyncModeBaseClient):
+    async def get(self, report: str, run: str, query_run: str) -> QueryRun:
+        return await self._send(self._get(report, run, query_run))
+
+    async def list(self, report: str, run: str) -> List[QueryRun]:
+        return await self._send(self._list(report, run))
+
+    def iter_query_runs(
+        self,
+        report: str,
+        run: str,
+        per_page: int = DEFAULT_PER_PAGE,
+        max_items: Optional[int] = None,
+        prefetch: int = 0,
+    ) -> AsyncIterator[QueryRun]:
+        return self._paginate(self._iter(report, run, per_page), max_items, prefetch)
+
+    def iter_records(
+        self,
+        report: str,
+        run: str,
+        per_page: int = DEFAULT_PER_PAGE,
+        max_items: Optional[int] = None,
+        prefetch: int = 0,
+        links: bool = False,
+    ) -> AsyncIterator[QueryRunRecord]:
+        call = as_records(
+            self._iter(report, run, per_page), QueryRunRecord, "query_runs", links
+        )
+        return self._paginate(call, max_items, prefetch)
+
+    async def columns(
+        self,
+        report: str,
+        run: str,
+        per_page: int = DEFAULT_PER_PAGE,
+        max_items: Optional[int] = None,
+        prefetch: int = 0,
+    ) -> Columns:
+        call = as_raw(self._iter(report, run, per_page), "query_runs")
+        items = [item async for item in self._paginate(call, max_items, prefetch)]
+        return build_columns(QueryRun, items)
+
+    async def stream_results(
+        self,
+        report: str,
+        run: str,
+        query_run: str,
+        dest: Destination,
+        format: ResultFormat = "csv",
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> StreamStats:
+        call = self._results(report, run, query_run, format)
+        stats = StreamStats()
+        async with self.stream(
+            call.method, call.path, template=call.template
+        ) as response:
+            with open_destination(dest) as file:
+                async for chunk in response.aiter_bytes(chunk_size):
+                    file.write(chunk)
+                    stats.add(chunk)
+
+        return stats.stop()
+
+    async def iter_result_rows(
+        self,
+        report: str,
+        run: str,
+        query_run: str,
+        format: ResultFormat = "csv",
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> AsyncIterator[Any]:
+        call = self._results(report, run, query_run, format)
+        parser = row_parser(format)
+        async with self.stream(
+            call.method, call.path, template=call.template
+        ) as response:
+            async for chunk in response.aiter_bytes(chunk_size):
+                for row in parser.feed(chunk):
+                    yield row
+
+        for row in parser.close():
+            yield row
+
+
+class AsyncModeReportClient(ReportCalls, AsyncModeBaseClient):
+    async def get(self, report: str) -> Report:
+        return await self._send(self._get(report))
+
+    async def get_many(
+        self, reports: Iterable[str], concurrency: int = DEFAULT_CONCURRENCY
+    ) -> BatchResult[Report]:
+        return await fetch_many_async(self.get, reports, concurrency)
+
+    async def list(self, space: str) -> List[Report]:
+        return await self._send(self._list(space))
+
+    def iter_reports(
+        self,
+        space: str,
+        per_page: int = DEFAULT_PER_PAGE,
+        max_items: Optional[int] = None,
+        prefetch: int = 0,
+    ) -> AsyncIterator[Report]:
+        return self._paginate(self._iter(space, per_page), max_items, prefetch)
+
+    def iter_records(
+        self,
+        space: str,
+        per_page: int = DEFAULT_PER_PAGE,
+        max_items: Optional[int] = None,
+        prefetch: int = 0,
+        links: bool = False,
+    ) -> AsyncIterator[ReportRecord]:
+        call = as_records(self._iter(space, per_page), ReportRecord, "reports", links)
+        return self._paginate(call, max_items, prefetch)
+
+    async def columns(
+        self,
+        space: str,
+        per_page: int = DEFAULT_PER_PAGE,
+        max_items: Optional[int] = None,
+        prefetch: int = 0,
+    ) -> Columns:
+        call = as_raw(self._iter(space, per_page), "reports")
+        items = [item async for item in self._paginate(call, max_items, prefetch)]
+        return build_columns(Report, items)
+
+    async def update(
+        self,
+        report: str,
+        name: Optional[str] = None,
+        description: Optional[str] = None,
+        space_token: Optional[str] = None,
+    ) -> Report:
+        return await self._send(self._update(report, name, description, space_token))
+
+    async def delete(self, report: str) -> None:
+        await self._send(self._delete(report))
+
+    async def archive(self, report: str) -> Report:
+        return await self._send(self._archive(report))
+
+    async def unarchive(self, report: str) -> Report:
+        return await self._send(self._unarchive(report))
+
+    async def sync(self, report: str, commit_message: Optional[str] = None) -> Report:
+        return await self._send(self._sync(report, commit_message))
+
+
+class AsyncModeReportRunClient(ReportRunCalls, AsyncModeBaseClient):
+    async def get(self, report: str, run: str) -> ReportRun:
+        return await self._send(self._get(report, run))
+
+    async def list(self, report: str) -> ReportRuns:
+        return await self._send(self._list(report))
+
+    def iter_runs(
+        self,
+        report: str,
+        per_page: int = DEFAULT_PER_PAGE,
+        max_items: Optional[int] = None,
+        prefetch: int = 0,
+    ) -> AsyncIterator[ReportRun]:
+        return self._paginate(self._iter(report, per_page), max_items, prefetch)
+
+    def iter_records(
+        self,
+        report: str,
+        per_page: int = DEFAULT_PER_PAGE,
+        max_items: Optional[int] = None,
+        prefetch: int = 0,
+        links: bool = False,
+    ) -> AsyncIterator[ReportRunRecord]:
+        call = as_records(
+            self._iter(report, per_page), ReportRunRecord, "report_runs", links
+        )
+        return self._paginate(call, max_items, prefetch)
+
+    async def columns(
+        self,
+        report: str,
+        per_page: int = DEFAULT_PER_PAGE,
+        max_items: Optional[int] = None,
+        prefetch: int = 0,
+    ) -> Columns:
+        call = as_raw(self._iter(report, per_page), "report_runs")
+        items = [item async for item in self._paginate(call, max_items, prefetch)]
+        return build_columns(ReportRun, items)
+
+    async def clone(self, report: str, run: str) -> ReportRun:
+        return await self._send(self._clone(report, run))
+
+    async def create(self, report: str, parameters: Dict[str, Any]) -> ReportRun:
+        return await self._send(self._create(report, parameters))
+
+    async def poll(self, report: str, run: str) -> ReportRun:
+        return await self._send(self._poll(report, run))
+
+    def waiter(self, policy: PollPolicy = DEFAULT_POLL) -> AsyncRunWaiter:
+        return AsyncRunWaiter(self.poll, policy)
+
+    async def wait_for_completion(
+        self,
+        report: str,
+        run: str,
+        timeout: Optional[float] = None,
+        expected_runtime: Optional[float] = None,
+        policy: PollPolicy = DEFAULT_POLL,
+    ) -> ReportRun:
+        if expected_runtime is None:
+            expected_runtime = (
+                await self._send(ReportCalls._get(report))
+            ).expected_runtime
+
+        waiter = self.waiter(policy)
+        waiter.add(report, run, expected_runtime, timeout)
+        async for finished in waiter.as_completed():
+            return finished
+
+        raise waiter.errors[run]
+
+    async def run_many(
+        self,
+        jobs: Iterable[Job],
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        retries: int = 0,
+        timeout: Optional[float] = None,
+        policy: PollPolicy = DEFAULT_POLL,
+    ) -> AsyncIterator[RunOutcome]:
+        batch = RunBatch(jobs, max_in_flight, retries)
+        waiter = self.waiter(policy)
+        while True:
+            for attempt in batch.ready():
+                job = attempt.job
+                try:
+                    run = await self.create(job.report, job.parameters or {})
+                except ITEM_ERRORS as error:
+                    yield attempt.outcome(error=error)
+                    continue
+
+                batch.started(attempt, run)
+                waiter.add(job.report, run.token, job.expected_runtime, timeout)
+
+            if not waiter:
+                return
+
+            pending = await waiter.step()
+            if pending.done:
+                outcome = batch.finish(pending)
+                if outcome:
+                    yield outcome
+
+    async def export_results(
+        self,
+        report: str,
+        run: str,
+        dest_dir: PathLike,
+        format: ResultFormat = "csv",
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> ExportManifest:
+        start = time.perf_counter()
+        manifest = ExportManifest(report, run, format)
+        query_runs = [
+            query_run
+            async for query_run in self._paginate(
+                QueryRunCalls._iter(report, run, DEFAULT_PER_PAGE), None, 0
+            )
+        ]
+        exportable = {
+            query_run.token: query_run
+            for query_run in split_query_runs(manifest, query_runs)
+        }
+
+        os.makedirs(dest_dir, exist_ok=True)
+        batch = await fetch_many_async(
+            lambda token: self._export_result(
+                report, run, exportable[token], dest_dir, format
+            ),
+            exportable,
+            concurrency,
+        )
+        manifest.results, manifest.errors = batch.results, batch.errors
+        manifest.seconds = time.perf_counter() - start
+        write_manifest(manifest, dest_dir)
+
+        return manifest
+
+    async def _export_result(
+        self,
+        report: str,
+        run: str,
+        query_run: QueryRun,
+        dest_dir: PathLike,
+        format: ResultFormat,
+    ) -> ExportedResult:
+        path = result_path(dest_dir, query_run, format)
+        result = start_export(path, query_run)
+        if result.reused:
+            return result
+
+        call = QueryRunCalls._results(report, run, query_run.token, format)
+        offset = resume_offset(path)
+        start = time.perf_counter()
+        try:
+            async with self.stream(
+                call.method, call.path, range_headers(offset), call.template
+            ) as response:
+                with open_partial(path, result, response, offset) as file:
+                    async for chunk in response.aiter_bytes(DEFAULT_CHUNK_SIZE):
+                        file.write(chunk)
+                        result.bytes += len(chunk)
+                    sync_file(file)
+        except httpx.HTTPStatusError as error:
+            if not range_not_satisfiable(error, offset):
+                raise
+            discard_partial(path)
+            return await self._export_result(report, run, query_run, dest_dir, format)
+
+        return finish_export(path, result, start)
+
+
+class AsyncModeSpaceClient(SpaceCalls, AsyncModeBaseClient):
+    async def get(self, space: str) -> Space:
+        return await self._send(self._get(space))
+
+    async def get_many(
+        self, spaces: Iterable[str], concurrency: int = DEFAULT_CONCURRENCY
+    ) -> BatchResult[Space]:
+        return await fetch_many_async(self.get, spaces, concurrency)
+
+    async def list(self, filter_: Literal["all", "custom"] = "custom") -> List[Space]:
+        return await self._send(self._list(filter_))
+
+    def iter_spaces(
+        self,
+        filter_: Literal["all", "custom"] = "custom",
+        per_page: int = DEFAULT_PER_PAGE,
+        max_items: Optional[int] = None,
+        prefetch: int = 0,
+    ) -> AsyncIterator[Space]:
+        return self._paginate(self._iter(filter_, per_page), max_items, prefetch)
+
+    def iter_records(
+        self,
+        filter_: Literal["all", "custom"] = "custom",
+        per_page: int = DEFAULT_PER_PAGE,
+        max_items: Optional[int] = None,
+        prefetch: int = 0,
+        links: bool = False,
+    ) -> AsyncIterator[SpaceRecord]:
+        call = as_records(self._iter(filter_, per_page), SpaceRecord, "spaces", links)
+        return self._paginate(call, max_items, prefetch)
+
+    async def columns(
+        self,
+        filter_: Literal["all", "custom"] = "custom",
+        per_page: int = DEFAULT_PER_PAGE,
+        max_items: Optional[int] = None,
+        prefetch: int = 0,
+    ) -> Columns:
+        call = as_raw(self._iter(filter_, per_page), "spaces")
+        items = [item async for item in self._paginate(call, max_items, prefetch)]
+        return build_columns(Space, items)
+
+    async def create(self, name: str, description: str) -> Space:
+        return await self._send(self._create(name, description))
+
+    async def update(
+        self, space: str, name: Optional[str] = None, description: Optional[str] = None
+    ) -> Space:
+        return await self._send(self._update(space, name, description))
+
+    async def delete(self, space: str) -> None:
+        await self._send(self._delete(space))
+
+
+class AsyncModeDefinitionClient(DefinitionCalls, AsyncModeBaseClient):
+    async def get(self, definition_token: str) -> Definition:
+        return await self._send(self._get(definition_token))
+
+    async def get_many(
+        self,
+        definition_tokens: Iterable[str],
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> BatchResult[Definition]:
+        return await fetch_many_async(self.get, definition_tokens, concurrency)
+
+    async def get_by_tokens(
+        self, definition_tokens: Iterable[str], max_url_length: int = MAX_URL_LENGTH
+    ) -> BatchResult[Definition]:
+        tokens = unique(definition_tokens)
+        base = f"{self.client.base_url}{self.prefix}"
+        found: Dict[str, Definition] = {}
+        errors: Dict[str, Exception] = {}
+        for chunk in self._token_chunks(tokens, base, max_url_length):
+            try:
+                async for definition in self._paginate(
+                    self._iter(None, chunk, len(chunk))
+                ):
+                    found[definition.token] = definition
+            except ITEM_ERRORS as error:
+                errors.update(dict.fromkeys(chunk, error))
+
+        return lookup_result(tokens, found, errors)
+
+    async def list(
+        self, filter_: Optional[str] = None, tokens: Optional[List[str]] = None
+    ) -> List[Definition]:
+        return await self._send(self._list(filter_, tokens))
+
+    def iter_definitions(
+        self,
+        filter_: Optional[str] = None,
+        tokens: Optional[List[str]] = None,
+        per_page: int = DEFAULT_PER_PAGE,
+        max_items: Optional[int] = None,
+        prefetch: int = 0,
+    ) -> AsyncIterator[Definition]:
+        return self._paginate(
+            self._iter(filter_, tokens, per_page), max_items, prefetch
+        )
+
+    def iter_records(
+        self,
+        filter_: Optional[str] = None,
+        tokens: Optional[List[str]] = None,
+        per_page: int = DEFAULT_PER_PAGE,
+        max_items: Optional[int] = None,
+        prefetch: int = 0,
+        links: bool = False,
+    ) -> AsyncIterator[DefinitionRecord]:
+        call = as_records(
+            self._iter(filter_, tokens, per_page),
+            DefinitionRecord,
+            "definitions",
+            links,
+        )
+        return self._paginate(call, max_items, prefetch)
+
+    async def columns(
+        self,
+        filter_: Optional[str] = None,
+        tokens: Optional[List[str]] = None,
+        per_page: int = DEFAULT_PER_PAGE,
+        max_items: Optional[int] = None,
+        prefetch: int = 0,
+    ) -> Columns:
+        call = as_raw(self._iter(filter_, tokens, per_page), "definitions")
+        items = [item async for item in self._paginate(call, max_items, prefetch)]
+        return build_columns(Definition, items)
+
+    async def sync(
+        self, definition_token: str, commit_message: Optional[str] = None
+    ) -> Definition:
+        return await self._send(self._sync(definition_token, commit_message))
+
+
+B = TypeVar("B", bound=AsyncModeBaseClient)
+
+
+class AsyncModeClient:
+    def __init__(
+        self,
+        workspace: str,
+        token: str,
+        password: str,
+        base_url: str = DEFAULT_BASE_URL,
+        max_connections: Optional[int] = 10,
+        max_keepalive_connections: Optional[int] = 10,
+        keepalive_expiry: Optional[float] = 30.0,
+        http2: bool = False,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+        retry: Optional[RetryPolicy] = None,
+        cache: Optional[Cache] = None,
+        coalesce: bool = False,
+        validate: bool = True,
+        parse_timestamps: bool = False,
+        json_decoder: Union[DecoderName, JsonDecoder] = "json",
+        search_index: Optional[SearchIndex] = None,
+        instrumentation: Optional[Instrumentation] = None,
+    ):
+        self.workspace = workspace
+        self.token = token
+        self.password = password
+        self.client = build_async_http_client(
+            token,
+            password,
+            base_url=base_url,
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+            http2=http2,
+            transport=transport,
+        )
+        self.rate_limiter = rate_limiter
+        self.retry = retry
+        self.cache = cache
+        self.single_flight = AsyncSingleFlight() if coalesce else None
+        self.validate = validate
+        self.parse_timestamps = parse_timestamps
+        self.decoder = get_decoder(json_decoder)
+        self.search_index = search_index
+        self.instrumentation = instrumentation
+
+    def _subclient(self, cls: Type[B]) -> B:
+        return cls(
+            self.workspace,
+            self.token,
+            self.password,
+            client=self.client,
+            rate_limiter=self.rate_limiter,
+            retry=self.retry,
+            cache=self.cache,
+            single_flight=self.single_flight,
+            validate=self.validate,
+            parse_timestamps=self.parse_timestamps,
+            json_decoder=self.decoder,
+            search_index=self.search_index,
+            instrumentation=self.instrumentation,
+        )
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+    async def __aenter__(self) -> "AsyncModeClient":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.aclose()
+
+    @property
+    def account(self) -> AsyncModeAccountClient:
+        return self._subclient(AsyncModeAccountClient)
+
+    @property
+    def query(self) -> AsyncModeQueryClient:
+        return self._subclient(AsyncModeQueryClient)
+
+    @property
+    def query_run(self) -> AsyncModeQueryRunClient:
+        return self._subclient(AsyncModeQueryRunClient)
+
+    @property
+    def report(self) -> AsyncModeReportClient:
+        return self._subclient(AsyncModeReportClient)
+
+    @property
+    def report_run(self) -> AsyncModeReportRunClient:
+        return self._subclient(AsyncModeReportRunClient)
+
+    @property
+    def space(self) -> AsyncModeSpaceClient:
+        return self._subclient(AsyncModeSpaceClient)
+
+    @property
+    def definition(self) -> AsyncModeDefinitionClient:
+        return self._subclient(AsyncModeDefinitionClient)
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, Generic, Iterable, Iterator, List, TypeVar
+from urllib.parse import quote
+
+import httpx
+from pydantic import ValidationError
+
+T = TypeVar("T")
+
+DEFAULT_CONCURRENCY = 4
+
+# Conservative limit that proxies and servers commonly accept.
+MAX_URL_LENGTH = 2000
+
+# Failures that belong to a single token rather than to the whole batch.
+ITEM_ERRORS = (httpx.HTTPError, ValidationError)
+
+
+@dataclass
+class BatchResult(Generic[T]):
+    """Results and per-token errors, each keyed by token in input order.
+
+    ``missing`` lists tokens the API answered for but did not return.
+    """
+
+    results: Dict[str, T] = field(default_factory=dict)
+    errors: Dict[str, Exception] = field(default_factory=dict)
+    missing: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors and not self.missing
+
+
+def unique(tokens: Iterable[str]) -> List[str]:
+    return list(dict.fromkeys(tokens))
+
+
+def fetch_many(
+    fetch: Callable[[str], T], tokens: Iterable[str], concurrency: int
+) -> BatchResult[T]:
+    def attempt(token: str) -> T | Exception:
+        try:
+            return fetch(token)
+        except ITEM_ERRORS as error:
+            return error
+
+    tokens = unique(tokens)
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        outcomes = list(executor.map(attempt, tokens))
+
+    return collect(tokens, outcomes)
+
+
+async def fetch_many_async(
+    fetch: Callable[[str], Awaitable[T]], tokens: Iterable[str], concurrency: int
+) -> BatchResult[T]:
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def attempt(token: str) -> T | Exception:
+        async with semaphore:
+            try:
+                return await fetch(token)
+            except ITEM_ERRORS as error:
+                return error
+
+    tokens = unique(tokens)
+    outcomes = await asyncio.gather(*(attempt(token) for token in tokens))
+
+    return collect(tokens, outcomes)
+
+
+def collect(tokens: List[str], outcomes: List[T | Exception]) -> BatchResult[T]:
+    batch: BatchResult[T] = BatchResult()
+    for token, outcome in zip(tokens, outcomes):
+        if isinstance(outcome, Exception):
+            batch.errors[token] = outcome
+        else:
+            batch.results[token] = outcome
+
+    return batch
+
+
+def chunk_tokens(
+    tokens: List[str], url: str, max_url_length: int, key: str = "tokens"
+) -> Iterator[List[str]]:
+    """Split tokens into chunks whose ``?key=a&key=b`` query fits in the URL."""
+    budget = max_url_length - len(url) - 1
+    chunk: List[str] = []
+    used = 0
+    for token in tokens:
+        size = len(key) + len(quote(token, safe="")) + 2
+        if chunk and used + size > budget:
+            yield chunk
+            chunk, used = [], 0
+
+        chunk.append(token)
+        used += size
+
+    if chunk:
+        yield chunk
+
+
+def lookup_result(
+    tokens: List[str], found: Dict[str, T], errors: Dict[str, Exception]
+) -> BatchResult[T]:
+    batch: BatchResult[T] = BatchResult(errors=errors)
+    for token in tokens:
+        if token in found:
+            batch.results[token] = found[token]
+        elif token not in errors:
+            batch.missing.append(token)
+
+    return batch
@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+import httpx
+
+
+def request_key(path: str, params: Optional[Dict[str, Any]] = None) -> str:
+    query = str(httpx.QueryParams(sorted((params or {}).items())))
+
+    return f"{path}?{query}" if query else path
+
+
+@dataclass
+class CacheEntry:
+    path: str
+    data: Any
+    stored_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    @property
+    def collection(self) -> bool:
+        return isinstance(self.data, dict) and "_embedded" in self.data
+
+
+@dataclass
+class CacheLookup:
+    key: str
+    path: str
+    entry: Optional[CacheEntry] = None
+    fresh: bool = False
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.entry and self.entry.etag:
+            headers["If-None-Match"] = self.entry.etag
+        if self.entry and self.entry.last_modified:
+            headers["If-Modified-Since"] = self.entry.last_modified
+
+        return headers
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    revalidations: int = 0
+    invalidations: int = 0
+
+
+@dataclass
+class CacheFields:
+    # Cache's fields, kept on a concrete dataclass since mypy rejects
+    # @dataclass on an abstract class (python/mypy#5374).
+    ttl: float = 60.0
+    ttls: Dict[str, float] = field(default_factory=dict)
+    stats: CacheStats = field(default_factory=CacheStats)
+
+
+class Cache(CacheFields, ABC):
+    """Caches GET responses for ``ttl`` seconds, or ``ttls[kind]`` per resource.
+
+    The kind is the first segment of the resource, e.g. ``reports`` for
+    ``/reports/{report}/runs``. Stale entries that carry an ETag or
+    Last-Modified header are revalidated with a conditional request.
+    Subclasses store the entries.
+    """
+
+    def __post_init__(self) -> None:
+        self._lock = threading.Lock()
+
+    def lookup(
+        self,
+        path: str,
+        resource: str,
+        params: Optional[Dict[str, Any]] = None,
+        refresh: bool = False,
+    ) -> CacheLookup:
+        lookup = CacheLookup(request_key(path, params), path)
+        lookup.entry = self._load(lookup.key)
+        if lookup.entry and not refresh:
+            age = time.time() - lookup.entry.stored_at
+            lookup.fresh = age < self.ttl_for(resource)
+
+        if lookup.fresh:
+            with self._lock:
+                self.stats.hits += 1
+
+        return lookup
+
+    def ttl_for(self, resource: str) -> float:
+        kind = resource.lstrip("/").split("/", 1)[0]
+        return self.ttls.get(kind, self.ttl)
+
+    def store(self, lookup: CacheLookup, response: httpx.Response, data: Any) -> None:
+        entry = CacheEntry(
+            lookup.path,
+            data,
+            time.time(),
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+        self._save(lookup.key, entry)
+        with self._lock:
+            self.stats.misses += 1
+
+    def revalidated(self, lookup: CacheLookup) -> Any:
+        assert lookup.entry
+        lookup.entry.stored_at = time.time()
+        self._save(lookup.key, lookup.entry)
+        with self._lock:
+            self.stats.revalidations += 1
+
+        return lookup.entry.data
+
+    def invalidate(self, entity: str) -> None:
+        """Drop entries under ``entity`` and every cached listing."""
+        invalidated = self._invalidate(entity)
+        with self._lock:
+            self.stats.invalidations += invalidated
+
+    def clear(self) -> None:
+        self._clear()
+
+    @abstractmethod
+    def _load(self, key: str) -> Optional[CacheEntry]:
+        ...
+
+    @abstractmethod
+    def _save(self, key: str, entry: CacheEntry) -> None:
+        ...
+
+    @abstractmethod
+    def _invalidate(self, entity: str) -> int:
+        ...
+
+    @abstractmethod
+    def _clear(self) -> None:
+        ...
+
+
+@dataclass
+class MemoryCache(Cache):
+    maxsize: int = 1024
+
+    def __post_init__(self) -> None:
+        super().__post_init__()
+        self._data: OrderedDict[str, CacheEntry] = OrderedDict()
+
+    def _load(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry:
+                self._data.move_to_end(key)
+
+            return entry
+
+    def _save(self, key: str, entry: CacheEntry) -> None:
+        with self._lock:
+            self._data[key] = entry
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def _invalidate(self, entity: str) -> int:
+        with self._lock:
+            stale = [
+                key
+                for key, entry in self._data.items()
+                if entry.collection
+                or entry.path == entity
+                or entry.path.startswith(f"{entity}/")
+            ]
+            for key in stale:
+                del self._data[key]
+
+            return len(stale)
+
+    def _clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+@dataclass
+class SqliteCache(Cache):
+    path: str = "mode_client_cache.sqlite"
+
+    def __post_init__(self) -> None:
+        super().__post_init__()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, path TEXT NOT NULL, data TEXT NOT NULL, "
+                "stored_at REAL NOT NULL, etag TEXT, last_modified TEXT, "
+                "collection INTEGER NOT NULL)"
+            )
+
+    def _load(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT path, data, stored_at, etag, last_modified "
+                "FROM cache WHERE key = ?",
+                (key,),
+            ).fetchone()
+
+        if not row:
+            return None
+
+        path, data, stored_at, etag, last_modified = row
+        return CacheEntry(path, json.loads(data), stored_at, etag, last_modified)
+
+    def _save(self, key: str, entry: CacheEntry) -> None:
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    entry.path,
+                    json.dumps(entry.data),
+                    entry.stored_at,
+                    entry.etag,
+                    entry.last_modified,
+                    entry.collection,
+                ),
+            )
+
+    def _invalidate(self, entity: str) -> int:
+        with self._lock, self._db:
+            cursor = self._db.execute(
+                "DELETE FROM cache WHERE collection = 1 OR path = ? "
+                "OR substr(path, 1, ?) = ?",
+                (entity, len(entity) + 1, f"{entity}/"),
+            )
+
+            return cursor.rowcount
+
+    def _clear(self) -> None:
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM cache")
+
+    def close(self) -> None:
+        self._db.close()
@@ -1,77 +1,753 @@
 from __future__ import annotations
 
-from json import JSONDecodeError
-from typing import Any, Dict, List, Literal, Optional
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    cast,
+)
 
 import httpx
-from pydantic import parse_obj_as
-
+from pydantic import BaseModel, parse_obj_as
+
+from mode_client.batch import (
+    DEFAULT_CONCURRENCY,
+    ITEM_ERRORS,
+    MAX_URL_LENGTH,
+    BatchResult,
+    chunk_tokens,
+    fetch_many,
+    lookup_result,
+    unique,
+)
+from mode_client.cache import Cache, CacheLookup, request_key
+from mode_client.columns import Columns, build_columns
+from mode_client.decoders import DecoderName, JsonDecoder, MsgspecDecoder, get_decoder
+from mode_client.export import (
+    ExportedResult,
+    ExportManifest,
+    PathLike,
+    discard_partial,
+    finish_export,
+    open_partial,
+    range_headers,
+    range_not_satisfiable,
+    result_path,
+    resume_offset,
+    split_query_runs,
+    start_export,
+    sync_file,
+    write_manifest,
+)
+from mode_client.instrumentation import Instrumentation
+from mode_client.lazy import (
+    construct_models,
+    parse_model,
+    resolve_model,
+    typed_timestamps,
+    validating,
+)
 from mode_client.models import (
     Account,
+    Definition,
+    Pagination,
     Query,
     QueryRun,
     Report,
     ReportRun,
     ReportRuns,
     Space,
-    Definition,
 )
+from mode_client.pagination import (
+    DEFAULT_PER_PAGE,
+    Page,
+    next_href,
+    next_page_call,
+    remaining_page_calls,
+)
+from mode_client.polling import DEFAULT_POLL, PollPolicy, RunWaiter
+from mode_client.ratelimit import TokenBucket
+from mode_client.records import (
+    DefinitionRecord,
+    QueryRecord,
+    QueryRunRecord,
+    ReportRecord,
+    ReportRunRecord,
+    SpaceRecord,
+    make_records,
+)
+from mode_client.results import (
+    DEFAULT_CHUNK_SIZE,
+    Destination,
+    ResultFormat,
+    StreamStats,
+    open_destination,
+    row_parser,
+)
+from mode_client.retry import RetryPolicy
+from mode_client.runner import DEFAULT_MAX_IN_FLIGHT, Job, RunBatch, RunOutcome
+from mode_client.search import SearchIndex
+from mode_client.singleflight import SingleFlight
+from mode_client.stats import RequestStats, last_request_stats, record
+
+T = TypeVar("T")
+R = TypeVar("R")
+M = TypeVar("M", bound=BaseModel)
+N = TypeVar("N", bound=Tuple[Any, ...])
+Item = TypeVar("Item")
+
+
+DEFAULT_BASE_URL = "https://app.mode.com/api"
+
+
+def build_http_client(
+    token: str,
+    password: str,
+    base_url: str = DEFAULT_BASE_URL,
+    max_connections: Optional[int] = 10,
+    max_keepalive_connections: Optional[int] = 10,
+    keepalive_expiry: Optional[float] = 30.0,
+    http2: bool = False,
+    transport: Optional[httpx.BaseTransport] = None,
+) -> httpx.Client:
+    limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_keepalive_connections,
+        keepalive_expiry=keepalive_expiry,
+    )
+    return httpx.Client(
+        base_url=base_url,
+        auth=httpx.BasicAuth(token, password),
+        timeout=httpx.Timeout(10.0, read=None),
+        limits=limits,
+        http2=http2,
+        transport=transport,
+    )
+
+
+@dataclass(frozen=True)
+class Call(Generic[R]):
+    """One API call: how to build the request and how to parse its response.
+
+    Calls are shared by the sync and async clients so both build identical
+    requests and parse responses into identical models.
+    """
+
+    method: str
+    template: str
+    path: str
+    parse: Callable[[Any], R]
+    json: Optional[Dict[str, Any]] = None
+    params: Optional[Dict[str, Any]] = None
+    refresh: bool = False
+
+    @property
+    def kwargs(self) -> Dict[str, Any]:
+        kwargs = {
+            "json": self.json,
+            "params": self.params,
+            "refresh": self.refresh or None,
+        }
+        return {k: v for k, v in kwargs.items() if v is not None}
+
+
+def call(
+    method: str,
+    template: str,
+    parse: Callable[[Any], R],
+    json: Optional[Dict[str, Any]] = None,
+    params: Optional[Dict[str, Any]] = None,
+    refresh: bool = False,
+    **values: str,
+) -> Call[R]:
+    path = template.format(**values)
+    return Call(
+        method, template, path, parse, json=json, params=params, refresh=refresh
+    )
+
+
+# Parsers are frozen dataclasses rather than closures so they compare equal
+# when they parse the same way, which lets coalesced calls share a response
+# only with callers that want it in the same shape.
+class TypedParser(Generic[R]):
+    """A parser that msgspec can also run on the raw response, decoding it
+    straight into the models."""
+
+    def __call__(self, response: Any) -> R:
+        raise NotImplementedError
+
+    def decode(self, decoder: MsgspecDecoder, content: bytes) -> R:
+        raise NotImplementedError
+
+
+@dataclass(frozen=True)
+class EntityParser(TypedParser[M]):
+    model: Type[M]
 
+    def __call__(self, response: Any) -> M:
+        return parse_model(self.model, response)
 
-class ModeBaseClient:
-    def __init__(self, workspace: str, token: str, password: str):
-        timeout = httpx.Timeout(10.0, read=None)
-        self.client = httpx.Client(
-            base_url=f"https://app.mode.com/api/{workspace}",
-            auth=httpx.BasicAuth(token, password),
-            timeout=timeout,
+    def decode(self, decoder: MsgspecDecoder, content: bytes) -> M:
+        return decoder.decode_model(content, self.model)
+
+
+@dataclass(frozen=True)
+class EmbeddedParser(TypedParser[List[M]]):
+    model: Type[M]
+    key: str
+
+    def __call__(self, response: Any) -> List[M]:
+        return parse_list(self.model, response["_embedded"][self.key])
+
+    def decode(self, decoder: MsgspecDecoder, content: bytes) -> List[M]:
+        return decoder.decode_models(content, self.model, self.key)
+
+
+@dataclass(frozen=True)
+class RawPageParser:
+    key: str
+
+    def __call__(self, response: Any) -> Page[Dict[str, Any]]:
+        pagination = response.get("pagination")
+
+        return Page(
+            response["_embedded"][self.key],
+            next_href(response),
+            Pagination.parse_obj(pagination) if pagination else None,
+        )
+
+
+@dataclass(frozen=True)
+class PageParser(TypedParser[Page[M]]):
+    model: Type[M]
+    key: str
+
+    def __call__(self, response: Any) -> Page[M]:
+        page = RawPageParser(self.key)(response)
+        return Page(parse_list(self.model, page.items), page.next_href, page.pagination)
+
+    def decode(self, decoder: MsgspecDecoder, content: bytes) -> Page[M]:
+        items, rest = decoder.decode_page(content, self.model, self.key)
+        pagination = rest["pagination"]
+
+        return Page(
+            items,
+            next_href(rest),
+            Pagination.parse_obj(pagination) if pagination else None,
         )
 
+
+@dataclass(frozen=True)
+class RecordPageParser(Generic[N]):
+    record: Type[N]
+    key: str
+    links: bool
+
+    def __call__(self, response: Any) -> Page[N]:
+        page = RawPageParser(self.key)(response)
+        items = make_records(self.record, page.items, self.links)
+        return Page(items, page.next_href, page.pagination)
+
+
+def entity(model: Type[M]) -> Callable[[Any], M]:
+    return EntityParser(model)
+
+
+def embedded(model: Type[M], key: str) -> Callable[[Any], List[M]]:
+    return EmbeddedParser(model, key)
+
+
+def paged(model: Type[M], key: str) -> Callable[[Any], Page[M]]:
+    return PageParser(model, key)
+
+
+def as_raw(call: Call[Page[Any]], key: str) -> Call[Page[Dict[str, Any]]]:
+    """The same listing call, with its items left as the API's dicts."""
+    return replace(call, parse=RawPageParser(key))
+
+
+def as_records(
+    call: Call[Page[Any]], record: Type[N], key: str, links: bool
+) -> Call[Page[N]]:
+    """The same listing call, parsed into compact records instead of models."""
+    return replace(call, parse=RecordPageParser(record, key, links))
+
+
+def parse_list(model: Type[M], items: List[Dict[str, Any]]) -> List[M]:
+    model = resolve_model(model)
+    if not validating.get():
+        return construct_models(model, items)
+
+    return parse_obj_as(List[model], items)  # type: ignore
+
+
+def page_params(per_page: int, **params: Any) -> Dict[str, Any]:
+    return {**params, "page": 1, "per_page": per_page}
+
+
+def parse_report_runs(response: Any) -> ReportRuns:
+    return parse_model(
+        ReportRuns,
+        {
+            "pagination": response["pagination"],
+            "report_runs": response["_embedded"]["report_runs"],
+        },
+    )
+
+
+def ignore(response: Any) -> None:
+    return None
+
+
+class BaseClient:
+    """Request preparation shared by ModeBaseClient and AsyncModeBaseClient."""
+
+    def __init__(
+        self,
+        workspace: str,
+        rate_limiter: Optional[TokenBucket] = None,
+        retry: Optional[RetryPolicy] = None,
+        cache: Optional[Cache] = None,
+        validate: bool = True,
+        parse_timestamps: bool = False,
+        json_decoder: Union[DecoderName, JsonDecoder] = "json",
+        search_index: Optional[SearchIndex] = None,
+        instrumentation: Optional[Instrumentation] = None,
+    ):
+        self.prefix = f"/{workspace}" if workspace else ""
+        self.rate_limiter = rate_limiter
+        self.retry = retry
+        self.cache = cache
+        self.validate = validate
+        self.parse_timestamps = parse_timestamps
+        self.decoder = get_decoder(json_decoder)
+        self.search_index = search_index
+        self.instrumentation = instrumentation
+
+    @staticmethod
+    def _clean_params(params: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        if params:
+            params = {k: v for k, v in params.items() if v}
+
+        return params
+
+    def _retry_delay(
+        self,
+        method: str,
+        stats: RequestStats,
+        start: float,
+        response: Optional[httpx.Response] = None,
+    ) -> Optional[float]:
+        if not self.retry:
+            return None
+
+        elapsed = time.perf_counter() - start
+        return self.retry.retry_delay(method, stats.retries + 1, elapsed, response)
+
+    def _cache_lookup(
+        self,
+        method: str,
+        resource: str,
+        params: Optional[Dict[str, Any]],
+        stats: RequestStats,
+        refresh: bool = False,
+    ) -> Optional[CacheLookup]:
+        if not self.cache or method != "GET":
+            return None
+
+        path = f"{self.prefix}{resource}"
+        lookup = self.cache.lookup(path, resource, params, refresh)
+        if lookup.fresh:
+            stats.cache = "hit"
+
+        return lookup
+
+    def _handle_response(
+        self,
+        method: str,
+        resource: str,
+        response: httpx.Response,
+        lookup: Optional[CacheLookup],
+        stats: RequestStats,
+        decode: bool = True,
+    ) -> Any:
+        if self.cache and method != "GET":
+            # Writes may touch the entity and any listing that includes it.
+            entity = "/".join(resource.split("/")[:3])
+            self.cache.invalidate(f"{self.prefix}{entity}")
+
+        if self.cache and lookup and lookup.entry and response.status_code == 304:
+            stats.cache = "revalidated"
+            if self.instrumentation:
+                self.instrumentation.emit("cache_hit", stats)
+            return self.cache.revalidated(lookup)
+
+        response.raise_for_status()
+        if not decode:
+            return response.content
+
+        data = self._decode(response)
+
+        if self.search_index and method != "GET":
+            self.search_index.observe(method, resource, data)
+
+        if self.cache and lookup:
+            self.cache.store(lookup, response, data)
+
+        return data
+
+    def _decodes_typed(self, call: Call[Any]) -> bool:
+        """Whether ``call``'s response is decoded straight into its models,
+        skipping the dicts and pydantic's validation."""
+        return (
+            isinstance(self.decoder, MsgspecDecoder)
+            and isinstance(call.parse, TypedParser)
+            and not self.cache
+            and not self.parse_timestamps
+        )
+
+    def _parse(self, call: Call[R], response: Any) -> R:
+        if isinstance(response, bytes):
+            return self._decode_typed(call, response)
+
+        if self.validate and not self.parse_timestamps:
+            return call.parse(response)
+
+        validate = validating.set(self.validate)
+        timestamps = typed_timestamps.set(self.parse_timestamps)
+        try:
+            return call.parse(response)
+        finally:
+            typed_timestamps.reset(timestamps)
+            validating.reset(validate)
+
+    def _decode_typed(self, call: Call[R], content: bytes) -> R:
+        assert isinstance(call.parse, TypedParser)
+        assert isinstance(self.decoder, MsgspecDecoder)
+        try:
+            return cast(R, call.parse.decode(self.decoder, content))
+        except ValueError:
+            # Let pydantic report what doesn't match the models.
+            return self._parse(call, self.decoder.decode(content))
+
+    def _timed_parse(self, call: Call[R], response: Any) -> R:
+        start = time.perf_counter()
+        parsed = self._parse(call, response)
+        stats = last_request_stats()
+        if stats and self.instrumentation:
+            stats.parse_time = time.perf_counter() - start
+            self.instrumentation.emit("parse", stats)
+        return parsed
+
+    def _decode(self, response: httpx.Response) -> Any:
+        try:
+            return self.decoder.decode_response(response)
+        except ValueError:
+            return response.text
+
+
+class ModeBaseClient(BaseClient):
+    def __init__(
+        self,
+        workspace: str,
+        token: str,
+        password: str,
+        client: Optional[httpx.Client] = None,
+        base_url: str = DEFAULT_BASE_URL,
+        rate_limiter: Optional[TokenBucket] = None,
+        retry: Optional[RetryPolicy] = None,
+        cache: Optional[Cache] = None,
+        single_flight: Optional[SingleFlight] = None,
+        validate: bool = True,
+        parse_timestamps: bool = False,
+        json_decoder: Union[DecoderName, JsonDecoder] = "json",
+        search_index: Optional[SearchIndex] = None,
+        instrumentation: Optional[Instrumentation] = None,
+    ):
+        super().__init__(
+            workspace,
+            rate_limiter,
+            retry,
+            cache,
+            validate,
+            parse_timestamps,
+            json_decoder,
+            search_index,
+            instrumentation,
+        )
+        self.single_flight = single_flight
+        self.owns_client = client is None
+        self.client = client or build_http_client(token, password, base_url)
+
     def request(
         self,
         method: str,
         resource: str,
         json: Optional[Dict[str, Any]] = None,
         params: Optional[Dict[str, Any]] = None,
+        refresh: bool = False,
+        template: Optional[str] = None,
+        decode: bool = True,
     ) -> Any:
-        if params:
-            params = {k: v for k, v in params.items() if v}
+        params = self._clean_params(params)
 
-        response = self.client.request(
-            method=method, url=resource, json=json, params=params
-        )
-        response.raise_for_status()
+        stats = RequestStats(method, resource, template=template or resource)
+        record(stats)
+        instrumentation = self.instrumentation
+        if instrumentation:
+            instrumentation.emit("request", stats)
+
+        lookup = self._cache_lookup(method, resource, params, stats, refresh)
+        if lookup and lookup.fresh:
+            assert lookup.entry
+            if instrumentation:
+                instrumentation.emit("cache_hit", stats)
+            return lookup.entry.data
 
         try:
-            return response.json()
-        except JSONDecodeError:
-            return response.text
+            response = self._send_request(
+                method,
+                resource,
+                stats,
+                json=json,
+                params=params,
+                headers=lookup.headers if lookup else None,
+            )
+            stats.response_bytes = len(response.content)
+        finally:
+            if instrumentation:
+                instrumentation.emit("response", stats)
+
+        return self._handle_response(method, resource, response, lookup, stats, decode)
+
+    def _send_request(
+        self,
+        method: str,
+        resource: str,
+        stats: RequestStats,
+        json: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        stream: bool = False,
+    ) -> httpx.Response:
+        start = time.perf_counter()
+        request = self.client.build_request(
+            method=method,
+            url=f"{self.prefix}{resource}",
+            json=json,
+            params=params,
+            headers=headers,
+        )
 
+        while True:
+            if self.rate_limiter:
+                stats.rate_limit_wait += self.rate_limiter.acquire()
 
-class ModeAccountClient(ModeBaseClient):
-    def __init__(self, _: str, token: str, password: str):
-        super().__init__("", token, password)
+            try:
+                response = self.client.send(request, stream=stream)
+            except httpx.TransportError:
+                delay = self._retry_delay(method, stats, start)
+                if delay is None:
+                    raise
+            else:
+                stats.status_code = response.status_code
+                if response.is_success or response.status_code == 304:
+                    break
 
-    def get(self, account: str) -> Account:
-        response = self.request("GET", f"/{account}")
+                delay = self._retry_delay(method, stats, start, response)
+                if delay is None:
+                    break
 
-        return Account.parse_obj(response)
+                response.close()
 
+            stats.retries += 1
+            stats.backoff += delay
+            if self.instrumentation:
+                self.instrumentation.emit("retry", stats)
+            time.sleep(delay)
 
-class ModeQueryClient(ModeBaseClient):
-    def get(self, report: str, query: str) -> Query:
-        response = self.request("GET", f"/reports/{report}/queries/{query}")
+        stats.elapsed = time.perf_counter() - start
 
-        return Query.parse_obj(response)
+        return response
 
-    def list(self, report: str) -> List[Query]:
-        response = self.request("GET", f"/reports/{report}/queries")
+    @contextmanager
+    def stream(
+        self,
+        method: str,
+        resource: str,
+        headers: Optional[Dict[str, str]] = None,
+        template: Optional[str] = None,
+    ) -> Iterator[httpx.Response]:
+        """Send a request and stream its response; the request's stats, and
+        its ``response`` event, cover the body read before the stream closes."""
+        stats = RequestStats(method, resource, template=template or resource)
+        record(stats)
+        instrumentation = self.instrumentation
+        if instrumentation:
+            instrumentation.emit("request", stats)
+
+        start = time.perf_counter()
+        response = None
+        try:
+            response = self._send_request(
+                method, resource, stats, headers=headers, stream=True
+            )
+            response.raise_for_status()
+            yield response
+        finally:
+            if response is not None:
+                response.close()
+                stats.response_bytes = response.num_bytes_downloaded
+                stats.elapsed = time.perf_counter() - start
+            if instrumentation:
+                instrumentation.emit("response", stats)
+
+    def _send(self, call: Call[R]) -> R:
+        if self.single_flight and call.method == "GET":
+            # Callers share a response only if they parse it the same way and
+            # agree on bypassing the cache.
+            resource = request_key(f"{self.prefix}{call.path}", call.params)
+            key = (resource, call.parse, call.refresh)
+            return self.single_flight.do(key, lambda: self._perform(call))
+
+        return self._perform(call)
+
+    def _perform(self, call: Call[R]) -> R:
+        kwargs = call.kwargs
+        if self._decodes_typed(call):
+            kwargs["decode"] = False
+        if not self.instrumentation:
+            response = self.request(call.method, call.path, **kwargs)
+            return self._parse(call, response)
 
-        return parse_obj_as(List[Query], response["_embedded"]["queries"])
+        response = self.request(
+            call.method, call.path, template=call.template, **kwargs
+        )
+        return self._timed_parse(call, response)
 
-    def create(
-        self, report: str, raw_query: str, data_source_id: int, name: str
-    ) -> None:
+    def _paginate(
+        self,
+        call: Call[Page[Item]],
+        max_items: Optional[int] = None,
+        prefetch: int = 0,
+    ) -> Iterator[Item]:
+        if prefetch:
+            pages = self._prefetch_pages(call, prefetch, max_items)
+        else:
+            pages = self._pages(call)
+
+        count = 0
+        for page in pages:
+            for item in page.items:
+                if max_items is not None and count >= max_items:
+                    return
+
+                count += 1
+                yield item
+
+    def _pages(self, call: Optional[Call[Page[Item]]]) -> Iterator[Page[Item]]:
+        while call:
+            page = self._send(call)
+            yield page
+
+            call = next_page_call(call, page, self.prefix)
+
+    def _prefetch_pages(
+        self, call: Call[Page[Item]], prefetch: int, max_items: Optional[int]
+    ) -> Iterator[Page[Item]]:
+        first = self._send(call)
+        yield first
+
+        calls = remaining_page_calls(call, first, max_items)
+        if calls is None:
+            yield from self._pages(next_page_call(call, first, self.prefix))
+            return
+
+        def send(page_call: Call[Page[Item]]) -> Page[Item]:
+            return self._send(page_call)
+
+        pending: Deque[Future[Page[Item]]] = deque()
+        with ThreadPoolExecutor(max_workers=prefetch) as executor:
+            try:
+                for page_call in calls:
+                    if len(pending) >= prefetch:
+                        yield pending.popleft().result()
+                    pending.append(executor.submit(send, page_call))
+
+                while pending:
+                    yield pending.popleft().result()
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def close(self) -> None:
+        if self.owns_client:
+            self.client.close()
+
+    def __enter__(self: T) -> T:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+
+class AccountCalls:
+    @staticmethod
+    def _get(account: str) -> Call[Account]:
+        return call("GET", "/{account}", entity(Account), account=account)
+
+
+class QueryCalls:
+    @staticmethod
+    def _get(report: str, query: str) -> Call[Query]:
+        return call(
+            "GET",
+            "/reports/{report}/queries/{query}",
+            entity(Query),
+            report=report,
+            query=query,
+        )
+
+    @staticmethod
+    def _list(report: str) -> Call[List[Query]]:
+        return call(
+            "GET",
+            "/reports/{report}/queries",
+            embedded(Query, "queries"),
+            report=report,
+        )
+
+    @staticmethod
+    def _iter(report: str, per_page: int) -> Call[Page[Query]]:
+        return call(
+            "GET",
+            "/reports/{report}/queries",
+            paged(Query, "queries"),
+            params=page_params(per_page),
+            report=report,
+        )
+
+    @staticmethod
+    def _create(
+        report: str, raw_query: str, data_source_id: int, name: str
+    ) -> Call[None]:
         json = {
             "query": {
                 "raw_query": raw_query,
@@ -79,16 +755,18 @@ class ModeQueryClient(ModeBaseClient):
                 "name": name,
             }
         }
-        self.request("POST", f"/reports/{report}/queries", json=json)
+        return call(
+            "POST", "/reports/{report}/queries", ignore, json=json, report=report
+        )
 
-    def update(
-        self,
+    @staticmethod
+    def _update(
         report: str,
         query: str,
         raw_query: Optional[str] = None,
         data_source_id: Optional[int] = None,
         name: Optional[str] = None,
-    ) -> Query:
+    ) -> Call[Query]:
         raw_json = {
             "raw_query": raw_query,
             "data_source_id": data_source_id,
@@ -96,192 +774,922 @@ class ModeQueryClient(ModeBaseClient):
         }
         json = {k: v for k, v in raw_json.items() if v is not None}
 
-        response = self.request(
-            "PATCH", f"/reports/{report}/queries/{query}", json={"query": json}
+        return call(
+            "PATCH",
+            "/reports/{report}/queries/{query}",
+            entity(Query),
+            json={"query": json},
+            report=report,
+            query=query,
         )
 
-        return Query.parse_obj(response)
-
-    def delete(self, report: str, query: str) -> None:
-        self.request("DELETE", f"/reports/{report}/queries/{query}")
+    @staticmethod
+    def _delete(report: str, query: str) -> Call[None]:
+        return call(
+            "DELETE",
+            "/reports/{report}/queries/{query}",
+            ignore,
+            report=report,
+            query=query,
+        )
 
 
-class ModeQueryRunClient(ModeBaseClient):
-    def get(self, report: str, run: str, query_run: str) -> QueryRun:
-        response = self.request(
-            "GET", f"/reports/{report}/runs/{run}/query_runs/{query_run}"
+class QueryRunCalls:
+    @staticmethod
+    def _get(report: str, run: str, query_run: str) -> Call[QueryRun]:
+        return call(
+            "GET",
+            "/reports/{report}/runs/{run}/query_runs/{query_run}",
+            entity(QueryRun),
+            report=report,
+            run=run,
+            query_run=query_run,
         )
 
-        return QueryRun.parse_obj(response)
-
-    def list(self, report: str, run: str) -> List[QueryRun]:
-        response = self.request("GET", f"/reports/{report}/runs/{run}/query_runs")
+    @staticmethod
+    def _list(report: str, run: str) -> Call[List[QueryRun]]:
+        return call(
+            "GET",
+            "/reports/{report}/runs/{run}/query_runs",
+            embedded(QueryRun, "query_runs"),
+            report=report,
+            run=run,
+        )
 
-        return parse_obj_as(List[QueryRun], response["_embedded"]["query_runs"])
+    @staticmethod
+    def _results(
+        report: str, run: str, query_run: str, format: ResultFormat
+    ) -> Call[None]:
+        return call(
+            "GET",
+            "/reports/{report}/runs/{run}/query_runs/{query_run}"
+            "/results/content.{format}",
+            ignore,
+            report=report,
+            run=run,
+            query_run=query_run,
+            format=format,
+        )
 
+    @staticmethod
+    def _iter(report: str, run: str, per_page: int) -> Call[Page[QueryRun]]:
+        return call(
+            "GET",
+            "/reports/{report}/runs/{run}/query_runs",
+            paged(QueryRun, "query_runs"),
+            params=page_params(per_page),
+            report=report,
+            run=run,
+        )
 
-class ModeReportClient(ModeBaseClient):
-    def get(self, report: str) -> Report:
-        response = self.request("GET", f"/reports/{report}")
 
-        return Report.parse_obj(response)
+class ReportCalls:
+    @staticmethod
+    def _get(report: str) -> Call[Report]:
+        return call("GET", "/reports/{report}", entity(Report), report=report)
 
-    def list(self, space: str) -> List[Report]:
+    @staticmethod
+    def _list(space: str) -> Call[List[Report]]:
         params = {"order": "desc", "order_by": "updated_at"}
-        response = self.request("GET", f"/spaces/{space}/reports", params=params)
+        return call(
+            "GET",
+            "/spaces/{space}/reports",
+            embedded(Report, "reports"),
+            params=params,
+            space=space,
+        )
 
-        return parse_obj_as(List[Report], response["_embedded"]["reports"])
+    @staticmethod
+    def _iter(space: str, per_page: int) -> Call[Page[Report]]:
+        return call(
+            "GET",
+            "/spaces/{space}/reports",
+            paged(Report, "reports"),
+            params=page_params(per_page, order="desc", order_by="updated_at"),
+            space=space,
+        )
 
-    def update(
-        self,
+    @staticmethod
+    def _update(
         report: str,
         name: Optional[str] = None,
         description: Optional[str] = None,
         space_token: Optional[str] = None,
-    ) -> Report:
+    ) -> Call[Report]:
         raw_json = {
             "name": name,
             "description": description,
             "space_token": space_token,
         }
         json = {k: v for k, v in raw_json.items() if v is not None}
-        response = self.request("PATCH", f"/reports/{report}", json={"report": json})
 
-        return Report.parse_obj(response)
+        return call(
+            "PATCH",
+            "/reports/{report}",
+            entity(Report),
+            json={"report": json},
+            report=report,
+        )
+
+    @staticmethod
+    def _delete(report: str) -> Call[None]:
+        return call("DELETE", "/reports/{report}", ignore, report=report)
+
+    @staticmethod
+    def _archive(report: str) -> Call[Report]:
+        return call("PATCH", "/reports/{report}/archive", entity(Report), report=report)
+
+    @staticmethod
+    def _unarchive(report: str) -> Call[Report]:
+        return call(
+            "PATCH", "/reports/{report}/unarchive", entity(Report), report=report
+        )
+
+    @staticmethod
+    def _sync(report: str, commit_message: Optional[str] = None) -> Call[Report]:
+        return call(
+            "PATCH",
+            "/reports/{report}/sync_to_github",
+            entity(Report),
+            json={"commit_message": commit_message},
+            report=report,
+        )
+
+
+class ReportRunCalls:
+    @staticmethod
+    def _get(report: str, run: str) -> Call[ReportRun]:
+        return call(
+            "GET",
+            "/reports/{report}/runs/{run}",
+            entity(ReportRun),
+            report=report,
+            run=run,
+        )
+
+    @staticmethod
+    def _poll(report: str, run: str) -> Call[ReportRun]:
+        # Run state changes under a cached entry, so skip fresh cache hits.
+        return call(
+            "GET",
+            "/reports/{report}/runs/{run}",
+            entity(ReportRun),
+            refresh=True,
+            report=report,
+            run=run,
+        )
+
+    @staticmethod
+    def _list(report: str) -> Call[ReportRuns]:
+        params = {"order": "desc", "order_by": "updated_at"}
+        return call(
+            "GET",
+            "/reports/{report}/runs",
+            parse_report_runs,
+            params=params,
+            report=report,
+        )
+
+    @staticmethod
+    def _iter(report: str, per_page: int) -> Call[Page[ReportRun]]:
+        return call(
+            "GET",
+            "/reports/{report}/runs",
+            paged(ReportRun, "report_runs"),
+            params=page_params(per_page, order="desc", order_by="updated_at"),
+            report=report,
+        )
+
+    @staticmethod
+    def _clone(report: str, run: str) -> Call[ReportRun]:
+        return call(
+            "POST",
+            "/reports/{report}/runs/{run}/clone",
+            entity(ReportRun),
+            report=report,
+            run=run,
+        )
+
+    @staticmethod
+    def _create(report: str, parameters: Dict[str, Any]) -> Call[ReportRun]:
+        return call(
+            "POST",
+            "/reports/{report}/runs",
+            entity(ReportRun),
+            json={"parameters": parameters},
+            report=report,
+        )
+
+
+class SpaceCalls:
+    @staticmethod
+    def _get(space: str) -> Call[Space]:
+        return call("GET", "/spaces/{space}", entity(Space), space=space)
+
+    @staticmethod
+    def _list(filter_: Literal["all", "custom"] = "custom") -> Call[List[Space]]:
+        return call(
+            "GET", "/spaces", embedded(Space, "spaces"), params={"filter": filter_}
+        )
+
+    @staticmethod
+    def _iter(filter_: Literal["all", "custom"], per_page: int) -> Call[Page[Space]]:
+        return call(
+            "GET",
+            "/spaces",
+            paged(Space, "spaces"),
+            params=page_params(per_page, filter=filter_),
+        )
+
+    @staticmethod
+    def _create(name: str, description: str) -> Call[Space]:
+        json = {"space": {"name": name, "description": description}}
+        return call("POST", "/spaces", entity(Space), json=json)
+
+    @staticmethod
+    def _update(
+        space: str, name: Optional[str] = None, description: Optional[str] = None
+    ) -> Call[Space]:
+        raw_json = {"name": name, "description": description}
+        json = {k: v for k, v in raw_json.items() if v is not None}
+
+        return call(
+            "POST",
+            "/spaces/{space}",
+            entity(Space),
+            json={"space": json},
+            space=space,
+        )
+
+    @staticmethod
+    def _delete(space: str) -> Call[None]:
+        return call("DELETE", "/spaces/{space}", ignore, space=space)
+
+
+class DefinitionCalls:
+    @staticmethod
+    def _token_chunks(
+        tokens: List[str], base: str, max_url_length: int
+    ) -> Iterator[List[str]]:
+        # Leave room for the page and per_page params added by _iter.
+        url = f"{base}/definitions?page=1&per_page={len(tokens)}&"
+        return chunk_tokens(tokens, url, max_url_length)
+
+    @staticmethod
+    def _get(definition_token: str) -> Call[Definition]:
+        return call(
+            "GET",
+            "/definitions/{definition}",
+            entity(Definition),
+            definition=definition_token,
+        )
+
+    @staticmethod
+    def _list(
+        filter_: Optional[str] = None, tokens: Optional[List[str]] = None
+    ) -> Call[List[Definition]]:
+        return call(
+            "GET",
+            "/definitions",
+            embedded(Definition, "definitions"),
+            params={"filter": filter_, "tokens": tokens},
+        )
+
+    @staticmethod
+    def _iter(
+        filter_: Optional[str], tokens: Optional[List[str]], per_page: int
+    ) -> Call[Page[Definition]]:
+        return call(
+            "GET",
+            "/definitions",
+            paged(Definition, "definitions"),
+            params=page_params(per_page, filter=filter_, tokens=tokens),
+        )
+
+    @staticmethod
+    def _sync(
+        definition_token: str, commit_message: Optional[str] = None
+    ) -> Call[Definition]:
+        return call(
+            "PATCH",
+            "/definitions/{definition}/sync_to_github",
+            entity(Definition),
+            json={"commit_message": commit_message},
+            definition=definition_token,
+        )
+
+
+class ModeAccountClient(AccountCalls, ModeBaseClient):
+    def __init__(self, _: str, token: str, password: str, **kwargs: Any):
+        super().__init__("", token, password, **kwargs)
+
+    def get(self, account: str) -> Account:
+        return self._send(self._get(account))
+
+
+class ModeQueryClient(QueryCalls, ModeBaseClient):
+    def get(self, report: str, query: str) -> Query:
+        return self._send(self._get(report, query))
+
+    def get_many(
+        self,
+        report: str,
+        queries: Iterable[str],
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> BatchResult[Query]:
+        return fetch_many(lambda query: self.get(report, query), queries, concurrency)
+
+    def list(self, report: str) -> List[Query]:
+        return self._send(self._list(report))
+
+    def iter_queries(
+        self,
+        report: str,
+        per_page: int = DEFAULT_PER_PAGE,
+        max_items: Optional[int] = None,
+        prefetch: int = 0,
+    ) -> Iterator[Query]:
+        return self._paginate(self._iter(report, per_page), max_items, prefetch)
+
+    def iter_records(
+        self,
+        report: str,
+        per_page: int = DEFAULT_PER_PAGE,
+        max_items: Optional[int] = None,
+        prefetch: int = 0,
+        links: bool = False,
+    ) -> Iterator[QueryRecord]:
+        call = as_records(self._iter(report, per_page), QueryRecord, "queries", links)
+        return self._paginate(call, max_items, prefetch)
+
+    def columns(
+        self,
+        report: str,
+        per_page: int = DEFAULT_PER_PAGE,
+        max_items: Optional[int] = None,
+        prefetch: int = 0,
+    ) -> Columns:
+        call = as_raw(self._iter(report, per_page), "queries")
+        return build_columns(Query, self._paginate(call, max_items, prefetch))
+
+    def create(
+        self, report: str, raw_query: str, data_source_id: int, name: str
+    ) -> None:
+        self._send(self._create(report, raw_query, data_source_id, name))
+
+    def update(
+        self,
+        report: str,
+        query: str,
+        raw_query: Optional[str] = None,
+        data_source_id: Optional[int] = None,
+        name: Optional[str] = None,
+    ) -> Query:
+        return self._send(self._update(report, query, raw_query, data_source_id, name))
+
+    def delete(self, report: str, query: str) -> None:
+        self._send(self._delete(report, query))
+
+
+class ModeQueryRunClient(QueryRunCalls, ModeBaseClient):
+    def get(self, report: str, run: str, query_run: str) -> QueryRun:
+        return self._send(self._get(report, run, query_run))
+
+    def list(self, report: str, run: str) -> List[QueryRun]:
+        return self._send(self._list(report, run))
+
+    def iter_query_runs(
+        self,
+        report: str,
+        run: str,
+        per_page: int = DEFAULT_PER_PAGE,
+        max_items: Optional[int] = None,
+        prefetch: int = 0,
+    ) -> Iterator[QueryRun]:
+        return self._paginate(self._iter(report, run, per_page), max_items, prefetch)
+
+    def iter_records(
+        self,
+        report: str,
+        run: str,
+        per_page: int = DEFAULT_PER_PAGE,
+        max_items: Optional[int] = None,
+        prefetch: int = 0,
+        links: bool = False,
+    ) -> Iterator[QueryRunRecord]:
+        call = as_records(
+            self._iter(report, run, per_page), QueryRunRecord, "query_runs", links
+        )
+        return self._paginate(call, max_items, prefetch)
+
+    def columns(
+        self,
+        report: str,
+        run: str,
+        per_page: int = DEFAULT_PER_PAGE,
+        max_items: Optional[int] = None,
+        prefetch: int = 0,
+    ) -> Columns:
+        call = as_raw(self._iter(report, run, per_page), "query_runs")
+        return build_columns(QueryRun, self._paginate(call, max_items, prefetch))
+
+    def stream_results(
+        self,
+        report: str,
+        run: str,
+        query_run: str,
+        dest: Destination,
+        format: ResultFormat = "csv",
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> StreamStats:
+        call = self._results(report, run, query_run, format)
+        stats = StreamStats()
+        with self.stream(
+            call.method, call.path, template=call.template
+        ) as response, open_destination(dest) as file:
+            for chunk in response.iter_bytes(chunk_size):
+                file.write(chunk)
+                stats.add(chunk)
+
+        return stats.stop()
+
+    def iter_result_rows(
+        self,
+        report: str,
+        run: str,
+        query_run: str,
+        format: ResultFormat = "csv",
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> Iterator[Any]:
+        call = self._results(report, run, query_run, format)
+        parser = row_parser(format)
+        with self.stream(call.method, call.path, template=call.template) as response:
+            for chunk in response.iter_bytes(chunk_size):
+                yield from parser.feed(chunk)
+
+        yield from parser.close()
+
+
+class ModeReportClient(ReportCalls, ModeBaseClient):
+    def get(self, report: str) -> Report:
+        return self._send(self._get(report))
+
+    def get_many(
+        self, reports: Iterable[str], concurrency: int = DEFAULT_CONCURRENCY
+    ) -> BatchResult[Report]:
+        return fetch_many(self.get, reports, concurrency)
+
+    def list(self, space: str) -> List[Report]:
+        return self._send(self._list(space))
+
+    def iter_reports(
+        self,
+        space: str,
+        per_page: int = DEFAULT_PER_PAGE,
+        max_items: Optional[int] = None,
+        prefetch: int = 0,
+    ) -> Iterator[Report]:
+        return self._paginate(self._iter(space, per_page), max_items, prefetch)
+
+    def iter_records(
+        self,
+        space: str,
+        per_page: int = DEFAULT_PER_PAGE,
+        max_items: Optional[int] = None,
+        prefetch: int = 0,
+        links: bool = False,
+    ) -> Iterator[ReportRecord]:
+        call = as_records(self._iter(space, per_page), ReportRecord, "reports", links)
+        return self._paginate(call, max_items, prefetch)
+
+    def columns(
+        self,
+        space: str,
+        per_page: int = DEFAULT_PER_PAGE,
+        max_items: Optional[int] = None,
+        prefetch: int = 0,
+    ) -> Columns:
+        call = as_raw(self._iter(space, per_page), "reports")
+        return build_columns(Report, self._paginate(call, max_items, prefetch))
+
+    def update(
+        self,
+        report: str,
+        name: Optional[str] = None,
+        description: Optional[str] = None,
+        space_token: Optional[str] = None,
+    ) -> Report:
+        return self._send(self._update(report, name, description, space_token))
 
     def delete(self, report: str) -> None:
-        self.request("DELETE", f"/reports/{report}")
+        self._send(self._delete(report))
 
     def archive(self, report: str) -> Report:
-        response = self.request("PATCH", f"/reports/{report}/archive")
-        return Report.parse_obj(response)
+        return self._send(self._archive(report))
 
     def unarchive(self, report: str) -> Report:
-        response = self.request("PATCH", f"/reports/{report}/unarchive")
-
-        return Report.parse_obj(response)
+        return self._send(self._unarchive(report))
 
     def sync(self, report: str, commit_message: Optional[str] = None) -> Report:
-        json = {"commit_message": commit_message}
-        response = self.request("PATCH", f"/reports/{report}/sync_to_github", json=json)
-
-        return Report.parse_obj(response)
+        return self._send(self._sync(report, commit_message))
 
 
-class ModeReportRunClient(ModeBaseClient):
+class ModeReportRunClient(ReportRunCalls, ModeBaseClient):
     def get(self, report: str, run: str) -> ReportRun:
-        response = self.request("GET", f"/reports/{report}/runs/{run}")
-
-        return ReportRun.parse_obj(response)
+        return self._send(self._get(report, run))
 
     def list(self, report: str) -> ReportRuns:
-        params = {"order": "desc", "order_by": "updated_at"}
-        raw_response = self.request("GET", f"/reports/{report}/runs", params=params)
-        response = {
-            "pagination": raw_response["pagination"],
-            "report_runs": raw_response["_embedded"]["report_runs"],
-        }
+        return self._send(self._list(report))
 
-        return ReportRuns.parse_obj(response)
+    def iter_runs(
+        self,
+        report: str,
+        per_page: int = DEFAULT_PER_PAGE,
+        max_items: Optional[int] = None,
+        prefetch: int = 0,
+    ) -> Iterator[ReportRun]:
+        return self._paginate(self._iter(report, per_page), max_items, prefetch)
+
+    def iter_records(
+        self,
+        report: str,
+        per_page: int = DEFAULT_PER_PAGE,
+        max_items: Optional[int] = None,
+        prefetch: int = 0,
+        links: bool = False,
+    ) -> Iterator[ReportRunRecord]:
+        call = as_records(
+            self._iter(report, per_page), ReportRunRecord, "report_runs", links
+        )
+        return self._paginate(call, max_items, prefetch)
+
+    def columns(
+        self,
+        report: str,
+        per_page: int = DEFAULT_PER_PAGE,
+        max_items: Optional[int] = None,
+        prefetch: int = 0,
+    ) -> Columns:
+        call = as_raw(self._iter(report, per_page), "report_runs")
+        return build_columns(ReportRun, self._paginate(call, max_items, prefetch))
 
     def clone(self, report: str, run: str) -> ReportRun:
-        response = self.request("POST", f"/reports/{report}/runs/{run}/clone")
-        return ReportRun.parse_obj(response)
+        return self._send(self._clone(report, run))
 
     def create(self, report: str, parameters: Dict[str, Any]) -> ReportRun:
-        response = self.request(
-            "POST", f"/reports/{report}/runs", json={"parameters": parameters}
+        return self._send(self._create(report, parameters))
+
+    def poll(self, report: str, run: str) -> ReportRun:
+        return self._send(self._poll(report, run))
+
+    def waiter(self, policy: PollPolicy = DEFAULT_POLL) -> RunWaiter:
+        return RunWaiter(self.poll, policy)
+
+    def wait_for_completion(
+        self,
+        report: str,
+        run: str,
+        timeout: Optional[float] = None,
+        expected_runtime: Optional[float] = None,
+        policy: PollPolicy = DEFAULT_POLL,
+    ) -> ReportRun:
+        if expected_runtime is None:
+            expected_runtime = self._send(ReportCalls._get(report)).expected_runtime
+
+        waiter = self.waiter(policy)
+        waiter.add(report, run, expected_runtime, timeout)
+        for finished in waiter.as_completed():
+            return finished
+
+        raise waiter.errors[run]
+
+    def run_many(
+        self,
+        jobs: Iterable[Job],
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        retries: int = 0,
+        timeout: Optional[float] = None,
+        policy: PollPolicy = DEFAULT_POLL,
+    ) -> Iterator[RunOutcome]:
+        batch = RunBatch(jobs, max_in_flight, retries)
+        waiter = self.waiter(policy)
+        while True:
+            for attempt in batch.ready():
+                job = attempt.job
+                try:
+                    run = self.create(job.report, job.parameters or {})
+                except ITEM_ERRORS as error:
+                    yield attempt.outcome(error=error)
+                    continue
+
+                batch.started(attempt, run)
+                waiter.add(job.report, run.token, job.expected_runtime, timeout)
+
+            if not waiter:
+                return
+
+            pending = waiter.step()
+            if pending.done:
+                outcome = batch.finish(pending)
+                if outcome:
+                    yield outcome
+
+    def export_results(
+        self,
+        report: str,
+        run: str,
+        dest_dir: PathLike,
+        format: ResultFormat = "csv",
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> ExportManifest:
+        start = time.perf_counter()
+        manifest = ExportManifest(report, run, format)
+        query_runs = list(
+            self._paginate(QueryRunCalls._iter(report, run, DEFAULT_PER_PAGE), None, 0)
+        )
+        exportable = {
+            query_run.token: query_run
+            for query_run in split_query_runs(manifest, query_runs)
+        }
+
+        os.makedirs(dest_dir, exist_ok=True)
+        batch = fetch_many(
+            lambda token: self._export_result(
+                report, run, exportable[token], dest_dir, format
+            ),
+            exportable,
+            concurrency,
         )
-        return ReportRun.parse_obj(response)
+        manifest.results, manifest.errors = batch.results, batch.errors
+        manifest.seconds = time.perf_counter() - start
+        write_manifest(manifest, dest_dir)
 
+        return manifest
 
-class ModeSpaceClient(ModeBaseClient):
+    def _export_result(
+        self,
+        report: str,
+        run: str,
+        query_run: QueryRun,
+        dest_dir: PathLike,
+        format: ResultFormat,
+    ) -> ExportedResult:
+        path = result_path(dest_dir, query_run, format)
+        result = start_export(path, query_run)
+        if result.reused:
+            return result
+
+        call = QueryRunCalls._results(report, run, query_run.token, format)
+        offset = resume_offset(path)
+        start = time.perf_counter()
+        try:
+            with self.stream(
+                call.method, call.path, range_headers(offset), call.template
+            ) as response:
+                with open_partial(path, result, response, offset) as file:
+                    for chunk in response.iter_bytes(DEFAULT_CHUNK_SIZE):
+                        file.write(chunk)
+                        result.bytes += len(chunk)
+                    sync_file(file)
+        except httpx.HTTPStatusError as error:
+            if not range_not_satisfiable(error, offset):
+                raise
+            discard_partial(path)
+            return self._export_result(report, run, query_run, dest_dir, format)
+
+        return finish_export(path, result, start)
+
+
+class ModeSpaceClient(SpaceCalls, ModeBaseClient):
     def get(self, space: str) -> Space:
-        response = self.request("GET", f"/spaces/{space}")
-        return Space.parse_obj(response)
+        return self._send(self._get(space))
+
+    def get_many(
+        self, spaces: Iterable[str], concurrency: int = DEFAULT_CONCURRENCY
+    ) -> BatchResult[Space]:
+        return fetch_many(self.get, spaces, concurrency)
 
     def list(self, filter_: Literal["all", "custom"] = "custom") -> List[Space]:
-        params = {"filter": filter_}
-        response = self.request("GET", "/spaces", params=params)
-        spaces = response["_embedded"]["spaces"]
+        return self._send(self._list(filter_))
 
-        return parse_obj_as(List[Space], spaces)
+    def iter_spaces(
+        self,
+        filter_: Literal["all", "custom"] = "custom",
+        per_page: int = DEFAULT_PER_PAGE,
+        max_items: Optional[int] = None,
+        prefetch: int = 0,
+    ) -> Iterator[Space]:
+        return self._paginate(self._iter(filter_, per_page), max_items, prefetch)
+
+    def iter_records(
+        self,
+        filter_: Literal["all", "custom"] = "custom",
+        per_page: int = DEFAULT_PER_PAGE,
+        max_items: Optional[int] = None,
+        prefetch: int = 0,
+        links: bool = False,
+    ) -> Iterator[SpaceRecord]:
+        call = as_records(self._iter(filter_, per_page), SpaceRecord, "spaces", links)
+        return self._paginate(call, max_items, prefetch)
+
+    def columns(
+        self,
+        filter_: Literal["all", "custom"] = "custom",
+        per_page: int = DEFAULT_PER_PAGE,
+        max_items: Optional[int] = None,
+        prefetch: int = 0,
+    ) -> Columns:
+        call = as_raw(self._iter(filter_, per_page), "spaces")
+        return build_columns(Space, self._paginate(call, max_items, prefetch))
 
     def create(self, name: str, description: str) -> Space:
-        json = {"space": {"name": name, "description": description}}
-        response = self.request("POST", "/spaces", json=json)
-
-        return Space.parse_obj(response)
+        return self._send(self._create(name, description))
 
     def update(
         self, space: str, name: Optional[str] = None, description: Optional[str] = None
     ) -> Space:
-        raw_json = {"name": name, "description": description}
-        json = {k: v for k, v in raw_json.items() if v is not None}
-        response = self.request("POST", f"/spaces/{space}", json={"space": json})
-
-        return Space.parse_obj(response)
+        return self._send(self._update(space, name, description))
 
     def delete(self, space: str) -> None:
-        self.request("DELETE", f"/spaces/{space}")
+        self._send(self._delete(space))
 
 
-class ModeDefinitionClient(ModeBaseClient):
+class ModeDefinitionClient(DefinitionCalls, ModeBaseClient):
     def get(self, definition_token: str) -> Definition:
-        response = self.request("GET", f"/definitions/{definition_token}")
+        return self._send(self._get(definition_token))
 
-        return Definition.parse_obj(response)
+    def get_many(
+        self,
+        definition_tokens: Iterable[str],
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> BatchResult[Definition]:
+        return fetch_many(self.get, definition_tokens, concurrency)
+
+    def get_by_tokens(
+        self, definition_tokens: Iterable[str], max_url_length: int = MAX_URL_LENGTH
+    ) -> BatchResult[Definition]:
+        tokens = unique(definition_tokens)
+        base = f"{self.client.base_url}{self.prefix}"
+        found: Dict[str, Definition] = {}
+        errors: Dict[str, Exception] = {}
+        for chunk in self._token_chunks(tokens, base, max_url_length):
+            try:
+                for definition in self._paginate(self._iter(None, chunk, len(chunk))):
+                    found[definition.token] = definition
+            except ITEM_ERRORS as error:
+                errors.update(dict.fromkeys(chunk, error))
+
+        return lookup_result(tokens, found, errors)
 
     def list(
         self, filter_: Optional[str] = None, tokens: Optional[List[str]] = None
     ) -> List[Definition]:
-        params = {"filter": filter_, "tokens": tokens}
-        response = self.request("GET", "/definitions", params=params)
-        definitions = response["_embedded"]["definitions"]
+        return self._send(self._list(filter_, tokens))
+
+    def iter_definitions(
+        self,
+        filter_: Optional[str] = None,
+        tokens: Optional[List[str]] = None,
+        per_page: int = DEFAULT_PER_PAGE,
+        max_items: Optional[int] = None,
+        prefetch: int = 0,
+    ) -> Iterator[Definition]:
+        return self._paginate(
+            self._iter(filter_, tokens, per_page), max_items, prefetch
+        )
+
+    def iter_records(
+        self,
+        filter_: Optional[str] = None,
+        tokens: Optional[List[str]] = None,
+        per_page: int = DEFAULT_PER_PAGE,
+        max_items: Optional[int] = None,
+        prefetch: int = 0,
+        links: bool = False,
+    ) -> Iterator[DefinitionRecord]:
+        call = as_records(
+            self._iter(filter_, tokens, per_page),
+            DefinitionRecord,
+            "definitions",
+            links,
+        )
+        return self._paginate(call, max_items, prefetch)
 
-        return parse_obj_as(List[Definition], definitions)
+    def columns(
+        self,
+        filter_: Optional[str] = None,
+        tokens: Optional[List[str]] = None,
+        per_page: int = DEFAULT_PER_PAGE,
+        max_items: Optional[int] = None,
+        prefetch: int = 0,
+    ) -> Columns:
+        call = as_raw(self._iter(filter_, tokens, per_page), "definitions")
+        return build_columns(Definition, self._paginate(call, max_items, prefetch))
 
     def sync(
         self, definition_token: str, commit_message: Optional[str] = None
     ) -> Definition:
-        json = {"commit_message": commit_message}
-        response = self.request(
-            "PATCH", f"/definitions/{definition_token}/sync_to_github", json=json
-        )
+        return self._send(self._sync(definition_token, commit_message))
 
-        return Definition.parse_obj(response)
+
+B = TypeVar("B", bound=ModeBaseClient)
 
 
 class ModeClient:
-    def __init__(self, workspace: str, token: str, password: str):
+    def __init__(
+        self,
+        workspace: str,
+        token: str,
+        password: str,
+        base_url: str = DEFAULT_BASE_URL,
+        max_connections: Optional[int] = 10,
+        max_keepalive_connections: Optional[int] = 10,
+        keepalive_expiry: Optional[float] = 30.0,
+        http2: bool = False,
+        transport: Optional[httpx.BaseTransport] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+        retry: Optional[RetryPolicy] = None,
+        cache: Optional[Cache] = None,
+        coalesce: bool = False,
+        validate: bool = True,
+        parse_timestamps: bool = False,
+        json_decoder: Union[DecoderName, JsonDecoder] = "json",
+        search_index: Optional[SearchIndex] = None,
+        instrumentation: Optional[Instrumentation] = None,
+    ):
         self.workspace = workspace
         self.token = token
         self.password = password
+        self.client = build_http_client(
+            token,
+            password,
+            base_url=base_url,
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+            http2=http2,
+            transport=transport,
+        )
+        self.rate_limiter = rate_limiter
+        self.retry = retry
+        self.cache = cache
+        self.single_flight = SingleFlight() if coalesce else None
+        self.validate = validate
+        self.parse_timestamps = parse_timestamps
+        self.decoder = get_decoder(json_decoder)
+        self.search_index = search_index
+        self.instrumentation = instrumentation
+
+    def _subclient(self, cls: Type[B]) -> B:
+        return cls(
+            self.workspace,
+            self.token,
+            self.password,
+            client=self.client,
+            rate_limiter=self.rate_limiter,
+            retry=self.retry,
+            cache=self.cache,
+            single_flight=self.single_flight,
+            validate=self.validate,
+            parse_timestamps=self.parse_timestamps,
+            json_decoder=self.decoder,
+            search_index=self.search_index,
+            instrumentation=self.instrumentation,
+        )
+
+    def close(self) -> None:
+        self.client.close()
+
+    def __enter__(self) -> "ModeClient":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
 
     @property
     def account(self) -> ModeAccountClient:
-        return ModeAccountClient(self.workspace, self.token, self.password)
+        return self._subclient(ModeAccountClient)
 
     @property
     def query(self) -> ModeQueryClient:
-        return ModeQueryClient(self.workspace, self.token, self.password)
+        return self._subclient(ModeQueryClient)
 
     @property
     def query_run(self) -> ModeQueryRunClient:
-        return ModeQueryRunClient(self.workspace, self.token, self.password)
+        return self._subclient(ModeQueryRunClient)
 
     @property
     def report(self) -> ModeReportClient:
-        return ModeReportClient(self.workspace, self.token, self.password)
+        return self._subclient(ModeReportClient)
 
     @property
     def report_run(self) -> ModeReportRunClient:
-        return ModeReportRunClient(self.workspace, self.token, self.password)
+        return self._subclient(ModeReportRunClient)
 
     @property
     def space(self) -> ModeSpaceClient:
-        return ModeSpaceClient(self.workspace, self.token, self.password)
+        return self._subclient(ModeSpaceClient)
 
     @property
     def definition(self) -> ModeDefinitionClient:
-        return ModeDefinitionClient(self.workspace, self.token, self.password)
+        return self._subclient(ModeDefinitionClient)
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import json
+from functools import lru_cache
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Literal,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+    get_origin,
+)
+
+from pydantic import BaseModel
+from pydantic.fields import SHAPE_SINGLETON
+
+from mode_client.timestamps import parse_optional_timestamp
+
+if TYPE_CHECKING:
+    import pyarrow
+
+Kind = Literal["timestamp", "enum", "str", "int", "float", "bool", "json"]
+
+
+class Column(NamedTuple):
+    name: str
+    alias: str
+    kind: Kind
+
+
+SCALAR_KINDS: Dict[Any, Kind] = {str: "str", int: "int", float: "float", bool: "bool"}
+
+# How raw values are coerced to their field's type, as pydantic would coerce
+# them; the API sends some ``str`` fields, such as ids, as numbers.
+COERCIONS: Dict[str, Callable[[Any], Any]] = {"str": str, "int": int, "float": float}
+
+
+@lru_cache(maxsize=None)
+def model_columns(model: Type[BaseModel]) -> Tuple[Column, ...]:
+    """The columns for a model's fields, ``links`` excepted.
+
+    ``*_at`` strings are timestamps, and ``Literal`` fields and ``state``
+    strings are enums.
+    """
+    columns = []
+    for name, field in model.__fields__.items():
+        if name == "links":
+            continue
+
+        nested = field.type_
+        kind: Kind
+        if field.shape != SHAPE_SINGLETON:
+            kind = "json"
+        elif get_origin(nested) is Literal:
+            kind = "enum"
+        elif nested is str and name.endswith("_at"):
+            kind = "timestamp"
+        elif nested is str and (name == "state" or name.endswith("_state")):
+            kind = "enum"
+        else:
+            kind = SCALAR_KINDS.get(nested, "json")
+        columns.append(Column(name, field.alias, kind))
+
+    return tuple(columns)
+
+
+class Columns(Dict[str, List[Any]]):
+    """A listing as one list per field, ready for ``pandas.DataFrame(columns)``.
+
+    Timestamps are timezone-aware datetimes and enums are kept as strings.
+    """
+
+    def __init__(self, model: Type[BaseModel], data: Dict[str, List[Any]]):
+        super().__init__(data)
+        self.model = model
+
+    @property
+    def num_rows(self) -> int:
+        return len(next(iter(self.values()), ()))
+
+    def to_arrow(self) -> "pyarrow.Table":
+        """The columns as a ``pyarrow.Table`` (requires ``pip install pyarrow``):
+        timestamps are UTC ``timestamp[ms]``, enums are dictionary encoded and
+        dicts and lists are JSON strings."""
+        import pyarrow
+
+        types = {
+            "timestamp": pyarrow.timestamp("ms", tz="UTC"),
+            "enum": pyarrow.dictionary(pyarrow.int8(), pyarrow.string()),
+            "str": pyarrow.string(),
+            "int": pyarrow.int64(),
+            "float": pyarrow.float64(),
+            "bool": pyarrow.bool_(),
+            "json": pyarrow.string(),
+        }
+        arrays = {}
+        for column in model_columns(self.model):
+            values = self[column.name]
+            if column.kind == "json":
+                values = [None if v is None else json.dumps(v) for v in values]
+            elif column.kind == "enum":
+                encoded = pyarrow.array(values, pyarrow.string()).dictionary_encode()
+                arrays[column.name] = encoded.cast(types["enum"])
+                continue
+            arrays[column.name] = pyarrow.array(values, types[column.kind])
+
+        return pyarrow.table(arrays)
+
+
+def build_columns(model: Type[BaseModel], items: Iterable[Dict[str, Any]]) -> Columns:
+    """Columns straight from raw API items (``response["_embedded"][key]``),
+    without building a model per row."""
+    items = items if isinstance(items, list) else list(items)
+    data: Dict[str, List[Any]] = {}
+    for column in model_columns(model):
+        alias = column.alias
+        values: List[Optional[Any]] = [item.get(alias) for item in items]
+        if column.kind == "timestamp":
+            values = list(map(parse_optional_timestamp, values))
+        elif column.kind in COERCIONS:
+            coerce = COERCIONS[column.kind]
+            values = [None if v is None else coerce(v) for v in values]
+        data[column.name] = values
+
+    return Columns(model, data)
@@ -0,0 +1,339 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, List, Optional, Union
+
+from mode_client.batch import DEFAULT_CONCURRENCY, ITEM_ERRORS
+from mode_client.export import PathLike
+from mode_client.snapshot import SnapshotRecord, SnapshotWriter, Task, open_snapshot
+
+if TYPE_CHECKING:
+    from mode_client.async_clients import AsyncModeClient
+    from mode_client.clients import ModeClient
+
+# How each kind of task is fetched; the same calls serve both clients, which
+# return iterators or async iterators (coroutines for single objects).
+FETCHERS: Dict[str, Callable[..., Any]] = {
+    "spaces": lambda client: client.space.iter_spaces("all"),
+    "reports": lambda client, space: client.report.iter_reports(space),
+    "queries": lambda client, report: client.query.iter_queries(report),
+    "run": lambda client, report, run: client.report_run.get(report, run),
+    "query_runs": lambda client, report, run: client.query_run.iter_query_runs(
+        report, run
+    ),
+    "definitions": lambda client: client.definition.iter_definitions(),
+}
+SINGLE_KINDS = frozenset({"run"})
+
+# The kind of record each kind of task finds.
+RECORD_KINDS = {
+    "spaces": "space",
+    "reports": "report",
+    "changed_reports": "report",
+    "queries": "query",
+    "run": "report_run",
+    "query_runs": "query_run",
+    "definitions": "definition",
+}
+
+DEFAULT_PROGRESS_INTERVAL = 5.0
+
+
+def task_parent(task: Task) -> Optional[str]:
+    """The token of the object whose children a task lists."""
+    if task.kind == "query_runs":
+        return task.args[1]
+
+    return task.args[0] if task.args else None
+
+
+@dataclass
+class CrawlProgress:
+    """Where a crawl is at. ``pending`` counts known tasks not yet done; more
+    are found as it goes, so ``eta`` is a lower bound until listings settle."""
+
+    done: int = 0
+    pending: int = 0
+    records: int = 0
+    errors: Dict[str, Exception] = field(default_factory=dict)
+    resumed: bool = False
+    started: float = field(default_factory=time.perf_counter)
+    finished: Optional[float] = None
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished or time.perf_counter()) - self.started
+
+    @property
+    def tasks_per_second(self) -> float:
+        return self.done / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def records_per_second(self) -> float:
+        return self.records / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def eta(self) -> Optional[float]:
+        """Seconds until the pending tasks are done at the current rate."""
+        rate = self.tasks_per_second
+        return self.pending / rate if rate else None
+
+    def __str__(self) -> str:
+        eta = "?" if self.eta is None else str(timedelta(seconds=round(self.eta)))
+        return (
+            f"{self.done:,} tasks done, {self.pending:,} pending, "
+            f"{self.records:,} records, {len(self.errors):,} errors, "
+            f"{self.tasks_per_second:,.1f} tasks/s, ETA {eta}"
+        )
+
+
+class Crawl:
+    """Bookkeeping for a crawl, shared by both crawlers.
+
+    Tasks are taken from ``queue``; their results go through ``finish``, which
+    commits the records and newly found tasks to the writer in one step.
+    """
+
+    def __init__(
+        self,
+        writer: SnapshotWriter,
+        roots: List[Task],
+        expand: Callable[[Task, List[Any]], List[Task]],
+        on_progress: Optional[Callable[[CrawlProgress], None]],
+        progress_interval: float,
+    ):
+        self.writer = writer
+        self.expand = expand
+        self.on_progress = on_progress
+        self.progress_interval = progress_interval
+        self.progress = CrawlProgress()
+
+        pending = writer.pending()
+        if pending is None:
+            writer.start(roots)
+            pending = roots
+        else:
+            self.progress.resumed = True
+
+        self.queue: Deque[Task] = deque(pending)
+        self.progress.pending = len(pending)
+        self._reported = time.perf_counter()
+
+    def finish(self, task: Task, items: List[Any]) -> None:
+        kind = RECORD_KINDS[task.kind]
+        parent = task_parent(task)
+        records = [SnapshotRecord.from_model(kind, item, parent) for item in items]
+        children = self.expand(task, items)
+        self.writer.commit(task, records, children)
+        self.queue.extend(children)
+
+        self.progress.done += 1
+        self.progress.pending += len(children) - 1
+        self.progress.records += len(records)
+        self.report()
+
+    def fail(self, task: Task, error: Exception) -> None:
+        """Leave a task pending in the checkpoint, for a resumed crawl to retry."""
+        self.progress.errors[task.key] = error
+        self.progress.pending -= 1
+        self.report()
+
+    def report(self, final: bool = False) -> None:
+        if final:
+            self.progress.finished = time.perf_counter()
+
+        if not self.on_progress:
+            return
+
+        now = time.perf_counter()
+        if final or now - self._reported >= self.progress_interval:
+            self._reported = now
+            self.on_progress(self.progress)
+
+
+class BaseCrawler:
+    def __init__(
+        self,
+        snapshot: Union[SnapshotWriter, PathLike],
+        concurrency: int = DEFAULT_CONCURRENCY,
+        definitions: bool = True,
+        queries: bool = True,
+        runs: bool = True,
+        on_progress: Optional[Callable[[CrawlProgress], None]] = None,
+        progress_interval: float = DEFAULT_PROGRESS_INTERVAL,
+    ):
+        self.snapshot = (
+            snapshot
+            if isinstance(snapshot, SnapshotWriter)
+            else open_snapshot(snapshot)
+        )
+        self.concurrency = max(1, concurrency)
+        self.definitions = definitions
+        self.queries = queries
+        self.runs = runs
+        self.on_progress = on_progress
+        self.progress_interval = progress_interval
+
+    def _roots(self) -> List[Task]:
+        roots = [Task("spaces")]
+        if self.definitions:
+            roots.append(Task("definitions"))
+
+        return roots
+
+    def _expand(self, task: Task, items: List[Any]) -> List[Task]:
+        """The tasks found by a finished task."""
+        if task.kind == "spaces":
+            return [Task("reports", (space.token,)) for space in items]
+        if task.kind == "reports":
+            return [task for report in items for task in self._report_tasks(report)]
+        if task.kind == "run":
+            return [Task("query_runs", task.args)]
+
+        return []
+
+    def _report_tasks(self, report: Any) -> List[Task]:
+        tasks = []
+        if self.queries:
+            tasks.append(Task("queries", (report.token,)))
+        if self.runs and report.last_successful_run_token:
+            tasks.append(Task("run", (report.token, report.last_successful_run_token)))
+
+        return tasks
+
+    def _crawl(self) -> Crawl:
+        return Crawl(
+            self.snapshot,
+            self._roots(),
+            self._expand,
+            self.on_progress,
+            self.progress_interval,
+        )
+
+
+class WorkspaceCrawler(BaseCrawler):
+    """Snapshots a workspace: every space, its reports and their queries, each
+    report's latest successful run and its query runs, and definitions.
+
+    Listings run on ``concurrency`` threads through one client, so they share
+    its rate limiter, retry policy and connection pool. Progress is
+    checkpointed with the snapshot; running a crawler on the same snapshot
+    again resumes where it stopped.
+    """
+
+    def __init__(
+        self,
+        client: "ModeClient",
+        snapshot: Union[SnapshotWriter, PathLike],
+        concurrency: int = DEFAULT_CONCURRENCY,
+        definitions: bool = True,
+        queries: bool = True,
+        runs: bool = True,
+        on_progress: Optional[Callable[[CrawlProgress], None]] = None,
+        progress_interval: float = DEFAULT_PROGRESS_INTERVAL,
+    ):
+        super().__init__(
+            snapshot,
+            concurrency,
+            definitions,
+            queries,
+            runs,
+            on_progress,
+            progress_interval,
+        )
+        self.client = client
+
+    def _fetch(self, task: Task) -> List[Any]:
+        result = FETCHERS[task.kind](self.client, *task.args)
+        return [result] if task.kind in SINGLE_KINDS else list(result)
+
+    def run(self) -> CrawlProgress:
+        crawl = self._crawl()
+        running: Dict[Future[List[Any]], Task] = {}
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            while crawl.queue or running:
+                while crawl.queue and len(running) < self.concurrency:
+                    task = crawl.queue.popleft()
+                    running[executor.submit(self._fetch, task)] = task
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    task = running.pop(future)
+                    try:
+                        items = future.result()
+                    except ITEM_ERRORS as error:
+                        crawl.fail(task, error)
+                    else:
+                        crawl.finish(task, items)
+
+        crawl.report(final=True)
+        return crawl.progress
+
+
+class AsyncWorkspaceCrawler(BaseCrawler):
+    """``WorkspaceCrawler`` for ``AsyncModeClient``."""
+
+    def __init__(
+        self,
+        client: "AsyncModeClient",
+        snapshot: Union[SnapshotWriter, PathLike],
+        concurrency: int = DEFAULT_CONCURRENCY,
+        definitions: bool = True,
+        queries: bool = True,
+        runs: bool = True,
+        on_progress: Optional[Callable[[CrawlProgress], None]] = None,
+        progress_interval: float = DEFAULT_PROGRESS_INTERVAL,
+    ):
+        super().__init__(
+            snapshot,
+            concurrency,
+            definitions,
+            queries,
+            runs,
+            on_progress,
+            progress_interval,
+        )
+        self.client = client
+
+    async def _fetch(self, task: Task) -> List[Any]:
+        result = FETCHERS[task.kind](self.client, *task.args)
+        if task.kind in SINGLE_KINDS:
+            return [await result]
+
+        return [item async for item in result]
+
+    async def run(self) -> CrawlProgress:
+        crawl = self._crawl()
+        running: Dict[asyncio.Task[List[Any]], Task] = {}
+        try:
+            while crawl.queue or running:
+                while crawl.queue and len(running) < self.concurrency:
+                    task = crawl.queue.popleft()
+                    running[asyncio.ensure_future(self._fetch(task))] = task
+
+                finished, _ = await asyncio.wait(
+                    running, return_when=asyncio.FIRST_COMPLETED
+                )
+                for future in finished:
+                    task = running.pop(future)
+                    try:
+                        items = future.result()
+                    except ITEM_ERRORS as error:
+                        crawl.fail(task, error)
+                    else:
+                        crawl.finish(task, items)
+        finally:
+            for future in running:
+                future.cancel()
+
+        crawl.report(final=True)
+        return crawl.progress
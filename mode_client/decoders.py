@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import json
+import warnings
+from functools import lru_cache
+from typing import (
+    Any,
+    Dict,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    get_args,
+    get_origin,
+    get_type_hints,
+)
+
+import httpx
+from pydantic import BaseModel
+from pydantic.fields import SHAPE_LIST, SHAPE_SINGLETON, ModelField
+
+from mode_client.lazy import LazyLinks
+
+M = TypeVar("M", bound=BaseModel)
+
+DecoderName = Literal["auto", "json", "orjson", "msgspec"]
+
+# pydantic coerces numbers to strings, and the API sends some ``str`` fields,
+# such as ids, as numbers.
+LAX_STR = Union[str, int, float]
+
+
+class JsonDecoder:
+    """The standard library's ``json``, as used by ``httpx``."""
+
+    name = "json"
+
+    def decode(self, content: Union[bytes, str]) -> Any:
+        return json.loads(content)
+
+    def decode_response(self, response: httpx.Response) -> Any:
+        return response.json()
+
+
+class OrjsonDecoder(JsonDecoder):
+    name = "orjson"
+
+    def __init__(self) -> None:
+        import orjson
+
+        self._loads = orjson.loads
+
+    def decode(self, content: Union[bytes, str]) -> Any:
+        return self._loads(content)
+
+    def decode_response(self, response: httpx.Response) -> Any:
+        return self._loads(response.content)
+
+
+class MsgspecDecoder(JsonDecoder):
+    """msgspec's JSON decoder, which can also decode straight into the models.
+
+    ``decode_model`` and ``decode_models`` validate the JSON against msgspec
+    structs mirroring the models and build the models from them without
+    running pydantic's validation again; as with ``validate=False``, ``links``
+    is only parsed when first read.
+    """
+
+    name = "msgspec"
+
+    def __init__(self) -> None:
+        import msgspec
+
+        self._decoder = msgspec.json.Decoder()
+
+    def decode(self, content: Union[bytes, str]) -> Any:
+        return self._decoder.decode(content)
+
+    def decode_response(self, response: httpx.Response) -> Any:
+        return self._decoder.decode(response.content)
+
+    def decode_struct(self, content: Union[bytes, str], model: Type[BaseModel]) -> Any:
+        return typed_decoder(model_struct(model)).decode(content)
+
+    def decode_model(self, content: Union[bytes, str], model: Type[M]) -> M:
+        return struct_to_model(model, self.decode_struct(content, model))
+
+    def decode_models(
+        self, content: Union[bytes, str], model: Type[M], key: str
+    ) -> List[M]:
+        """The models embedded in a listing response under ``_embedded[key]``."""
+        return self.decode_page(content, model, key)[0]
+
+    def decode_page(
+        self, content: Union[bytes, str], model: Type[M], key: str
+    ) -> Tuple[List[M], Dict[str, Any]]:
+        """A listing's models, and its ``pagination`` and ``_links`` as dicts."""
+        listing = typed_decoder(listing_struct(model, key)).decode(content)
+        items = getattr(listing.embedded, key)
+        rest = {"pagination": listing.pagination, "_links": listing.links}
+        return [struct_to_model(model, item) for item in items], rest
+
+
+DECODERS: Dict[str, Type[JsonDecoder]] = {
+    "msgspec": MsgspecDecoder,
+    "orjson": OrjsonDecoder,
+    "json": JsonDecoder,
+}
+
+
+def get_decoder(decoder: Union[DecoderName, JsonDecoder] = "json") -> JsonDecoder:
+    """A decoder by name; ``"auto"`` picks the fastest one installed.
+
+    A named backend that isn't installed falls back to the standard library
+    with a warning.
+    """
+    if isinstance(decoder, JsonDecoder):
+        return decoder
+
+    if decoder == "auto":
+        for cls in DECODERS.values():
+            try:
+                return cls()
+            except ImportError:
+                continue
+
+    try:
+        return DECODERS[decoder]()
+    except ImportError:
+        warnings.warn(
+            f"{decoder} is not installed, decoding JSON with the standard library",
+            RuntimeWarning,
+            stacklevel=2,
+        )
+        return JsonDecoder()
+
+
+@lru_cache(maxsize=None)
+def model_struct(model: Type[BaseModel]) -> Any:
+    """A msgspec struct with a model's fields, named by their aliases in JSON."""
+    import msgspec
+
+    hints = get_type_hints(model)
+    fields: List[Any] = []
+    for name, field in model.__fields__.items():
+        hint = struct_type(hints[name])
+        if field.required:
+            fields.append((name, hint))
+        else:
+            fields.append((name, Optional[hint], field.default))
+
+    rename = {
+        name: field.alias
+        for name, field in model.__fields__.items()
+        if field.alias != name
+    }
+    return msgspec.defstruct(model.__name__, fields, kw_only=True, rename=rename)
+
+
+@lru_cache(maxsize=None)
+def listing_struct(model: Type[BaseModel], key: str) -> Any:
+    import msgspec
+
+    items = List[model_struct(model)]  # type: ignore
+    embedded = msgspec.defstruct("Embedded", [(key, items)])
+    return msgspec.defstruct(
+        f"{model.__name__}Listing",
+        [
+            ("embedded", embedded),
+            ("pagination", Optional[Dict[str, Any]], None),
+            ("links", Optional[Dict[str, Any]], None),
+        ],
+        rename={"embedded": "_embedded", "links": "_links"},
+    )
+
+
+@lru_cache(maxsize=None)
+def typed_decoder(struct: Any) -> Any:
+    """A decoder into ``struct`` that converts values the way pydantic would,
+    e.g. numeric strings into numbers, where msgspec supports it."""
+    import msgspec
+
+    try:
+        return msgspec.json.Decoder(struct, strict=False)
+    except TypeError:  # msgspec < 0.16
+        return msgspec.json.Decoder(struct)
+
+
+def struct_type(hint: Any) -> Any:
+    if hint is str:
+        return LAX_STR
+    if isinstance(hint, type) and issubclass(hint, BaseModel):
+        return model_struct(hint)
+
+    origin = get_origin(hint)
+    if origin is None or origin is Literal:
+        return hint
+
+    args = tuple(struct_type(arg) for arg in get_args(hint))
+    if origin is Union:
+        return Union[args]
+    if origin is list:
+        return List[args]  # type: ignore
+    if origin is dict:
+        return Dict[(get_args(hint)[0], args[1])]  # type: ignore
+    return hint
+
+
+def struct_to_model(model: Type[M], struct: Any) -> M:
+    values = {
+        name: struct_value(field, getattr(struct, name))
+        for name, field in model.__fields__.items()
+    }
+
+    instance = model.__new__(model)
+    object.__setattr__(instance, "__dict__", values)
+    object.__setattr__(instance, "__fields_set__", set(values))
+    return instance
+
+
+def struct_value(field: ModelField, value: Any) -> Any:
+    nested = field.type_
+    if nested is str and value is not None:
+        if field.shape == SHAPE_SINGLETON:
+            return str(value)
+        if field.shape == SHAPE_LIST:
+            return [str(item) for item in value]
+    if value is None or not (
+        isinstance(nested, type) and issubclass(nested, BaseModel)
+    ):
+        return value
+
+    if isinstance(value, list):
+        return [struct_to_model(nested, item) for item in value]
+    if field.alias == "_links":
+        import msgspec
+
+        return LazyLinks(nested, msgspec.to_builtins(value))
+    return struct_to_model(nested, value)
@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import json
+import re
+import sqlite3
+from collections import defaultdict, deque
+from typing import (
+    Any,
+    DefaultDict,
+    Deque,
+    Dict,
+    FrozenSet,
+    Iterable,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from mode_client.export import PathLike
+from mode_client.search import COMMENTS, field
+
+# Definitions are pulled into SQL with Liquid, as ``{{ @definition_name }}``.
+DEFINITION_REFERENCE = re.compile(r"\{\{\s*@([\w.-]+)")
+
+Node = Tuple[str, str]
+
+
+def definition_key(name: str) -> str:
+    """How a definition's name is written in a reference to it."""
+    return re.sub(r"\W+", "_", name.strip()).lower()
+
+
+def definition_references(sql: Optional[str]) -> Set[str]:
+    """The keys of the definitions referenced in SQL, outside comments."""
+    if not sql:
+        return set()
+
+    sql = COMMENTS.sub(" ", sql)
+    return {definition_key(name) for name in DEFINITION_REFERENCE.findall(sql)}
+
+
+class Impact(NamedTuple):
+    """Everything a change to a definition reaches: the definitions built on
+    it, directly or not, the queries using any of them and their reports."""
+
+    definitions: FrozenSet[str]
+    queries: FrozenSet[str]
+    reports: FrozenSet[str]
+    scheduled_reports: FrozenSet[str]
+
+
+class DependencyGraph:
+    """Which queries and definitions reference each definition.
+
+    References are kept by the key they're written with, in both directions,
+    so adding or removing a query touches only its own edges and a
+    definition added after the queries using it still picks them up.
+    ``impact`` walks the reverse edges once per definition and caches the
+    result until the graph next changes.
+    """
+
+    def __init__(self) -> None:
+        self._definitions: Dict[str, str] = {}  # token -> key
+        self._keys: DefaultDict[str, Set[str]] = defaultdict(set)  # key -> tokens
+        self._references: Dict[Node, Set[str]] = {}
+        self._referrers: DefaultDict[str, Set[Node]] = defaultdict(set)
+        self._reports: Dict[str, str] = {}  # query -> report
+        self._queries: DefaultDict[str, Set[str]] = defaultdict(set)  # the reverse
+        self._scheduled: Set[str] = set()
+        self._impacts: Dict[str, Impact] = {}
+
+    def add_definition(self, definition: Any) -> None:
+        """Add or update a ``Definition``, its record or its API dict."""
+        token = field(definition, "token")
+        self.remove_definition(token)
+        key = definition_key(field(definition, "name") or token)
+        self._definitions[token] = key
+        self._keys[key].add(token)
+        self._link(("definition", token), field(definition, "source"))
+
+    def add_definitions(self, definitions: Iterable[Any]) -> None:
+        for definition in definitions:
+            self.add_definition(definition)
+
+    def add_query(self, query: Any, report: Optional[str] = None) -> None:
+        """Add or update a ``Query``, its record or its API dict."""
+        token = field(query, "token")
+        self._unlink(("query", token))
+        if report is not None:
+            self._queries[self._reports.get(token, report)].discard(token)
+            self._reports[token] = report
+            self._queries[report].add(token)
+        self._link(("query", token), field(query, "raw_query"))
+
+    def add_queries(self, queries: Iterable[Any], report: Optional[str] = None) -> None:
+        for query in queries:
+            self.add_query(query, report)
+
+    def add_report(self, report: Any) -> None:
+        """Note whether a report runs on a schedule."""
+        token = field(report, "token")
+        self._impacts.clear()
+        if field(report, "schedules_count"):
+            self._scheduled.add(token)
+        else:
+            self._scheduled.discard(token)
+
+    def remove_query(self, token: str) -> None:
+        self._unlink(("query", token))
+        report = self._reports.pop(token, None)
+        if report is not None:
+            self._queries[report].discard(token)
+
+    def remove_definition(self, token: str) -> None:
+        key = self._definitions.pop(token, None)
+        if key is not None:
+            self._keys[key].discard(token)
+        self._unlink(("definition", token))
+
+    def remove_report(self, token: str) -> None:
+        for query in list(self._queries.pop(token, ())):
+            self.remove_query(query)
+        self._scheduled.discard(token)
+        self._impacts.clear()
+
+    def _link(self, node: Node, sql: Optional[str]) -> None:
+        keys = definition_references(sql)
+        self._references[node] = keys
+        for key in keys:
+            self._referrers[key].add(node)
+        self._impacts.clear()
+
+    def _unlink(self, node: Node) -> None:
+        for key in self._references.pop(node, ()):
+            self._referrers[key].discard(node)
+        self._impacts.clear()
+
+    def references(self, kind: str, token: str) -> Set[str]:
+        """The tokens of the definitions a query or definition references."""
+        keys = self._references.get((kind, token), ())
+        return {definition for key in keys for definition in self._keys.get(key, ())}
+
+    def impact(self, definition: str) -> Impact:
+        """What a change to a definition, by token or name, reaches."""
+        token = self._resolve(definition)
+        cached = self._impacts.get(token)
+        if cached is not None:
+            return cached
+
+        definitions = {token}
+        queries = set()
+        pending: Deque[str] = deque([token])
+        while pending:
+            current = pending.popleft()
+            for kind, referrer in self._referrers.get(self._key(current), ()):
+                if kind == "query":
+                    queries.add(referrer)
+                elif referrer not in definitions:
+                    definitions.add(referrer)
+                    pending.append(referrer)
+
+        definitions.discard(token)
+        reports = {self._reports[q] for q in queries if q in self._reports}
+        impact = Impact(
+            frozenset(definitions),
+            frozenset(queries),
+            frozenset(reports),
+            frozenset(reports & self._scheduled),
+        )
+        self._impacts[token] = impact
+        return impact
+
+    def _key(self, token: str) -> str:
+        return self._definitions.get(token, definition_key(token))
+
+    def _resolve(self, definition: str) -> str:
+        if definition in self._definitions:
+            return definition
+
+        tokens = self._keys.get(definition_key(definition))
+        if tokens and len(tokens) == 1:
+            return next(iter(tokens))
+        if tokens:
+            raise ValueError(f"{definition!r} names more than one definition")
+        raise KeyError(definition)
+
+    def apply(self, deltas: Iterable[Any]) -> Optional[int]:
+        """Follow a ``SyncStore``'s deltas; returns the id of the last one, to
+        pass as ``after`` next time."""
+        last = None
+        for delta in deltas:
+            last = delta.id
+            if delta.kind == "query":
+                if delta.op == "delete":
+                    self.remove_query(delta.token)
+                else:
+                    self.add_query(delta.data, delta.parent)
+            elif delta.kind == "definition":
+                if delta.op == "delete":
+                    self.remove_definition(delta.token)
+                else:
+                    self.add_definition(delta.data)
+            elif delta.kind == "report":
+                if delta.op == "delete":
+                    self.remove_report(delta.token)
+                else:
+                    self.add_report(delta.data)
+
+        return last
+
+    @classmethod
+    def from_snapshot(cls, path: PathLike) -> "DependencyGraph":
+        """A graph of the queries, definitions and reports in a sqlite snapshot
+        written by ``WorkspaceCrawler``, ``WorkspaceSync`` or ``Mirror``."""
+        graph = cls()
+        snapshot = sqlite3.connect(str(path))
+        try:
+            rows = snapshot.execute(
+                "SELECT kind, parent, data FROM records "
+                "WHERE kind IN ('definition', 'query', 'report')"
+            ).fetchall()
+        finally:
+            snapshot.close()
+
+        for kind, parent, data in rows:
+            item = json.loads(data)
+            if kind == "definition":
+                graph.add_definition(item)
+            elif kind == "query":
+                graph.add_query(item, parent)
+            else:
+                graph.add_report(item)
+
+        return graph
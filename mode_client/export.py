@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import IO, Any, Dict, List, Optional, Union
+
+import httpx
+
+from mode_client.models import QueryRun
+from mode_client.results import ResultFormat
+
+MANIFEST_NAME = "manifest.json"
+PARTIAL_SUFFIX = ".part"
+
+PathLike = Union[str, "os.PathLike[str]"]
+
+
+@dataclass
+class ExportedResult:
+    """One query run's results on disk.
+
+    ``bytes`` is the final file size; ``resumed_from`` is how much of it was
+    already on disk from an interrupted export, and ``reused`` means the file
+    was complete and nothing was downloaded.
+    """
+
+    query_run: str
+    query: str
+    query_name: str
+    path: str
+    bytes: int = 0
+    resumed_from: int = 0
+    seconds: float = 0.0
+    reused: bool = False
+
+    @property
+    def downloaded(self) -> int:
+        return 0 if self.reused else self.bytes - self.resumed_from
+
+
+@dataclass
+class ExportManifest:
+    """Outcome of ``report_run.export_results``, keyed by query run token.
+
+    ``skipped`` maps query runs that did not succeed to their state.
+    """
+
+    report: str
+    run: str
+    format: ResultFormat
+    results: Dict[str, ExportedResult] = field(default_factory=dict)
+    errors: Dict[str, Exception] = field(default_factory=dict)
+    skipped: Dict[str, str] = field(default_factory=dict)
+    seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    @property
+    def bytes(self) -> int:
+        return sum(result.bytes for result in self.results.values())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "report": self.report,
+            "run": self.run,
+            "format": self.format,
+            "seconds": self.seconds,
+            "bytes": self.bytes,
+            "results": [asdict(result) for result in self.results.values()],
+            "errors": {token: repr(error) for token, error in self.errors.items()},
+            "skipped": self.skipped,
+        }
+
+
+def result_path(dest_dir: PathLike, query_run: QueryRun, format: ResultFormat) -> Path:
+    return Path(dest_dir) / f"{query_run.token}.{format}"
+
+
+def partial_path(path: Path) -> Path:
+    return path.with_name(path.name + PARTIAL_SUFFIX)
+
+
+def start_export(path: Path, query_run: QueryRun) -> ExportedResult:
+    result = ExportedResult(
+        query_run.token, query_run.query_token, query_run.query_name, str(path)
+    )
+    if path.exists():
+        # Files only get their final name once complete.
+        result.bytes = path.stat().st_size
+        result.reused = True
+
+    return result
+
+
+def resume_offset(path: Path) -> int:
+    part = partial_path(path)
+    return part.stat().st_size if part.exists() else 0
+
+
+def range_headers(offset: int) -> Optional[Dict[str, str]]:
+    if not offset:
+        return None
+
+    # Ranges apply to the encoded body, so ask for it unencoded.
+    return {"Range": f"bytes={offset}-", "Accept-Encoding": "identity"}
+
+
+def range_not_satisfiable(error: httpx.HTTPStatusError, offset: int) -> bool:
+    """Whether a resumed download should restart from scratch."""
+    return bool(offset) and error.response.status_code == 416
+
+
+def open_partial(
+    path: Path, result: ExportedResult, response: httpx.Response, offset: int
+) -> IO[bytes]:
+    # Servers that ignore the Range header send the whole body again.
+    result.resumed_from = offset if response.status_code == 206 else 0
+    result.bytes = result.resumed_from
+    return open(partial_path(path), "ab" if result.resumed_from else "wb")
+
+
+def sync_file(file: IO[bytes]) -> None:
+    file.flush()
+    os.fsync(file.fileno())
+
+
+def finish_export(path: Path, result: ExportedResult, start: float) -> ExportedResult:
+    os.replace(partial_path(path), path)
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+def discard_partial(path: Path) -> None:
+    partial_path(path).unlink(missing_ok=True)
+
+
+def split_query_runs(
+    manifest: ExportManifest, query_runs: List[QueryRun]
+) -> List[QueryRun]:
+    exportable = []
+    for query_run in query_runs:
+        if query_run.state == "succeeded":
+            exportable.append(query_run)
+        else:
+            manifest.skipped[query_run.token] = query_run.state
+
+    return exportable
+
+
+def write_manifest(manifest: ExportManifest, dest_dir: PathLike) -> Path:
+    path = Path(dest_dir) / MANIFEST_NAME
+    part = partial_path(path)
+    part.write_text(json.dumps(manifest.to_dict(), indent=2))
+    os.replace(part, path)
+    return path
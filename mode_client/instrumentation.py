@@ -0,0 +1,317 @@
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    DefaultDict,
+    Dict,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+)
+
+from mode_client.stats import RequestStats
+
+if TYPE_CHECKING:
+    from opentelemetry.trace import Tracer
+
+Event = Literal["request", "response", "retry", "cache_hit", "parse"]
+Hook = Callable[[str, RequestStats], None]
+
+LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+PARSE_BUCKETS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    1.0,
+)
+BYTES_BUCKETS = tuple(float(256 * 4**i) for i in range(10))  # 256 B to 64 MiB
+
+# Name, help and buckets of each histogram kept by ``Metrics``.
+HISTOGRAMS = {
+    "request_seconds": (
+        "Request time, including retries and backoff.",
+        LATENCY_BUCKETS,
+    ),
+    "queue_wait_seconds": (
+        "Time spent waiting on the rate limiter before sending.",
+        LATENCY_BUCKETS,
+    ),
+    "response_bytes": ("Size of response bodies.", BYTES_BUCKETS),
+    "parse_seconds": ("Time spent parsing responses into models.", PARSE_BUCKETS),
+}
+COUNTERS = {
+    "requests_total": "Requests sent, by status code.",
+    "retries_total": "Requests retried.",
+    "cache_hits_total": "Requests answered by the cache, fresh or revalidated.",
+}
+
+Key = Tuple[str, ...]
+
+
+class Histogram:
+    """Counts of observed values in fixed buckets, as Prometheus keeps them."""
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """The upper bound of the bucket holding the ``q`` quantile."""
+        if not self.count:
+            return 0.0
+
+        target = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= target:
+                return min(bound, self.max)
+        return self.max
+
+
+class Metrics:
+    """Histograms and counters for requests, by method and endpoint template
+    such as ``/reports/{report}/runs``."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.histograms: Dict[Tuple[str, Key], Histogram] = {}
+        self.counters: DefaultDict[Tuple[str, Key], int] = defaultdict(int)
+
+    def observe(self, event: str, stats: RequestStats) -> None:
+        endpoint = (stats.method, stats.template or stats.resource)
+        with self._lock:
+            if event == "response":
+                self._observe("request_seconds", endpoint, stats.elapsed)
+                self._observe("queue_wait_seconds", endpoint, stats.rate_limit_wait)
+                self._observe("response_bytes", endpoint, stats.response_bytes)
+                self.counters[
+                    "requests_total", (*endpoint, str(stats.status_code))
+                ] += 1
+            elif event == "parse":
+                self._observe("parse_seconds", endpoint, stats.parse_time)
+            elif event == "retry":
+                self.counters["retries_total", endpoint] += 1
+            elif event == "cache_hit":
+                self.counters["cache_hits_total", endpoint] += 1
+
+    def _observe(self, name: str, key: Key, value: float) -> None:
+        histogram = self.histograms.get((name, key))
+        if histogram is None:
+            histogram = self.histograms[name, key] = Histogram(HISTOGRAMS[name][1])
+        histogram.observe(value)
+
+    def histogram(
+        self, name: str, template: str, method: str = "GET"
+    ) -> Optional[Histogram]:
+        return self.histograms.get((name, (method, template)))
+
+    def summary(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Count, mean, p50, p95, p99 and max of each histogram, by
+        ``"<method> <template>"``."""
+        summary: Dict[str, Dict[str, Dict[str, float]]] = {}
+        with self._lock:
+            for (name, (method, template)), histogram in sorted(
+                self.histograms.items()
+            ):
+                summary.setdefault(name, {})[f"{method} {template}"] = {
+                    "count": histogram.count,
+                    "mean": histogram.mean,
+                    "p50": histogram.quantile(0.5),
+                    "p95": histogram.quantile(0.95),
+                    "p99": histogram.quantile(0.99),
+                    "max": histogram.max,
+                }
+        return summary
+
+    def reset(self) -> None:
+        with self._lock:
+            self.histograms.clear()
+            self.counters.clear()
+
+
+class Instrumentation:
+    """Event hooks around a client's requests, plus built-in ``metrics``.
+
+    Passed to a client as ``instrumentation``, it's told of each request
+    before it's sent (``request``), once it's answered or failed
+    (``response``), before each retry (``retry``), when the cache answers it
+    (``cache_hit``) and once its response is parsed into models (``parse``).
+    Hooks get the event and the request's ``RequestStats``. Without an
+    instrumentation, clients skip all of this.
+    """
+
+    def __init__(self, metrics: bool = True):
+        self.metrics = Metrics() if metrics else None
+        self._hooks: DefaultDict[str, List[Hook]] = defaultdict(list)
+
+    def on(self, event: Event, hook: Hook) -> Hook:
+        self._hooks[event].append(hook)
+        return hook
+
+    def off(self, event: Event, hook: Hook) -> None:
+        self._hooks[event].remove(hook)
+
+    def emit(self, event: Event, stats: RequestStats) -> None:
+        if self.metrics is not None:
+            self.metrics.observe(event, stats)
+        for hook in self._hooks.get(event, ()):
+            hook(event, stats)
+
+
+def escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def prometheus_text(metrics: Metrics, prefix: str = "mode_client") -> str:
+    """The metrics in Prometheus' text exposition format."""
+    lines = []
+    with metrics._lock:
+        for name, (help, buckets) in HISTOGRAMS.items():
+            series = sorted(
+                (key, histogram)
+                for (metric, key), histogram in metrics.histograms.items()
+                if metric == name
+            )
+            if not series:
+                continue
+
+            lines += [
+                f"# HELP {prefix}_{name} {help}",
+                f"# TYPE {prefix}_{name} histogram",
+            ]
+            for (method, template), histogram in series:
+                labels = f'method="{method}",endpoint="{escape_label(template)}"'
+                cumulative = 0
+                for bound, count in zip((*buckets, "+Inf"), histogram.counts):
+                    cumulative += count
+                    lines.append(
+                        f'{prefix}_{name}_bucket{{{labels},le="{bound}"}} {cumulative}'
+                    )
+                lines.append(f"{prefix}_{name}_sum{{{labels}}} {histogram.sum}")
+                lines.append(f"{prefix}_{name}_count{{{labels}}} {histogram.count}")
+
+        for name, help in COUNTERS.items():
+            counts = sorted(
+                (key, count)
+                for (metric, key), count in metrics.counters.items()
+                if metric == name
+            )
+            if not counts:
+                continue
+
+            lines += [
+                f"# HELP {prefix}_{name} {help}",
+                f"# TYPE {prefix}_{name} counter",
+            ]
+            for key, count in counts:
+                labels = f'method="{key[0]}",endpoint="{escape_label(key[1])}"'
+                if len(key) > 2:
+                    labels += f',status="{key[2]}"'
+                lines.append(f"{prefix}_{name}{{{labels}}} {count}")
+
+    return "\n".join(lines) + "\n"
+
+
+def trace_requests(
+    instrumentation: Instrumentation, tracer: Optional["Tracer"] = None
+) -> None:
+    """Record each request as an OpenTelemetry client span, and each parse as
+    a span of its own (requires ``pip install opentelemetry-api``)."""
+    from opentelemetry import trace
+
+    active_tracer: Tracer = tracer or trace.get_tracer("mode_client")
+    spans: Dict[int, Any] = {}
+
+    def start(event: str, stats: RequestStats) -> None:
+        spans[id(stats)] = active_tracer.start_span(
+            f"{stats.method} {stats.template or stats.resource}",
+            kind=trace.SpanKind.CLIENT,
+            attributes={
+                "http.method": stats.method,
+                "http.route": stats.template or stats.resource,
+                "mode_client.resource": stats.resource,
+            },
+        )
+
+    def end(event: str, stats: RequestStats) -> None:
+        span = spans.pop(id(stats), None)
+        if span is None:
+            return
+
+        if stats.status_code is not None:
+            span.set_attribute("http.status_code", stats.status_code)
+        if stats.status_code is None or stats.status_code >= 400:
+            span.set_status(trace.Status(trace.StatusCode.ERROR))
+        span.set_attributes(
+            {
+                "mode_client.retries": stats.retries,
+                "mode_client.backoff": stats.backoff,
+                "mode_client.rate_limit_wait": stats.rate_limit_wait,
+                "mode_client.response_bytes": stats.response_bytes,
+                "mode_client.cache": stats.cache or "",
+            }
+        )
+        span.end()
+
+    def retry(event: str, stats: RequestStats) -> None:
+        span = spans.get(id(stats))
+        if span is not None:
+            span.add_event("retry", {"mode_client.retries": stats.retries})
+
+    def parse(event: str, stats: RequestStats) -> None:
+        end_time = time.time_ns()
+        span = active_tracer.start_span(
+            f"parse {stats.template or stats.resource}",
+            start_time=end_time - int(stats.parse_time * 1e9),
+        )
+        span.end(end_time=end_time)
+
+    instrumentation.on("request", start)
+    instrumentation.on("response", end)
+    instrumentation.on("cache_hit", end)
+    instrumentation.on("retry", retry)
+    instrumentation.on("parse", parse)
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Dict, List, Type, TypeVar, cast
+
+from pydantic import BaseModel
+from pydantic.fields import SHAPE_LIST, SHAPE_SINGLETON, ModelField
+
+from mode_client.models import TIMED_MODELS
+from mode_client.timestamps import parse_timestamp
+
+M = TypeVar("M", bound=BaseModel)
+
+# Whether responses are being parsed with full validation; clients created
+# with ``validate=False`` switch it off around parsing.
+validating: ContextVar[bool] = ContextVar("validating", default=True)
+
+# Whether timestamps are being parsed into datetimes, for clients created with
+# ``parse_timestamps=True``.
+typed_timestamps: ContextVar[bool] = ContextVar("typed_timestamps", default=False)
+
+
+class LazyLinks(Dict[str, Any]):
+    """A raw ``_links`` object, parsed into its model on first attribute access.
+
+    It is still the raw dict, so ``.dict()`` and ``.json()`` on the owning
+    model work without parsing it.
+    """
+
+    def __init__(self, model: Type[BaseModel], data: Dict[str, Any]):
+        super().__init__(data)
+        self._model = model
+        self._parsed: Any = None
+
+    @property
+    def parsed(self) -> Any:
+        if self._parsed is None:
+            self._parsed = self._model.parse_obj(dict(self))
+
+        return self._parsed
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        return getattr(self.parsed, name)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, LazyLinks):
+            return dict.__eq__(self, other)
+
+        return bool(self.parsed == other)
+
+    def __ne__(self, other: Any) -> bool:
+        return not self == other
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"{self._model.__name__}(<lazy>)"
+
+
+def construct_model(model: Type[M], data: Dict[str, Any]) -> M:
+    """Build a model without validation; nested models are constructed too,
+    except ``_links``, which is only parsed when first read."""
+    values = {}
+    for name, field in model.__fields__.items():
+        if field.alias in data:
+            values[name] = construct_value(field, data[field.alias])
+        elif not field.required:
+            values[name] = field.get_default()
+
+    instance = model.__new__(model)
+    object.__setattr__(instance, "__dict__", values)
+    object.__setattr__(instance, "__fields_set__", set(values))
+    return instance
+
+
+def construct_value(field: ModelField, value: Any) -> Any:
+    nested = field.type_
+    if nested is datetime and isinstance(value, str):
+        return parse_timestamp(value)
+    if nested is str and field.shape == SHAPE_SINGLETON:
+        # As pydantic would; the API sends some ids as numbers.
+        return str(value) if isinstance(value, (int, float)) else value
+    if value is None or not (
+        isinstance(nested, type) and issubclass(nested, BaseModel)
+    ):
+        return value
+
+    if field.shape == SHAPE_SINGLETON and isinstance(value, dict):
+        if field.alias == "_links":
+            return LazyLinks(nested, value)
+        return construct_model(nested, value)
+    if field.shape == SHAPE_LIST and isinstance(value, list):
+        return [construct_model(nested, item) for item in value]
+
+    return value
+
+
+def resolve_model(model: Type[M]) -> Type[M]:
+    """The model to parse into, given the current parsing options."""
+    if typed_timestamps.get():
+        return cast(Type[M], TIMED_MODELS.get(model, model))
+
+    return model
+
+
+def parse_model(model: Type[M], data: Any) -> M:
+    model = resolve_model(model)
+    if validating.get():
+        return model.parse_obj(data)
+
+    return construct_model(model, data)
+
+
+def construct_models(model: Type[M], items: List[Dict[str, Any]]) -> List[M]:
+    return [construct_model(model, item) for item in items]
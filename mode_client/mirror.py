@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta, timezone
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
+
+from mode_client.export import PathLike
+from mode_client.records import (
+    DefinitionRecord,
+    QueryRecord,
+    ReportRecord,
+    ReportRunRecord,
+    SpaceRecord,
+    make_records,
+)
+from mode_client.sync import SyncStore, WorkspaceSync, as_datetime
+
+if TYPE_CHECKING:
+    from mode_client.clients import ModeClient
+    from mode_client.crawler import CrawlProgress
+
+
+class Table(NamedTuple):
+    """How one kind of record is mirrored: ``columns`` copied from its data,
+    ``parent`` naming the column for its parent's token, and ``timestamps``
+    stored as seconds since the epoch so they compare and index as numbers."""
+
+    name: str
+    record: Type[Any]
+    columns: Tuple[str, ...]
+    parent: Optional[str] = None
+    timestamps: Tuple[str, ...] = ()
+    indexes: Tuple[str, ...] = ()
+
+    def column_type(self, column: str) -> str:
+        if column in self.timestamps:
+            return "REAL"
+        return COLUMN_TYPES.get(column, "TEXT")
+
+
+# Columns that aren't TEXT, besides timestamps. TEXT columns store ids the API
+# sends as numbers, such as ``data_source_id``, as strings, so they compare
+# equal to the same id passed as a string or an int.
+COLUMN_TYPES = {"archived": "INTEGER"}
+
+
+TABLES = {
+    "space": Table("spaces", SpaceRecord, ("name", "space_type", "state")),
+    "report": Table(
+        "reports",
+        ReportRecord,
+        (
+            "space_token",
+            "name",
+            "archived",
+            "updated_at",
+            "last_successfully_run_at",
+            "last_run_at",
+            "last_successful_run_token",
+        ),
+        timestamps=("updated_at", "last_successfully_run_at", "last_run_at"),
+        indexes=("space_token", "updated_at", "last_successfully_run_at"),
+    ),
+    "query": Table(
+        "queries",
+        QueryRecord,
+        ("name", "data_source_id", "updated_at"),
+        parent="report_token",
+        timestamps=("updated_at",),
+        indexes=("report_token", "data_source_id", "updated_at"),
+    ),
+    "report_run": Table(
+        "report_runs",
+        ReportRunRecord,
+        ("state", "created_at", "completed_at"),
+        parent="report_token",
+        timestamps=("created_at", "completed_at"),
+        indexes=("report_token",),
+    ),
+    "definition": Table(
+        "definitions",
+        DefinitionRecord,
+        ("name", "data_source_id", "updated_at"),
+        timestamps=("updated_at",),
+        indexes=("data_source_id", "updated_at"),
+    ),
+}
+
+
+def epoch(value: Union[None, str, datetime]) -> Optional[float]:
+    return as_datetime(value).timestamp() if value else None
+
+
+class Mirror(SyncStore):
+    """A ``SyncStore`` that also keeps spaces, reports, queries, report runs
+    and definitions in indexed tables, for questions about the workspace that
+    would otherwise each take a crawl.
+
+    The tables follow every change the store logs, so ``refresh`` keeps them
+    current through a client; helpers return the compact ``*Record`` tuples.
+    A store written by ``WorkspaceCrawler`` or ``WorkspaceSync`` is indexed
+    when first opened as a mirror.
+    """
+
+    def __init__(self, path: PathLike):
+        super().__init__(path)
+        created = False
+        with self._db:
+            for table in TABLES.values():
+                created |= self._create(table)
+        if created:
+            self.reindex()
+
+    def _create(self, table: Table) -> bool:
+        exists = self._db.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+            (table.name,),
+        ).fetchone()
+        columns = [f"{table.parent} TEXT"] if table.parent else []
+        columns += [f"{column} {table.column_type(column)}" for column in table.columns]
+        self._db.execute(
+            f"CREATE TABLE IF NOT EXISTS {table.name} "
+            f"(token TEXT PRIMARY KEY, {', '.join(columns)})"
+        )
+        for column in table.indexes:
+            self._db.execute(
+                f"CREATE INDEX IF NOT EXISTS {table.name}_{column} "
+                f"ON {table.name} ({column})"
+            )
+        return not exists
+
+    def reindex(self) -> None:
+        """Rebuild the tables from the store's records."""
+        with self._db:
+            for kind, table in TABLES.items():
+                self._db.execute(f"DELETE FROM {table.name}")
+                rows = self._db.execute(
+                    "SELECT token, parent, data FROM records WHERE kind = ?", (kind,)
+                ).fetchall()
+                for token, parent, data in rows:
+                    self._index(table, token, parent, json.loads(data))
+
+    def refresh(
+        self, client: "ModeClient", full: bool = False, **kwargs: Any
+    ) -> "CrawlProgress":
+        """Bring the mirror up to date with a ``WorkspaceSync``."""
+        return WorkspaceSync(client, self, **kwargs).run(full)
+
+    def _log(
+        self,
+        op: str,
+        kind: str,
+        token: str,
+        parent: Optional[str],
+        data: Optional[str],
+    ) -> None:
+        super()._log(op, kind, token, parent, data)
+        table = TABLES.get(kind)
+        if table is None:
+            return
+
+        if data is None:
+            self._db.execute(f"DELETE FROM {table.name} WHERE token = ?", (token,))
+        else:
+            self._index(table, token, parent, json.loads(data))
+
+    def _index(
+        self, table: Table, token: str, parent: Optional[str], data: Dict[str, Any]
+    ) -> None:
+        values: List[Any] = [parent] if table.parent else []
+        values += [
+            epoch(data.get(column)) if column in table.timestamps else data.get(column)
+            for column in table.columns
+        ]
+        self._db.execute(
+            f"INSERT OR REPLACE INTO {table.name} "
+            f"VALUES (?, {', '.join('?' * len(values))})",
+            (token, *values),
+        )
+
+    def _select(self, kind: str, sql: str, params: Tuple[Any, ...] = ()) -> List[Any]:
+        """The records of ``kind`` whose tokens ``sql`` selects."""
+        rows = self._db.execute(
+            "SELECT data FROM records "
+            f"WHERE kind = ? AND token IN ({sql}) ORDER BY token",
+            (kind, *params),
+        )
+        items = [json.loads(data) for data, in rows]
+        return make_records(TABLES[kind].record, items, links=False)
+
+    def spaces(self) -> List[SpaceRecord]:
+        return self._select("space", "SELECT token FROM spaces")
+
+    def reports(self, space: Optional[str] = None) -> List[ReportRecord]:
+        if space is None:
+            return self._select("report", "SELECT token FROM reports")
+
+        return self._select(
+            "report", "SELECT token FROM reports WHERE space_token = ?", (space,)
+        )
+
+    def queries(self, report: str) -> List[QueryRecord]:
+        return self._select(
+            "query", "SELECT token FROM queries WHERE report_token = ?", (report,)
+        )
+
+    def definitions(self) -> List[DefinitionRecord]:
+        return self._select("definition", "SELECT token FROM definitions")
+
+    def latest_run(self, report: str) -> Optional[ReportRunRecord]:
+        runs: List[ReportRunRecord] = self._select(
+            "report_run",
+            "SELECT token FROM report_runs WHERE report_token = ? "
+            "ORDER BY created_at DESC LIMIT 1",
+            (report,),
+        )
+        return runs[0] if runs else None
+
+    def reports_using(self, data_source_id: Union[int, str]) -> List[ReportRecord]:
+        """Reports with a query on a data source."""
+        return self._select(
+            "report",
+            "SELECT report_token FROM queries WHERE data_source_id = ?",
+            (str(data_source_id),),
+        )
+
+    def queries_using(self, data_source_id: Union[int, str]) -> List[QueryRecord]:
+        return self._select(
+            "query",
+            "SELECT token FROM queries WHERE data_source_id = ?",
+            (str(data_source_id),),
+        )
+
+    def definitions_using(
+        self, data_source_id: Union[int, str]
+    ) -> List[DefinitionRecord]:
+        return self._select(
+            "definition",
+            "SELECT token FROM definitions WHERE data_source_id = ?",
+            (str(data_source_id),),
+        )
+
+    def stale_reports(
+        self,
+        older_than: Union[timedelta, float] = timedelta(days=30),
+        now: Optional[datetime] = None,
+    ) -> List[ReportRecord]:
+        """Reports that haven't run successfully within ``older_than`` (a
+        timedelta or days), including ones that never have."""
+        if not isinstance(older_than, timedelta):
+            older_than = timedelta(days=older_than)
+        cutoff = (now or datetime.now(timezone.utc)) - older_than
+        return self._select(
+            "report",
+            "SELECT token FROM reports WHERE last_successfully_run_at < ? "
+            "OR last_successfully_run_at IS NULL",
+            (cutoff.timestamp(),),
+        )
+
+    def reports_updated_since(self, since: datetime) -> List[ReportRecord]:
+        return self._select(
+            "report",
+            "SELECT token FROM reports WHERE updated_at >= ?",
+            (since.timestamp(),),
+        )
@@ -1,6 +1,9 @@
-from typing import Any, Dict, List, Literal, Optional, Union
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Literal, Optional, Type, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, validator
+
+from mode_client.timestamps import parse_timestamp
 
 
 class Link(BaseModel):
@@ -373,3 +376,131 @@ class Account(BaseModel):
     created_at: str
     settings: Optional[Dict[str, Any]]
     links: AccountLinks = Field(alias="_links")
+
+
+# Variants of the models above with their timestamps parsed into timezone-aware
+# datetimes, used by clients created with ``parse_timestamps=True``.
+
+
+def timestamp_value(value: Any) -> Any:
+    return parse_timestamp(value) if isinstance(value, str) else value
+
+
+def timestamps(*fields: str) -> Any:
+    return validator(*fields, pre=True, allow_reuse=True)(timestamp_value)
+
+
+def run_duration(
+    created_at: datetime, completed_at: Optional[datetime]
+) -> Optional[timedelta]:
+    return completed_at - created_at if completed_at else None
+
+
+def run_elapsed(
+    created_at: datetime, completed_at: Optional[datetime], now: Optional[datetime]
+) -> timedelta:
+    end = completed_at or now or datetime.now(timezone.utc)
+    return end - created_at
+
+
+class TimedQuery(Query):
+    created_at: datetime  # type: ignore[assignment]
+    updated_at: datetime  # type: ignore[assignment]
+
+    _timestamps = timestamps("created_at", "updated_at")
+
+
+class TimedQueryRun(QueryRun):
+    created_at: datetime  # type: ignore[assignment]
+    completed_at: Optional[datetime]  # type: ignore[assignment]
+    query_created_at: datetime  # type: ignore[assignment]
+
+    _timestamps = timestamps("created_at", "completed_at", "query_created_at")
+
+    @property
+    def duration(self) -> Optional[timedelta]:
+        """How long the run took, or None while it hasn't completed."""
+        return run_duration(self.created_at, self.completed_at)
+
+    def elapsed(self, now: Optional[datetime] = None) -> timedelta:
+        """How long the run took, or has been running until ``now``."""
+        return run_elapsed(self.created_at, self.completed_at, now)
+
+
+class TimedReport(Report):
+    created_at: datetime  # type: ignore[assignment]
+    updated_at: datetime  # type: ignore[assignment]
+    published_at: Optional[datetime]  # type: ignore[assignment]
+    edited_at: datetime  # type: ignore[assignment]
+    last_successful_sync_at: Optional[datetime]  # type: ignore[assignment]
+    last_saved_at: datetime  # type: ignore[assignment]
+    last_successfully_run_at: datetime  # type: ignore[assignment]
+    last_run_at: datetime  # type: ignore[assignment]
+
+    _timestamps = timestamps(
+        "created_at",
+        "updated_at",
+        "published_at",
+        "edited_at",
+        "last_successful_sync_at",
+        "last_saved_at",
+        "last_successfully_run_at",
+        "last_run_at",
+    )
+
+
+class TimedReportRun(ReportRun):
+    created_at: datetime  # type: ignore[assignment]
+    updated_at: datetime  # type: ignore[assignment]
+    completed_at: Optional[datetime]  # type: ignore[assignment]
+    purge_started_at: Optional[datetime]  # type: ignore[assignment]
+    purge_completed_at: Optional[datetime]  # type: ignore[assignment]
+
+    _timestamps = timestamps(
+        "created_at",
+        "updated_at",
+        "completed_at",
+        "purge_started_at",
+        "purge_completed_at",
+    )
+
+    @property
+    def duration(self) -> Optional[timedelta]:
+        """How long the run took, or None while it hasn't completed."""
+        return run_duration(self.created_at, self.completed_at)
+
+    def elapsed(self, now: Optional[datetime] = None) -> timedelta:
+        """How long the run took, or has been running until ``now``."""
+        return run_elapsed(self.created_at, self.completed_at, now)
+
+
+class TimedReportRuns(ReportRuns):
+    report_runs: List[TimedReportRun]  # type: ignore[assignment]
+
+
+class TimedDefinition(Definition):
+    created_at: datetime  # type: ignore[assignment]
+    updated_at: datetime  # type: ignore[assignment]
+    last_successful_sync_at: datetime  # type: ignore[assignment]
+    last_saved_at: datetime  # type: ignore[assignment]
+
+    _timestamps = timestamps(
+        "created_at", "updated_at", "last_successful_sync_at", "last_saved_at"
+    )
+
+
+class TimedAccount(Account):
+    created_at: datetime  # type: ignore[assignment]
+
+    _timestamps = timestamps("created_at")
+
+
+TIMED_MODELS: Dict[Type[BaseModel], Type[BaseModel]] = {
+    Account: TimedAccount,
+    Definition: TimedDefinition,
+    Query: TimedQuery,
+    QueryRun: TimedQueryRun,
+    Report: TimedReport,
+    ReportRun: TimedReportRun,
+    ReportRuns: TimedReportRuns,
+}
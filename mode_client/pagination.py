@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import dataclasses
+import math
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Generic, List, Optional, TypeVar
+from urllib.parse import urlsplit
+
+from mode_client.models import Pagination
+
+if TYPE_CHECKING:
+    from mode_client.clients import Call
+
+M = TypeVar("M")
+
+DEFAULT_PER_PAGE = 30
+
+
+@dataclass
+class Page(Generic[M]):
+    items: List[M]
+    next_href: Optional[str] = None
+    pagination: Optional[Pagination] = None
+
+
+def next_href(response: Any) -> Optional[str]:
+    links = response.get("_links") or {}
+    link = links.get("next") or links.get("next_page")
+
+    return link.get("href") if link else None
+
+
+def link_resource(href: str, prefix: str) -> str:
+    """Turn a HAL ``href`` into a resource relative to the client's workspace."""
+    url = urlsplit(href)
+    path = url.path
+    if path.startswith("/api/"):
+        path = path[len("/api") :]
+    if prefix and path.startswith(f"{prefix}/"):
+        path = path[len(prefix) :]
+
+    return f"{path}?{url.query}" if url.query else path
+
+
+def next_page_call(
+    call: "Call[Page[M]]", page: Page[M], prefix: str
+) -> Optional["Call[Page[M]]"]:
+    if not page.items:
+        return None
+
+    if page.next_href:
+        path = link_resource(page.next_href, prefix)
+        return dataclasses.replace(call, path=path, params=None)
+
+    pagination = page.pagination
+    if pagination and pagination.page < pagination.total_pages and call.params:
+        params = {**call.params, "page": pagination.page + 1}
+        return dataclasses.replace(call, params=params)
+
+    return None
+
+
+def remaining_page_calls(
+    call: "Call[Page[M]]", page: Page[M], max_items: Optional[int] = None
+) -> Optional[List["Call[Page[M]]"]]:
+    """Calls for every page after ``page``, or None if the page count is unknown."""
+    pagination = page.pagination
+    if not pagination or not call.params or "page" not in call.params:
+        return None
+
+    last = pagination.total_pages
+    if max_items is not None and pagination.per_page:
+        last = min(last, math.ceil(max_items / pagination.per_page))
+
+    return [
+        dataclasses.replace(call, params={**call.params, "page": number})
+        for number in range(pagination.page + 1, last + 1)
+    ]
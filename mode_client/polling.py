@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+from dataclasses import dataclass, field
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from mode_client.batch import ITEM_ERRORS
+from mode_client.models import ReportRun
+
+TERMINAL_STATES = frozenset({"succeeded", "failed", "cancelled", "completed"})
+
+
+def is_finished(run: ReportRun) -> bool:
+    return run.state in TERMINAL_STATES
+
+
+class WaitTimeout(TimeoutError):
+    def __init__(self, report: str, run: str, last: Optional[ReportRun] = None):
+        state = last.state if last else None
+        super().__init__(f"report run {report}/{run} still {state} after timeout")
+        self.report = report
+        self.run = run
+        self.last = last
+
+
+@dataclass(frozen=True)
+class PollPolicy:
+    """How often to poll a report run until it finishes.
+
+    With an expected runtime the first poll happens once it has elapsed, and
+    later polls back off geometrically from ``runtime_fraction`` of it, so
+    slow reports are polled rarely and fast ones promptly.
+    """
+
+    initial: float = 1.0
+    factor: float = 1.5
+    min_interval: float = 1.0
+    max_interval: float = 60.0
+    runtime_fraction: float = 0.25
+
+    def delays(self, expected_runtime: Optional[float] = None) -> Iterator[float]:
+        if expected_runtime:
+            yield self._clamp(expected_runtime)
+            interval = expected_runtime * self.runtime_fraction
+        else:
+            interval = self.initial
+
+        while True:
+            yield self._clamp(interval)
+            interval *= self.factor
+
+    def _clamp(self, delay: float) -> float:
+        return min(self.max_interval, max(self.min_interval, delay))
+
+
+DEFAULT_POLL = PollPolicy()
+
+
+@dataclass
+class PendingRun:
+    report: str
+    run: str
+    delays: Iterator[float] = field(repr=False)
+    deadline: Optional[float] = None
+    polls: int = 0
+    last: Optional[ReportRun] = None
+    error: Optional[Exception] = None
+
+    @property
+    def done(self) -> bool:
+        """Whether the run finished, timed out or failed to fetch."""
+        return self.error is not None or bool(self.last and is_finished(self.last))
+
+
+class RunSchedule:
+    """Pending report runs in a heap ordered by when each is next due."""
+
+    def __init__(
+        self,
+        poll: PollPolicy = DEFAULT_POLL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.poll = poll
+        self.clock = clock
+        self._heap: List[Tuple[float, int, PendingRun]] = []
+        self._order = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def add(
+        self,
+        report: str,
+        run: str,
+        expected_runtime: Optional[float] = None,
+        timeout: Optional[float] = None,
+    ) -> PendingRun:
+        now = self.clock()
+        pending = PendingRun(
+            report,
+            run,
+            self.poll.delays(expected_runtime),
+            now + timeout if timeout is not None else None,
+        )
+        self._push(pending, now)
+        return pending
+
+    def pop(self) -> Tuple[float, PendingRun]:
+        """The next run to poll and how long to wait before polling it."""
+        due, _, pending = heapq.heappop(self._heap)
+        return max(0.0, due - self.clock()), pending
+
+    def update(self, pending: PendingRun, run: ReportRun) -> bool:
+        """Record a poll; reschedules and returns False while still running."""
+        pending.polls += 1
+        pending.last = run
+        if is_finished(run):
+            return True
+
+        now = self.clock()
+        if pending.deadline is not None and now >= pending.deadline:
+            raise WaitTimeout(pending.report, pending.run, run)
+
+        self._push(pending, now)
+        return False
+
+    def _push(self, pending: PendingRun, now: float) -> None:
+        due = now + next(pending.delays)
+        if pending.deadline is not None:
+            due = min(due, pending.deadline)
+
+        heapq.heappush(self._heap, (due, next(self._order), pending))
+
+
+class RunWaiter:
+    """Waits for many report runs from one scheduling loop.
+
+    Runs can be added at any time, including while iterating ``as_completed``.
+    A run that times out or can't be fetched is recorded in ``errors``, keyed
+    by run token, without stopping the others.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[str, str], ReportRun],
+        poll: PollPolicy = DEFAULT_POLL,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.fetch = fetch
+        self.sleep = sleep
+        self.schedule = RunSchedule(poll, clock)
+        self.errors: Dict[str, Exception] = {}
+
+    def __len__(self) -> int:
+        return len(self.schedule)
+
+    def add(
+        self,
+        report: str,
+        run: str,
+        expected_runtime: Optional[float] = None,
+        timeout: Optional[float] = None,
+    ) -> None:
+        self.schedule.add(report, run, expected_runtime, timeout)
+
+    def step(self) -> PendingRun:
+        """Polls the run that is due next, waiting until it is due."""
+        delay, pending = self.schedule.pop()
+        if delay:
+            self.sleep(delay)
+
+        try:
+            self.schedule.update(pending, self.fetch(pending.report, pending.run))
+        except (WaitTimeout, *ITEM_ERRORS) as error:
+            pending.error = self.errors[pending.run] = error
+
+        return pending
+
+    def as_completed(self) -> Iterator[ReportRun]:
+        while self.schedule:
+            pending = self.step()
+            if pending.done and not pending.error:
+                assert pending.last
+                yield pending.last
+
+    def wait(self) -> Dict[str, ReportRun]:
+        return {run.token: run for run in self.as_completed()}
+
+
+class AsyncRunWaiter:
+    """The asyncio counterpart of ``RunWaiter``."""
+
+    def __init__(
+        self,
+        fetch: Callable[[str, str], Awaitable[ReportRun]],
+        poll: PollPolicy = DEFAULT_POLL,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ):
+        self.fetch = fetch
+        self.sleep = sleep
+        self.schedule = RunSchedule(poll, clock)
+        self.errors: Dict[str, Exception] = {}
+
+    def __len__(self) -> int:
+        return len(self.schedule)
+
+    def add(
+        self,
+        report: str,
+        run: str,
+        expected_runtime: Optional[float] = None,
+        timeout: Optional[float] = None,
+    ) -> None:
+        self.schedule.add(report, run, expected_runtime, timeout)
+
+    async def step(self) -> PendingRun:
+        """Polls the run that is due next, waiting until it is due."""
+        delay, pending = self.schedule.pop()
+        if delay:
+            await self.sleep(delay)
+
+        try:
+            self.schedule.update(pending, await self.fetch(pending.report, pending.run))
+        except (WaitTimeout, *ITEM_ERRORS) as error:
+            pending.error = self.errors[pending.run] = error
+
+        return pending
+
+    async def as_completed(self) -> AsyncIterator[ReportRun]:
+        while self.schedule:
+            pending = await self.step()
+            if pending.done and not pending.error:
+                assert pending.last
+                yield pending.last
+
+    async def wait(self) -> Dict[str, ReportRun]:
+        return {run.token: run async for run in self.as_completed()}
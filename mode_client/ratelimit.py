@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import Callable
+
+# Mode throttles clients to ~1 request/second, so pace slightly below that.
+DEFAULT_RATE = 0.9
+
+
+class TokenBucket:
+    """A token bucket shared by every client that is handed the same instance.
+
+    Tokens are reserved under a lock and the caller sleeps outside of it, so one
+    bucket can pace threads and asyncio tasks at the same time.
+    """
+
+    def __init__(
+        self,
+        rate: float = DEFAULT_RATE,
+        burst: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self.acquired = 0
+        self.waited = 0.0
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        with self._lock:
+            now = self.clock()
+            elapsed = now - self._updated
+            self._tokens = min(self.burst, self._tokens + elapsed * self.rate) - 1
+            self._updated = now
+
+            delay = max(0.0, -self._tokens / self.rate)
+            self.acquired += 1
+            self.waited += delay
+
+            return delay
+
+    def acquire(self) -> float:
+        delay = self.reserve()
+        if delay:
+            time.sleep(delay)
+
+        return delay
+
+    async def acquire_async(self) -> float:
+        delay = self.reserve()
+        if delay:
+            await asyncio.sleep(delay)
+
+        return delay
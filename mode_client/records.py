@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Literal, NamedTuple, Optional, Tuple, Type, TypeVar
+
+from pydantic import BaseModel
+from pydantic.fields import SHAPE_SINGLETON
+
+from mode_client.lazy import construct_model
+from mode_client.models import Definition, Query, QueryRun, Report, ReportRun, Space
+
+M = TypeVar("M", bound=BaseModel)
+N = TypeVar("N", bound=Tuple[Any, ...])
+
+
+class DefinitionRecord(NamedTuple):
+    """A definition's fields, with ``links`` as the raw dict or None."""
+
+    token: str
+    id: int
+    name: str
+    description: str
+    source: str
+    data_source_id: str
+    created_at: str
+    updated_at: str
+    last_successful_sync_at: str
+    last_saved_at: str
+    github_link: Optional[str]
+    links: Optional[Dict[str, Any]]
+
+    def to_model(self) -> Definition:
+        return record_to_model(Definition, self)
+
+
+class QueryRecord(NamedTuple):
+    """A query's fields, with ``links`` as the raw dict or None."""
+
+    id: str
+    token: str
+    raw_query: Optional[str]
+    created_at: str
+    updated_at: str
+    name: str
+    last_run_id: Optional[str]
+    data_source_id: str
+    explorations_count: int
+    report_imports_count: int
+    mapping_id: Optional[str]
+    links: Optional[Dict[str, Any]]
+
+    def to_model(self) -> Query:
+        return record_to_model(Query, self)
+
+
+class QueryRunRecord(NamedTuple):
+    """A query run's fields, with ``links`` as the raw dict or None."""
+
+    id: str
+    token: str
+    raw_source: Optional[str]
+    statement_annotation: Optional[str]
+    state: str
+    created_at: str
+    completed_at: Optional[str]
+    data_source_id: str
+    limit: str
+    query_token: str
+    query_name: str
+    query_created_at: str
+    parameters: Dict[str, Any]
+    rendered_source: Optional[str]
+    max_result_bytes: str
+    help_url: Optional[str]
+    error_code: Optional[str]
+    error_type: Optional[str]
+    error_message: Optional[str]
+    links: Optional[Dict[str, Any]]
+
+    def to_model(self) -> QueryRun:
+        return record_to_model(QueryRun, self)
+
+
+class ReportRecord(NamedTuple):
+    """A report's fields, with ``links`` as the raw dict or None."""
+
+    token: str
+    id: int
+    name: str
+    description: Optional[str]
+    created_at: str
+    updated_at: str
+    published_at: Optional[str]
+    edited_at: str
+    theme_id: Optional[int]
+    color_mappings: Optional[Dict[str, Any]]
+    type: str
+    last_successful_sync_at: Optional[str]
+    last_saved_at: str
+    archived: bool
+    space_token: Optional[str]
+    account_id: int
+    account_username: str
+    public: bool
+    full_width: Optional[bool]
+    manual_run_disabled: bool
+    run_privately: bool
+    drilldowns_enabled: bool
+    layout: Optional[str]
+    is_embedded: Optional[bool]
+    is_signed: Optional[bool]
+    shared: Optional[bool]
+    expected_runtime: float
+    last_successfully_run_at: str
+    last_run_at: str
+    web_preview_image: Optional[str]
+    last_successful_run_token: str
+    flamingo_signature: Optional[str]
+    github_link: Optional[str]
+    query_count: int
+    max_query_count: int
+    chart_count: Optional[int]
+    runs_count: int
+    schedules_count: Optional[int]
+    query_preview: Optional[str]
+    view_count: int
+    links: Optional[Dict[str, Any]]
+
+    def to_model(self) -> Report:
+        return record_to_model(Report, self)
+
+
+class ReportRunRecord(NamedTuple):
+    """A report run's fields, with ``links`` as the raw dict or None."""
+
+    token: str
+    state: Optional[
+        Literal[
+            "pending",
+            "enqueued",
+            "cancelled",
+            "failed",
+            "succeeded",
+            "completed",
+            "running_notebook",
+        ]
+    ]
+    created_at: str
+    updated_at: str
+    completed_at: Optional[str]
+    purge_started_at: Optional[str]
+    purge_completed_at: Optional[str]
+    python_state: Optional[
+        Literal["none", "pending", "failed", "submitted", "succeeded", "skipped"]
+    ]
+    form_fields: Optional[List[Any]]
+    flamingo_signature: Optional[str]
+    flamingo_host: Optional[str]
+    is_latest_report_run: Optional[bool]
+    is_latest_successful_report_run: Optional[bool]
+    report_has_failures_since_last_success: Optional[bool]
+    links: Optional[Dict[str, Any]]
+
+    def to_model(self) -> ReportRun:
+        return record_to_model(ReportRun, self)
+
+
+class SpaceRecord(NamedTuple):
+    """A space's fields, with ``links`` as the raw dict or None."""
+
+    token: str
+    id: int
+    space_type: str
+    name: str
+    description: Optional[str]
+    state: str
+    restricted: bool
+    free_default: str
+    viewable_: str
+    viewed_: Optional[str]
+    default_access_level: Optional[str]
+    links: Optional[Dict[str, Any]]
+
+    def to_model(self) -> Space:
+        return record_to_model(Space, self)
+
+
+RECORD_MODELS: Dict[Type[Any], Type[BaseModel]] = {
+    DefinitionRecord: Definition,
+    QueryRecord: Query,
+    QueryRunRecord: QueryRun,
+    ReportRecord: Report,
+    ReportRunRecord: ReportRun,
+    SpaceRecord: Space,
+}
+
+
+# The API key of each field of each record, in field order.
+RECORD_ALIASES: Dict[Type[Any], Tuple[str, ...]] = {
+    record: tuple(model.__fields__[name].alias for name in record._fields)
+    for record, model in RECORD_MODELS.items()
+}
+
+
+# The positions of each record's ``str`` fields, which pydantic would coerce
+# to ``str``; the API sends some of them, such as ids, as numbers.
+RECORD_STR_FIELDS: Dict[Type[Any], Tuple[int, ...]] = {
+    record: tuple(
+        index
+        for index, name in enumerate(record._fields)
+        if model.__fields__[name].type_ is str
+        and model.__fields__[name].shape == SHAPE_SINGLETON
+    )
+    for record, model in RECORD_MODELS.items()
+}
+
+
+def make_records(record: Type[N], items: List[Dict[str, Any]], links: bool) -> List[N]:
+    """Build records straight from API dicts, without any pydantic models."""
+    *aliases, links_alias = RECORD_ALIASES[record]
+    str_fields = RECORD_STR_FIELDS[record]
+    make = record._make  # type: ignore
+    records = []
+    for item in items:
+        values = [item.get(alias) for alias in aliases]
+        for index in str_fields:
+            if isinstance(values[index], (int, float)):
+                values[index] = str(values[index])
+        values.append(item.get(links_alias) if links else None)
+        records.append(make(values))
+
+    return records
+
+
+def record_to_model(model: Type[M], record: Any) -> M:
+    """The full model for a record: validated when it kept its links, and
+    otherwise constructed unvalidated with ``links`` set to None."""
+    data = dict(zip(RECORD_ALIASES[type(record)], record))
+    if record.links is None and model.__fields__["links"].required:
+        return construct_model(model, data)
+
+    return model.parse_obj(data)
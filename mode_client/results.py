@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import codecs
+import csv
+import io
+import json
+import os
+import re
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import IO, Any, Dict, Iterator, List, Literal, Optional, Union
+
+ResultFormat = Literal["csv", "json"]
+Destination = Union[str, "os.PathLike[str]", IO[bytes]]
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+NUMBER_TAIL = {"", *"0123456789.eE+-"}
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+@dataclass
+class StreamStats:
+    size: int = 0
+    seconds: float = 0.0
+    _start: float = field(default_factory=time.perf_counter, repr=False)
+
+    @property
+    def mb_per_s(self) -> float:
+        return self.size / 1_000_000 / self.seconds if self.seconds else 0.0
+
+    def add(self, chunk: bytes) -> None:
+        self.size += len(chunk)
+
+    def stop(self) -> "StreamStats":
+        self.seconds = time.perf_counter() - self._start
+        return self
+
+
+@contextmanager
+def open_destination(dest: Destination, append: bool = False) -> Iterator[IO[bytes]]:
+    if isinstance(dest, (str, os.PathLike)):
+        with open(dest, "ab" if append else "wb") as file:
+            yield file
+    else:
+        yield dest
+
+
+class CsvRowParser:
+    """Turns CSV bytes, fed in arbitrary chunks, into dict rows.
+
+    Only text up to the last newline outside a quoted field is parsed, so
+    quoted fields containing newlines survive chunk boundaries.
+    """
+
+    def __init__(self) -> None:
+        self._decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self._partial = ""
+        self._header: Optional[List[str]] = None
+
+    def feed(self, chunk: bytes) -> List[Dict[str, str]]:
+        text = self._partial + self._decoder.decode(chunk)
+        cut = text.rfind("\n") + 1
+        while cut and text.count('"', 0, cut) % 2:
+            cut = text.rfind("\n", 0, cut - 1) + 1
+
+        self._partial = text[cut:]
+        return self._parse(text[:cut])
+
+    def close(self) -> List[Dict[str, str]]:
+        text = self._partial + self._decoder.decode(b"", final=True)
+        self._partial = ""
+        if text.count('"') % 2:
+            raise csv.Error("unterminated quoted field at end of CSV results")
+
+        return self._parse(text)
+
+    def _parse(self, text: str) -> List[Dict[str, str]]:
+        reader = csv.reader(io.StringIO(text, newline=""))
+        if self._header is None:
+            self._header = next((values for values in reader if values), None)
+
+        header = self._header
+        if header is None:
+            return []
+
+        return [dict(zip(header, values)) for values in reader if values]
+
+
+class JsonRowParser:
+    """Turns a JSON array, or JSON lines, fed in arbitrary chunks into rows."""
+
+    def __init__(self) -> None:
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._buffer = ""
+        self._started = False
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        self._buffer += self._decoder.decode(chunk)
+        return self._parse(final=False)
+
+    def close(self) -> List[Any]:
+        self._buffer += self._decoder.decode(b"", final=True)
+        rows = self._parse(final=True)
+        if self._buffer.strip():
+            raise ValueError("incomplete JSON at end of results")
+
+        return rows
+
+    def _parse(self, final: bool) -> List[Any]:
+        # Walk the buffer with a cursor and trim it once, rather than slicing
+        # it after every row, which would be quadratic in the chunk size.
+        rows: List[Any] = []
+        buffer = self._buffer
+        idx = 0
+        while True:
+            idx = skip_whitespace(buffer, idx)
+            if not self._started and buffer.startswith("[", idx):
+                idx = skip_whitespace(buffer, idx + 1)
+            if buffer[idx : idx + 1] in (",", "]"):
+                idx = skip_whitespace(buffer, idx + 1)
+            self._started = self._started or idx < len(buffer)
+            if idx == len(buffer):
+                break
+
+            try:
+                row, end = self._json.raw_decode(buffer, idx)
+            except json.JSONDecodeError:
+                if final:
+                    raise
+                break
+
+            # A bare number is only complete once a delimiter follows it.
+            scalar = not isinstance(row, (dict, list, str))
+            if scalar and not final and buffer[end : end + 1] in NUMBER_TAIL:
+                break
+
+            rows.append(row)
+            idx = end
+
+        self._buffer = buffer[idx:]
+        return rows
+
+
+def skip_whitespace(text: str, idx: int) -> int:
+    match = WHITESPACE.match(text, idx)
+    return match.end() if match else idx
+
+
+def row_parser(format: ResultFormat) -> Union[CsvRowParser, JsonRowParser]:
+    return CsvRowParser() if format == "csv" else JsonRowParser()
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import random
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import FrozenSet, Optional
+
+import httpx
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+def parse_retry_after(response: httpx.Response) -> Optional[float]:
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    return max(0.0, float(retry_at.timestamp()) - time.time())
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """When and how long to back off before replaying a failed request.
+
+    Only methods in ``methods`` are replayed; add ``"POST"``/``"PATCH"`` to opt
+    in to replaying requests that are not idempotent.
+    """
+
+    max_attempts: int = 5
+    max_elapsed: Optional[float] = 300.0
+    backoff: float = 1.0
+    max_backoff: float = 60.0
+    jitter: bool = True
+    methods: FrozenSet[str] = SAFE_METHODS
+    statuses: FrozenSet[int] = RETRY_STATUSES
+
+    def backoff_delay(
+        self, attempt: int, response: Optional[httpx.Response] = None
+    ) -> float:
+        retry_after = parse_retry_after(response) if response is not None else None
+        if retry_after is not None:
+            return retry_after
+
+        delay = min(self.max_backoff, self.backoff * 2.0 ** (attempt - 1))
+        return float(random.uniform(0, delay)) if self.jitter else delay
+
+    def retry_delay(
+        self,
+        method: str,
+        attempt: int,
+        elapsed: float,
+        response: Optional[httpx.Response] = None,
+    ) -> Optional[float]:
+        """Seconds to wait before the next attempt, or None to stop retrying.
+
+        Pass the response for HTTP errors and omit it for transport errors.
+        """
+        if method.upper() not in self.methods or attempt >= self.max_attempts:
+            return None
+        if response is not None and response.status_code not in self.statuses:
+            return None
+
+        delay = self.backoff_delay(attempt, response)
+        if self.max_elapsed is not None and elapsed + delay > self.max_elapsed:
+            return None
+
+        return delay
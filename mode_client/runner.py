@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Union,
+)
+
+from mode_client.models import ReportRun
+from mode_client.polling import PendingRun
+
+# Runs a workspace can have queued or running at once before Mode's queue,
+# not the client, becomes the bottleneck.
+DEFAULT_MAX_IN_FLIGHT = 8
+
+SUCCEEDED_STATES = frozenset({"succeeded", "completed"})
+
+
+class RunJob(NamedTuple):
+    report: str
+    parameters: Optional[Dict[str, Any]] = None
+    expected_runtime: Optional[float] = None
+
+
+Job = Union[RunJob, Sequence[Any]]
+
+
+@dataclass
+class RunOutcome:
+    """The last attempt at a job: its final run, or why it has none.
+
+    ``seconds`` runs from the first submission to the final state, retries
+    included.
+    """
+
+    job: RunJob
+    run: Optional[ReportRun] = None
+    error: Optional[Exception] = None
+    attempts: int = 1
+    seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and bool(
+            self.run and self.run.state in SUCCEEDED_STATES
+        )
+
+
+@dataclass
+class Attempt:
+    job: RunJob
+    number: int = 1
+    started: float = field(default_factory=time.perf_counter)
+
+    def outcome(
+        self, run: Optional[ReportRun] = None, error: Optional[Exception] = None
+    ) -> RunOutcome:
+        seconds = time.perf_counter() - self.started
+        return RunOutcome(self.job, run, error, self.number, seconds)
+
+
+class RunBatch:
+    """Bookkeeping for ``report_run.run_many``, shared by both clients.
+
+    Jobs are pulled lazily, so a generator of jobs is only consumed as
+    in-flight slots free up. Failed runs are resubmitted ahead of new jobs.
+    """
+
+    def __init__(self, jobs: Iterable[Job], max_in_flight: int, retries: int):
+        self.max_in_flight = max(1, max_in_flight)
+        self.retries = retries
+        self.in_flight: Dict[str, Attempt] = {}
+        self._jobs = iter(jobs)
+        self._retries: Deque[Attempt] = deque()
+
+    def ready(self) -> Iterator[Attempt]:
+        """Attempts to submit now; each must be passed to ``started``."""
+        while len(self.in_flight) < self.max_in_flight:
+            if self._retries:
+                yield self._retries.popleft()
+                continue
+
+            job = next(self._jobs, None)
+            if job is None:
+                return
+            yield Attempt(job if isinstance(job, RunJob) else RunJob(*job))
+
+    def started(self, attempt: Attempt, run: ReportRun) -> None:
+        self.in_flight[run.token] = attempt
+
+    def finish(self, pending: PendingRun) -> Optional[RunOutcome]:
+        """The job's outcome, or None if its failed run is being retried."""
+        attempt = self.in_flight.pop(pending.run)
+        failed = pending.last is not None and pending.last.state == "failed"
+        if not pending.error and failed and attempt.number <= self.retries:
+            attempt.number += 1
+            self._retries.append(attempt)
+            return None
+
+        return attempt.outcome(pending.last, pending.error)
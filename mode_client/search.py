@@ -0,0 +1,360 @@
+from __future__ import annotations
+
+import json
+import re
+import sqlite3
+import threading
+from typing import Any, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from mode_client.export import PathLike
+
+COMMENTS = re.compile(r"--[^\n]*|/\*.*?\*/", re.S)
+STRINGS = re.compile(r"'(?:[^']|'')*'")
+QUOTED = re.compile(r'"([^"\n]+)"|`([^`\n]+)`|\[([^\]\n]+)\]')
+IDENTIFIER = re.compile(r"[A-Za-z_][\w$]*(?:\.[A-Za-z_][\w$]*)*")
+
+# Words too common in SQL to be worth indexing as identifiers.
+KEYWORDS = frozenset(
+    """
+    all and any as asc between by case cast coalesce count create cross current
+    date default delete desc distinct else end exists false filter first from
+    full group having if in inner insert interval into is join last lateral
+    left like limit not null nulls offset on or order outer over partition
+    right rows select set sum table then true union update using values view
+    when where window with
+    """.split()
+)
+
+# Where writes through a client carry a query to index or drop.
+QUERY_RESOURCE = re.compile(r"/reports/(\w+)/queries(?:/(\w+))?")
+REPORT_RESOURCE = re.compile(r"/reports/(\w+)")
+
+# What ``add_many`` indexes: kind, token, text, parent and name.
+Document = Tuple[str, str, Optional[str], Optional[str], Any]
+
+
+class SearchHit(NamedTuple):
+    kind: str
+    token: str
+    parent: Optional[str]
+    name: Optional[str]
+    snippet: Optional[str] = None
+
+
+def identifiers(sql: str) -> Set[str]:
+    """The lowercased identifiers in SQL, outside comments and strings.
+
+    Dotted names are indexed along with each of their suffixes, so
+    ``analytics.public.orders`` is found as ``public.orders`` and ``orders``.
+    """
+    sql = STRINGS.sub(" ", COMMENTS.sub(" ", sql))
+    sql = QUOTED.sub(lambda match: next(g for g in match.groups() if g), sql)
+
+    found = set()
+    for match in IDENTIFIER.finditer(sql):
+        parts = match.group().lower().split(".")
+        for i in range(len(parts)):
+            found.add(".".join(parts[i:]))
+
+    return found - KEYWORDS
+
+
+def normalize_identifier(identifier: str) -> str:
+    return ".".join(part.strip('"`[]') for part in identifier.lower().split("."))
+
+
+def field(item: Any, name: str) -> Any:
+    return item.get(name) if isinstance(item, dict) else getattr(item, name, None)
+
+
+def query_run_text(query_run: Any) -> str:
+    raw, rendered = field(query_run, "raw_source"), field(query_run, "rendered_source")
+    return "\n".join(text for text in dict.fromkeys((raw, rendered)) if text)
+
+
+class SearchIndex:
+    """A sqlite index over the SQL in queries, query runs and definitions.
+
+    Each document's identifiers go in an inverted index for ``references``;
+    the text also goes in an FTS5 table for ``search`` where sqlite has it,
+    and ``grep`` runs a regex over the stored text. Passed to a client as
+    ``search_index``, it follows queries created, updated and deleted
+    through the client.
+    """
+
+    def __init__(self, path: PathLike = ":memory:"):
+        self.path = str(path)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS documents ("
+                "id INTEGER PRIMARY KEY, kind TEXT NOT NULL, token TEXT NOT NULL, "
+                "parent TEXT, name TEXT, text TEXT NOT NULL, UNIQUE (kind, token))"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS documents_parent ON documents (parent)"
+            )
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS identifiers ("
+                "identifier TEXT NOT NULL, document INTEGER NOT NULL, "
+                "PRIMARY KEY (identifier, document)) WITHOUT ROWID"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS identifiers_document "
+                "ON identifiers (document)"
+            )
+            try:
+                self._db.execute(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts "
+                    "USING fts5(text, content='documents', content_rowid='id')"
+                )
+            except sqlite3.OperationalError:
+                self.fts = False
+            else:
+                self.fts = True
+
+    def add(
+        self,
+        kind: str,
+        token: str,
+        text: Optional[str],
+        parent: Optional[str] = None,
+        name: Optional[str] = None,
+    ) -> None:
+        with self._lock, self._db:
+            self._add(kind, token, text or "", parent, name)
+
+    def add_many(self, documents: Iterable[Document]) -> None:
+        """Index ``(kind, token, text, parent, name)`` documents in one
+        transaction."""
+        with self._lock, self._db:
+            for kind, token, text, parent, name in documents:
+                self._add(kind, token, text or "", parent, name)
+
+    def add_query(self, query: Any, report: Optional[str] = None) -> None:
+        """Index a ``Query``, its record or its API dict."""
+        self.add(*self._query(query, report))
+
+    def add_queries(self, queries: Iterable[Any], report: Optional[str] = None) -> None:
+        self.add_many(self._query(query, report) for query in queries)
+
+    def add_query_runs(
+        self, query_runs: Iterable[Any], run: Optional[str] = None
+    ) -> None:
+        self.add_many(
+            (
+                "query_run",
+                field(query_run, "token"),
+                query_run_text(query_run),
+                run,
+                field(query_run, "query_name"),
+            )
+            for query_run in query_runs
+        )
+
+    def add_definitions(self, definitions: Iterable[Any]) -> None:
+        self.add_many(
+            (
+                "definition",
+                field(definition, "token"),
+                field(definition, "source"),
+                None,
+                field(definition, "name"),
+            )
+            for definition in definitions
+        )
+
+    def add_snapshot(self, path: PathLike) -> int:
+        """Index the queries, query runs and definitions in a sqlite snapshot
+        written by ``WorkspaceCrawler``, ``WorkspaceSync`` or ``Mirror``."""
+        snapshot = sqlite3.connect(str(path))
+        try:
+            rows = snapshot.execute(
+                "SELECT kind, token, parent, data FROM records "
+                "WHERE kind IN ('query', 'query_run', 'definition')"
+            ).fetchall()
+        finally:
+            snapshot.close()
+
+        documents = []
+        for kind, token, parent, data in rows:
+            item = json.loads(data)
+            if kind == "query":
+                text, name = item.get("raw_query"), item.get("name")
+            elif kind == "query_run":
+                text, name = query_run_text(item), item.get("query_name")
+            else:
+                text, name = item.get("source"), item.get("name")
+            documents.append((kind, token, text, parent, name))
+
+        self.add_many(documents)
+        return len(documents)
+
+    def remove(self, kind: str, token: str) -> None:
+        with self._lock, self._db:
+            self._remove(kind, token)
+
+    def _query(self, query: Any, report: Optional[str]) -> Document:
+        return (
+            "query",
+            field(query, "token"),
+            field(query, "raw_query"),
+            report,
+            field(query, "name"),
+        )
+
+    def _add(
+        self, kind: str, token: str, text: str, parent: Optional[str], name: Any
+    ) -> None:
+        row = self._db.execute(
+            "SELECT id, parent, name, text FROM documents WHERE kind = ? AND token = ?",
+            (kind, token),
+        ).fetchone()
+        if row and row[3] == text:
+            if parent is not None and (row[1], row[2]) != (parent, name):
+                self._db.execute(
+                    "UPDATE documents SET parent = ?, name = ? WHERE id = ?",
+                    (parent, name, row[0]),
+                )
+            return
+
+        if row:
+            self._remove(kind, token)
+        cursor = self._db.execute(
+            "INSERT INTO documents (kind, token, parent, name, text) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (kind, token, parent, name, text),
+        )
+        document = cursor.lastrowid
+        self._db.executemany(
+            "INSERT INTO identifiers VALUES (?, ?)",
+            ((identifier, document) for identifier in identifiers(text)),
+        )
+        if self.fts:
+            self._db.execute(
+                "INSERT INTO documents_fts (rowid, text) VALUES (?, ?)",
+                (document, text),
+            )
+
+    def _remove(self, kind: str, token: str) -> None:
+        row = self._db.execute(
+            "SELECT id, text FROM documents WHERE kind = ? AND token = ?",
+            (kind, token),
+        ).fetchone()
+        if not row:
+            return
+
+        document, text = row
+        self._db.execute("DELETE FROM documents WHERE id = ?", (document,))
+        self._db.execute("DELETE FROM identifiers WHERE document = ?", (document,))
+        if self.fts:
+            # An external content table is told what it held to drop a row.
+            self._db.execute(
+                "INSERT INTO documents_fts (documents_fts, rowid, text) "
+                "VALUES ('delete', ?, ?)",
+                (document, text),
+            )
+
+    def observe(self, method: str, resource: str, data: Any) -> None:
+        """Follow a write made through a client."""
+        match = QUERY_RESOURCE.fullmatch(resource)
+        if match:
+            report, query = match.groups()
+            if method == "DELETE" and query:
+                self.remove("query", query)
+            elif isinstance(data, dict) and "raw_query" in data:
+                self.add_query(data, report)
+            return
+
+        match = REPORT_RESOURCE.fullmatch(resource)
+        if match and method == "DELETE":
+            with self._lock, self._db:
+                rows = self._db.execute(
+                    "SELECT token FROM documents WHERE kind = 'query' AND parent = ?",
+                    (match.group(1),),
+                ).fetchall()
+                for (token,) in rows:
+                    self._remove("query", token)
+
+    def references(
+        self, identifier: str, kind: Optional[str] = None
+    ) -> List[SearchHit]:
+        """Documents referencing a table or column, e.g. ``schema.table``."""
+        sql = (
+            "SELECT kind, token, parent, name FROM documents WHERE id IN "
+            "(SELECT document FROM identifiers WHERE identifier = ?)"
+        )
+        return self._hits(sql, (normalize_identifier(identifier),), kind)
+
+    def search(
+        self, query: str, kind: Optional[str] = None, limit: Optional[int] = None
+    ) -> List[SearchHit]:
+        """Documents matching an FTS5 query, best first, with a snippet of
+        each; without FTS5, documents containing ``query`` as is."""
+        if not self.fts:
+            sql = (
+                "SELECT kind, token, parent, name FROM documents "
+                "WHERE instr(lower(text), lower(?)) > 0"
+            )
+            return self._hits(sql, (query,), kind, limit)
+
+        sql = (
+            "SELECT kind, token, parent, name, "
+            "snippet(documents_fts, 0, '[', ']', '...', 10) "
+            "FROM documents_fts JOIN documents ON documents.id = documents_fts.rowid "
+            "WHERE documents_fts MATCH ?"
+        )
+        return self._hits(sql, (query,), kind, limit, "rank")
+
+    def grep(
+        self, pattern: str, kind: Optional[str] = None, flags: int = re.IGNORECASE
+    ) -> List[SearchHit]:
+        """Documents whose text matches a regular expression."""
+        regex = re.compile(pattern, flags)
+        sql = "SELECT kind, token, parent, name, text FROM documents"
+        params: Tuple[Any, ...] = ()
+        if kind:
+            sql += " WHERE kind = ?"
+            params = (kind,)
+
+        with self._lock:
+            rows = self._db.execute(sql, params).fetchall()
+        return [
+            SearchHit(kind, token, parent, name)
+            for kind, token, parent, name, text in rows
+            if regex.search(text)
+        ]
+
+    def _hits(
+        self,
+        sql: str,
+        params: Tuple[Any, ...],
+        kind: Optional[str],
+        limit: Optional[int] = None,
+        order: str = "kind, token",
+    ) -> List[SearchHit]:
+        if kind:
+            sql += " AND kind = ?"
+            params += (kind,)
+        sql += f" ORDER BY {order}"
+        if limit:
+            sql += " LIMIT ?"
+            params += (limit,)
+
+        with self._lock:
+            rows = self._db.execute(sql, params).fetchall()
+        return [SearchHit(*row) for row in rows]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._db.execute("SELECT COUNT(*) FROM documents").fetchone()[0])
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __enter__(self) -> "SearchIndex":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
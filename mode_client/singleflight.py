@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar, cast
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Runs one call per key at a time; concurrent callers share its outcome."""
+
+    def __init__(self) -> None:
+        self.shared = 0
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future[Any]] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        leader: Future[Any]
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self.shared += 1
+            else:
+                self._calls[key] = leader = Future()
+
+        if future is not None:
+            return cast(T, future.result())
+
+        try:
+            result = fn()
+        except BaseException as error:
+            leader.set_exception(error)
+            raise
+        else:
+            leader.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+
+class AsyncSingleFlight:
+    """The asyncio counterpart of SingleFlight, for tasks on one event loop."""
+
+    def __init__(self) -> None:
+        self.shared = 0
+        self._calls: Dict[Hashable, asyncio.Future[Any]] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        future = self._calls.get(key)
+        if future is not None:
+            self.shared += 1
+            return await asyncio.shield(future)
+
+        future = self._calls[key] = asyncio.ensure_future(fn())
+        future.add_done_callback(lambda _: self._calls.pop(key, None))
+
+        # Shield the shared call so cancelling one waiter doesn't cancel it for all.
+        return await asyncio.shield(future)
@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from pydantic import BaseModel
+
+from mode_client.export import PathLike
+
+
+class Task(NamedTuple):
+    """One listing or fetch in a crawl, e.g. ``Task("reports", (space,))``."""
+
+    kind: str
+    args: Tuple[str, ...] = ()
+
+    @property
+    def key(self) -> str:
+        return "/".join((self.kind, *self.args))
+
+    def to_json(self) -> List[str]:
+        return [self.kind, *self.args]
+
+    @classmethod
+    def from_json(cls, data: List[str]) -> "Task":
+        return cls(data[0], tuple(data[1:]))
+
+
+class SnapshotRecord(NamedTuple):
+    """An object found by a crawl, as its API fields without ``_links``."""
+
+    kind: str
+    token: str
+    parent: Optional[str]
+    data: Dict[str, Any]
+
+    @classmethod
+    def from_model(
+        cls, kind: str, model: BaseModel, parent: Optional[str] = None
+    ) -> "SnapshotRecord":
+        data = json.loads(model.json(by_alias=True, exclude={"links"}))
+        return cls(kind, data["token"], parent, data)
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "token": self.token,
+            "parent": self.parent,
+            "data": self.data,
+        }
+
+
+class SnapshotWriter(ABC):
+    """Where a crawl writes its records, along with its checkpoint.
+
+    ``commit`` stores a finished task's records and the tasks it discovered
+    together, so a crawl that is interrupted resumes from ``pending``
+    without losing or repeating records.
+    """
+
+    @abstractmethod
+    def pending(self) -> Optional[List[Task]]:
+        """Tasks left from an earlier crawl, or None if there was none."""
+
+    @abstractmethod
+    def start(self, tasks: List[Task]) -> None:
+        ...
+
+    @abstractmethod
+    def commit(
+        self, task: Task, records: List[SnapshotRecord], children: List[Task]
+    ) -> None:
+        ...
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "SnapshotWriter":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+
+class JsonlSnapshot(SnapshotWriter):
+    """Records as JSON lines, with the checkpoint in ``<path>.checkpoint``.
+
+    Each checkpoint line notes the snapshot's size after a task's records,
+    so on resume the snapshot is truncated to the last finished task.
+    """
+
+    def __init__(self, path: PathLike):
+        self.path = Path(path)
+        self.checkpoint_path = self.path.with_name(f"{self.path.name}.checkpoint")
+        self._pending, offset = self._replay()
+
+        mode = "r+b" if self.path.exists() else "wb"
+        self._file: IO[bytes] = open(self.path, mode)
+        self._file.truncate(offset)
+        self._file.seek(offset)
+        self._checkpoint = open(self.checkpoint_path, "a", encoding="utf-8")
+
+    def _replay(self) -> Tuple[Optional[List[Task]], int]:
+        if not self.checkpoint_path.exists():
+            return None, 0
+
+        queued: Dict[str, Task] = {}
+        done = set()
+        offset = 0
+        with open(self.checkpoint_path, encoding="utf-8") as checkpoint:
+            for line in checkpoint:
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    # A line cut short by the interruption.
+                    break
+
+                for data in event["queued"]:
+                    task = Task.from_json(data)
+                    queued[task.key] = task
+                if "done" in event:
+                    done.add(event["done"])
+                    offset = event["offset"]
+
+        return [task for key, task in queued.items() if key not in done], offset
+
+    def pending(self) -> Optional[List[Task]]:
+        return self._pending
+
+    def start(self, tasks: List[Task]) -> None:
+        self._log({"queued": [task.to_json() for task in tasks]})
+
+    def commit(
+        self, task: Task, records: List[SnapshotRecord], children: List[Task]
+    ) -> None:
+        lines = b"".join(
+            json.dumps(record.to_json()).encode() + b"\n" for record in records
+        )
+        self._file.write(lines)
+        self._file.flush()
+        self._log(
+            {
+                "done": task.key,
+                "offset": self._file.tell(),
+                "queued": [child.to_json() for child in children],
+            }
+        )
+
+    def _log(self, event: Dict[str, Any]) -> None:
+        self._checkpoint.write(json.dumps(event) + "\n")
+        self._checkpoint.flush()
+
+    def close(self) -> None:
+        self._file.close()
+        self._checkpoint.close()
+
+
+class SqliteSnapshot(SnapshotWriter):
+    """Records in a ``records`` table keyed by kind and token; each task is
+    committed in one transaction together with its checkpoint."""
+
+    def __init__(self, path: PathLike):
+        self.path = str(path)
+        self._db = sqlite3.connect(self.path)
+        with self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS records ("
+                "kind TEXT NOT NULL, token TEXT NOT NULL, parent TEXT, "
+                "data TEXT NOT NULL, PRIMARY KEY (kind, token))"
+            )
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS crawl_tasks ("
+                "key TEXT PRIMARY KEY, task TEXT NOT NULL, "
+                "done INTEGER NOT NULL DEFAULT 0)"
+            )
+
+    def pending(self) -> Optional[List[Task]]:
+        if not self._db.execute("SELECT 1 FROM crawl_tasks LIMIT 1").fetchone():
+            return None
+
+        rows = self._db.execute(
+            "SELECT task FROM crawl_tasks WHERE done = 0 ORDER BY rowid"
+        )
+        return [Task.from_json(json.loads(task)) for task, in rows]
+
+    def start(self, tasks: List[Task]) -> None:
+        with self._db:
+            self._queue(tasks)
+
+    def commit(
+        self, task: Task, records: List[SnapshotRecord], children: List[Task]
+    ) -> None:
+        with self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO records VALUES (?, ?, ?, ?)",
+                ((r.kind, r.token, r.parent, json.dumps(r.data)) for r in records),
+            )
+            self._queue(children)
+            self._db.execute(
+                "UPDATE crawl_tasks SET done = 1 WHERE key = ?", (task.key,)
+            )
+
+    def _queue(self, tasks: Iterable[Task]) -> None:
+        self._db.executemany(
+            "INSERT OR IGNORE INTO crawl_tasks (key, task) VALUES (?, ?)",
+            ((task.key, json.dumps(task.to_json())) for task in tasks),
+        )
+
+    def close(self) -> None:
+        self._db.close()
+
+
+def open_snapshot(path: PathLike) -> SnapshotWriter:
+    """A sqlite snapshot for ``.db``/``.sqlite``/``.sqlite3`` paths, otherwise
+    JSON lines."""
+    if Path(path).suffix in (".db", ".sqlite", ".sqlite3"):
+        return SqliteSnapshot(path)
+
+    return JsonlSnapshot(path)
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class RequestStats:
+    method: str
+    resource: str
+    status_code: Optional[int] = None
+    rate_limit_wait: float = 0.0
+    retries: int = 0
+    backoff: float = 0.0
+    cache: Optional[str] = None
+    elapsed: float = 0.0
+    template: Optional[str] = None
+    response_bytes: int = 0
+    parse_time: float = 0.0
+
+
+_last_request: ContextVar[Optional[RequestStats]] = ContextVar(
+    "mode_client_last_request", default=None
+)
+
+
+def last_request_stats() -> Optional[RequestStats]:
+    """Stats for the latest request made in the current thread or asyncio task."""
+    return _last_request.get()
+
+
+def record(stats: RequestStats) -> None:
+    _last_request.set(stats)
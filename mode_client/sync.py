@@ -0,0 +1,397 @@
+from __future__ import annotations
+
+import json
+import time
+from datetime import datetime
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncGenerator,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Union,
+    cast,
+)
+
+from mode_client.batch import DEFAULT_CONCURRENCY
+from mode_client.crawler import (
+    DEFAULT_PROGRESS_INTERVAL,
+    RECORD_KINDS,
+    AsyncWorkspaceCrawler,
+    BaseCrawler,
+    CrawlProgress,
+    WorkspaceCrawler,
+    task_parent,
+)
+from mode_client.export import PathLike
+from mode_client.models import Report
+from mode_client.pagination import DEFAULT_PER_PAGE
+from mode_client.snapshot import SnapshotRecord, SqliteSnapshot, Task
+from mode_client.timestamps import parse_timestamp
+
+if TYPE_CHECKING:
+    from mode_client.async_clients import AsyncModeClient
+    from mode_client.clients import ModeClient
+
+# How often each space's reports are listed in full to find deleted reports,
+# which listing down to the watermark can't see.
+DEFAULT_FULL_EVERY = 24 * 60 * 60.0
+
+
+class Delta(NamedTuple):
+    """A change written by a sync: an ``"upsert"`` with the record's data, or
+    a ``"delete"`` tombstone with none."""
+
+    id: int
+    op: str
+    kind: str
+    token: str
+    parent: Optional[str]
+    data: Optional[Dict[str, Any]]
+
+
+def as_datetime(value: Union[str, datetime]) -> datetime:
+    return parse_timestamp(value) if isinstance(value, str) else value
+
+
+class SyncStore(SqliteSnapshot):
+    """A sqlite snapshot kept current by ``WorkspaceSync``.
+
+    Besides the ``records`` table it keeps each space's ``updated_at``
+    watermark and a ``deltas`` log of every upsert and tombstone; deleting a
+    record also deletes the records below it. A ``WorkspaceCrawler`` snapshot
+    can be opened as a store and synced from there.
+    """
+
+    def __init__(self, path: PathLike):
+        super().__init__(path)
+        with self._db:
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS records_parent ON records (parent)"
+            )
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS watermarks ("
+                "space TEXT PRIMARY KEY, updated_at TEXT, full_at REAL)"
+            )
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS deltas ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, synced_at REAL NOT NULL, "
+                "op TEXT NOT NULL, kind TEXT NOT NULL, token TEXT NOT NULL, "
+                "parent TEXT, data TEXT)"
+            )
+
+    def pending(self) -> Optional[List[Task]]:
+        """Tasks left by an interrupted sync; a finished one leaves none."""
+        return super().pending() or None
+
+    def start(self, tasks: List[Task]) -> None:
+        with self._db:
+            self._db.execute("DELETE FROM crawl_tasks")
+            self._queue(tasks)
+
+    def commit(
+        self, task: Task, records: List[SnapshotRecord], children: List[Task]
+    ) -> None:
+        with self._db:
+            if task.kind == "changed_reports":
+                for record in records:
+                    self._upsert(record)
+            else:
+                self._replace(RECORD_KINDS[task.kind], task_parent(task), records)
+
+            if task.kind in ("reports", "changed_reports"):
+                self._advance(task.args[0], records, task.kind == "reports")
+
+            self._queue(children)
+            self._db.execute(
+                "UPDATE crawl_tasks SET done = 1 WHERE key = ?", (task.key,)
+            )
+
+    def record(self, kind: str, token: str) -> Optional[Dict[str, Any]]:
+        row = self._db.execute(
+            "SELECT data FROM records WHERE kind = ? AND token = ?", (kind, token)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def watermark(self, space: str) -> Optional[str]:
+        row = self._db.execute(
+            "SELECT updated_at FROM watermarks WHERE space = ?", (space,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def full_due(self, space: str, every: Optional[float]) -> bool:
+        row = self._db.execute(
+            "SELECT full_at FROM watermarks WHERE space = ?", (space,)
+        ).fetchone()
+        if not row or row[0] is None:
+            return True
+
+        return every is not None and time.time() - row[0] >= every
+
+    def deltas(self, after: int = 0) -> List[Delta]:
+        """Changes logged after the delta with id ``after``, oldest first."""
+        rows = self._db.execute(
+            "SELECT id, op, kind, token, parent, data FROM deltas "
+            "WHERE id > ? ORDER BY id",
+            (after,),
+        )
+        return [
+            Delta(id, op, kind, token, parent, json.loads(data) if data else None)
+            for id, op, kind, token, parent, data in rows
+        ]
+
+    def _replace(
+        self, kind: str, parent: Optional[str], records: List[SnapshotRecord]
+    ) -> None:
+        """Make ``records`` the complete set of ``kind`` records under parent."""
+        rows = self._db.execute(
+            "SELECT token FROM records WHERE kind = ? AND parent IS ?", (kind, parent)
+        )
+        existing = {token for token, in rows}
+        for record in records:
+            self._upsert(record)
+            existing.discard(record.token)
+
+        for token in existing:
+            self._delete(kind, token)
+
+    def _upsert(self, record: SnapshotRecord) -> None:
+        data = json.dumps(record.data)
+        row = self._db.execute(
+            "SELECT parent, data FROM records WHERE kind = ? AND token = ?",
+            (record.kind, record.token),
+        ).fetchone()
+        if row == (record.parent, data):
+            return
+
+        self._db.execute(
+            "INSERT OR REPLACE INTO records VALUES (?, ?, ?, ?)",
+            (record.kind, record.token, record.parent, data),
+        )
+        self._log("upsert", record.kind, record.token, record.parent, data)
+
+    def _delete(self, kind: str, token: str) -> None:
+        doomed = [(kind, token)]
+        while doomed:
+            kind, token = doomed.pop()
+            row = self._db.execute(
+                "SELECT parent FROM records WHERE kind = ? AND token = ?",
+                (kind, token),
+            ).fetchone()
+            self._db.execute(
+                "DELETE FROM records WHERE kind = ? AND token = ?", (kind, token)
+            )
+            if kind == "space":
+                self._db.execute("DELETE FROM watermarks WHERE space = ?", (token,))
+            self._log("delete", kind, token, row[0] if row else None, None)
+
+            doomed.extend(
+                self._db.execute(
+                    "SELECT kind, token FROM records WHERE parent = ?", (token,)
+                )
+            )
+
+    def _advance(self, space: str, records: List[SnapshotRecord], full: bool) -> None:
+        newest = max(
+            (as_datetime(record.data["updated_at"]) for record in records),
+            default=None,
+        )
+        current = self.watermark(space)
+        self._db.execute(
+            "INSERT OR IGNORE INTO watermarks (space) VALUES (?)", (space,)
+        )
+        if newest and (current is None or newest > as_datetime(current)):
+            self._db.execute(
+                "UPDATE watermarks SET updated_at = ? WHERE space = ?",
+                (newest.isoformat(), space),
+            )
+        if full:
+            self._db.execute(
+                "UPDATE watermarks SET full_at = ? WHERE space = ?",
+                (time.time(), space),
+            )
+
+    def _log(
+        self,
+        op: str,
+        kind: str,
+        token: str,
+        parent: Optional[str],
+        data: Optional[str],
+    ) -> None:
+        self._db.execute(
+            "INSERT INTO deltas (synced_at, op, kind, token, parent, data) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (time.time(), op, kind, token, parent, data),
+        )
+
+
+class BaseSync(BaseCrawler):
+    """What an incremental sync lists, shared by both syncs.
+
+    Spaces and definitions are listed in full each time. Each space's
+    reports are listed newest first only down to its watermark, except every
+    ``full_every`` seconds, when they're listed in full to find deleted
+    ones. Queries and the latest run are fetched again only for reports
+    whose own fields changed.
+    """
+
+    snapshot: SyncStore
+    full: bool = False
+    full_every: Optional[float] = DEFAULT_FULL_EVERY
+    per_page: int = DEFAULT_PER_PAGE
+
+    def _listing(self, space: str) -> Task:
+        if self.full or self.snapshot.full_due(space, self.full_every):
+            return Task("reports", (space,))
+
+        # The watermark travels with the task, as listings run off the thread
+        # that owns the store's connection.
+        return Task("changed_reports", (space, self.snapshot.watermark(space) or ""))
+
+    def _expand(self, task: Task, items: List[Any]) -> List[Task]:
+        if task.kind == "spaces":
+            return [self._listing(space.token) for space in items]
+        if task.kind not in ("reports", "changed_reports"):
+            return super()._expand(task, items)
+
+        tasks = []
+        for report in items:
+            stored = self.snapshot.record("report", report.token)
+            data = SnapshotRecord.from_model("report", report).data
+            if stored == data:
+                continue
+
+            for child in self._report_tasks(report):
+                run = (stored or {}).get("last_successful_run_token")
+                if child.kind != "run" or run != report.last_successful_run_token:
+                    tasks.append(child)
+
+        return tasks
+
+    def _stale(self, report: Any, watermark: str) -> bool:
+        """Whether listing can stop at this report."""
+        if not watermark:
+            return False
+
+        return as_datetime(report.updated_at) < as_datetime(watermark)
+
+
+class WorkspaceSync(BaseSync, WorkspaceCrawler):
+    """Brings a ``SyncStore`` up to date with the workspace, writing upserts
+    and tombstones to its ``deltas`` log.
+
+    The first sync of a store lists everything, like ``WorkspaceCrawler``;
+    later ones mostly make one request per space plus a few per changed
+    report.
+    """
+
+    def __init__(
+        self,
+        client: "ModeClient",
+        store: Union[SyncStore, PathLike],
+        concurrency: int = DEFAULT_CONCURRENCY,
+        definitions: bool = True,
+        queries: bool = True,
+        runs: bool = True,
+        full_every: Optional[float] = DEFAULT_FULL_EVERY,
+        per_page: int = DEFAULT_PER_PAGE,
+        on_progress: Optional[Callable[[CrawlProgress], None]] = None,
+        progress_interval: float = DEFAULT_PROGRESS_INTERVAL,
+    ):
+        store = store if isinstance(store, SyncStore) else SyncStore(store)
+        super().__init__(
+            client,
+            store,
+            concurrency,
+            definitions,
+            queries,
+            runs,
+            on_progress,
+            progress_interval,
+        )
+        self.full_every = full_every
+        self.per_page = per_page
+
+    def _fetch(self, task: Task) -> List[Any]:
+        if task.kind == "reports":
+            return list(self.client.report.iter_reports(task.args[0], self.per_page))
+        if task.kind != "changed_reports":
+            return super()._fetch(task)
+
+        space, watermark = task.args
+        changed = []
+        for report in self.client.report.iter_reports(space, self.per_page):
+            if self._stale(report, watermark):
+                break
+            changed.append(report)
+
+        return changed
+
+    def run(self, full: bool = False) -> CrawlProgress:
+        """Sync the store; ``full`` lists every space's reports in full."""
+        self.full = full
+        return super().run()
+
+
+class AsyncWorkspaceSync(BaseSync, AsyncWorkspaceCrawler):
+    """``WorkspaceSync`` for ``AsyncModeClient``."""
+
+    def __init__(
+        self,
+        client: "AsyncModeClient",
+        store: Union[SyncStore, PathLike],
+        concurrency: int = DEFAULT_CONCURRENCY,
+        definitions: bool = True,
+        queries: bool = True,
+        runs: bool = True,
+        full_every: Optional[float] = DEFAULT_FULL_EVERY,
+        per_page: int = DEFAULT_PER_PAGE,
+        on_progress: Optional[Callable[[CrawlProgress], None]] = None,
+        progress_interval: float = DEFAULT_PROGRESS_INTERVAL,
+    ):
+        store = store if isinstance(store, SyncStore) else SyncStore(store)
+        super().__init__(
+            client,
+            store,
+            concurrency,
+            definitions,
+            queries,
+            runs,
+            on_progress,
+            progress_interval,
+        )
+        self.full_every = full_every
+        self.per_page = per_page
+
+    async def _fetch(self, task: Task) -> List[Any]:
+        if task.kind == "reports":
+            reports = self.client.report.iter_reports(task.args[0], self.per_page)
+            return [report async for report in reports]
+        if task.kind != "changed_reports":
+            return await super()._fetch(task)
+
+        space, watermark = task.args
+        changed = []
+        # iter_reports is an async generator; close it if we stop early.
+        reports = cast(
+            AsyncGenerator[Report, None],
+            self.client.report.iter_reports(space, self.per_page),
+        )
+        try:
+            async for report in reports:
+                if self._stale(report, watermark):
+                    break
+                changed.append(report)
+        finally:
+            await reports.aclose()
+
+        return changed
+
+    async def run(self, full: bool = False) -> CrawlProgress:
+        """Sync the store; ``full`` lists every space's reports in full."""
+        self.full = full
+        return await super().run()
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Optional
+
+from pydantic.datetime_parse import parse_datetime
+
+
+def parse_timestamp(value: str) -> datetime:
+    """A timezone-aware datetime for an API timestamp.
+
+    Mode sends UTC timestamps like ``2022-08-30T09:01:55.216Z``, which
+    ``datetime.fromisoformat`` parses once the ``Z`` is spelled out; anything
+    else goes through pydantic's slower, more lenient parser. Naive values
+    are taken to be UTC.
+    """
+    try:
+        if value.endswith("Z"):
+            return datetime.fromisoformat(value[:-1] + "+00:00")
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        parsed = parse_datetime(value)
+
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def parse_optional_timestamp(value: Optional[str]) -> Optional[datetime]:
+    return None if value is None else parse_timestamp(value)
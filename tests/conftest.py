@@ -0,0 +1,12 @@
+import json
+from pathlib import Path
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def fixture(name):
+    return json.loads(fixture_bytes(name))
+
+
+def fixture_bytes(name):
+    return (FIXTURES / f"{name}.json").read_bytes()
@@ -0,0 +1,201 @@
+import asyncio
+import inspect
+import unittest
+from unittest.mock import patch
+
+import httpx
+from conftest import fixture
+
+from mode_client import AsyncModeClient, ModeClient, RetryPolicy, TokenBucket
+from mode_client.async_clients import AsyncModeBaseClient
+from mode_client.clients import ModeBaseClient
+
+SUBCLIENTS = [
+    "account",
+    "query",
+    "query_run",
+    "report",
+    "report_run",
+    "space",
+    "definition",
+]
+
+# (subclient, method, args) covering every endpoint.
+CALLS = [
+    ("account", "get", ("mode_client",)),
+    ("query", "get", ("r", "q")),
+    ("query", "list", ("r",)),
+    ("query", "create", ("r", "SELECT 1", 1, "Query 1")),
+    ("query", "update", ("r", "q", "SELECT 2")),
+    ("query", "delete", ("r", "q")),
+    ("query_run", "get", ("r", "run", "qr")),
+    ("query_run", "list", ("r", "run")),
+    ("report", "get", ("r",)),
+    ("report", "list", ("s",)),
+    ("report", "update", ("r", "New name")),
+    ("report", "delete", ("r",)),
+    ("report", "archive", ("r",)),
+    ("report", "unarchive", ("r",)),
+    ("report", "sync", ("r", "message")),
+    ("report_run", "get", ("r", "run")),
+    ("report_run", "list", ("r",)),
+    ("report_run", "clone", ("r", "run")),
+    ("report_run", "create", ("r", {"a": 1})),
+    ("space", "get", ("s",)),
+    ("space", "list", ("all",)),
+    ("space", "create", ("name", "description")),
+    ("space", "update", ("s", "name")),
+    ("space", "delete", ("s",)),
+    ("definition", "get", ("d",)),
+    ("definition", "list", ("active", ["d1", "d2"])),
+    ("definition", "sync", ("d", "message")),
+]
+
+
+def fake_response(request):
+    path = request.url.path
+    if path.endswith("/queries"):
+        body = {"_embedded": {"queries": [fixture("query")]}}
+    elif path.endswith("/query_runs"):
+        body = {"_embedded": {"query_runs": [fixture("query_run")]}}
+    elif path.endswith("/reports") and path.startswith("/api/ws/spaces"):
+        body = {"_embedded": {"reports": [fixture("report")]}}
+    elif path.endswith("/runs") and request.method == "GET":
+        body = {
+            "pagination": {
+                "page": 1,
+                "per_page": 30,
+                "count": 1,
+                "total_pages": 1,
+                "total_count": 1,
+            },
+            "_embedded": {"report_runs": [fixture("report_run")]},
+        }
+    elif path.endswith("/spaces") and request.method == "GET":
+        body = {"_embedded": {"spaces": [fixture("space")]}}
+    elif path.endswith("/definitions"):
+        body = {"_embedded": {"definitions": [fixture("definition")]}}
+    elif "/query_runs/" in path:
+        body = fixture("query_run")
+    elif "/queries/" in path:
+        body = fixture("query")
+    elif "/runs" in path:
+        body = fixture("report_run")
+    elif "/reports/" in path:
+        body = fixture("report")
+    elif "/spaces" in path:
+        body = fixture("space")
+    elif "/definitions/" in path:
+        body = fixture("definition")
+    else:
+        body = fixture("account")
+    return httpx.Response(200, json=body)
+
+
+def summarize(request):
+    return (request.method, str(request.url), request.content)
+
+
+class TestAsyncParity(unittest.TestCase):
+    def test_same_public_methods_and_signatures(self):
+        sync_client = ModeClient("ws", "token", "password")
+        async_client = AsyncModeClient("ws", "token", "password")
+        for name in SUBCLIENTS:
+            sync_cls = type(getattr(sync_client, name))
+            async_cls = type(getattr(async_client, name))
+            sync_methods = set(dir(sync_cls)) - set(dir(ModeBaseClient))
+            async_methods = set(dir(async_cls)) - set(dir(AsyncModeBaseClient))
+            public = {m for m in sync_methods if not m.startswith("_")}
+            self.assertEqual(
+                public, {m for m in async_methods if not m.startswith("_")}
+            )
+            for method in public:
+                async_method = getattr(async_cls, method)
+                if not method.startswith("iter_") and method != "waiter":
+                    self.assertTrue(
+                        inspect.iscoroutinefunction(async_method)
+                        or inspect.isasyncgenfunction(async_method),
+                        method,
+                    )
+                self.assertEqual(
+                    inspect.signature(getattr(sync_cls, method)).parameters,
+                    inspect.signature(async_method).parameters,
+                )
+
+    def test_same_requests_and_results(self):
+        sync_requests, async_requests = [], []
+
+        def sync_handler(request):
+            sync_requests.append(summarize(request))
+            return fake_response(request)
+
+        async def async_handler(request):
+            async_requests.append(summarize(request))
+            return fake_response(request)
+
+        sync_client = ModeClient(
+            "ws", "token", "password", transport=httpx.MockTransport(sync_handler)
+        )
+        async_client = AsyncModeClient(
+            "ws", "token", "password", transport=httpx.MockTransport(async_handler)
+        )
+
+        async def run_async():
+            return [
+                await getattr(getattr(async_client, sub), method)(*args)
+                for sub, method, args in CALLS
+            ]
+
+        sync_results = [
+            getattr(getattr(sync_client, sub), method)(*args)
+            for sub, method, args in CALLS
+        ]
+        async_results = asyncio.run(run_async())
+
+        self.assertEqual(sync_requests, async_requests)
+        self.assertEqual(sync_results, async_results)
+
+
+class TestAsyncModeClient(unittest.TestCase):
+    def test_subclients_share_pool_and_limiter(self):
+        bucket = TokenBucket()
+        client = AsyncModeClient("ws", "token", "password", rate_limiter=bucket)
+        for name in SUBCLIENTS:
+            subclient = getattr(client, name)
+            self.assertIs(subclient.client, client.client)
+            self.assertIs(subclient.rate_limiter, bucket)
+
+    def test_concurrent_gets(self):
+        async def handler(request):
+            return fake_response(request)
+
+        async def run():
+            async with AsyncModeClient(
+                "ws", "token", "password", transport=httpx.MockTransport(handler)
+            ) as client:
+                reports = await asyncio.gather(
+                    *(client.report.get(f"r{i}") for i in range(20))
+                )
+            return client, reports
+
+        client, reports = asyncio.run(run())
+        self.assertEqual(len(reports), 20)
+        self.assertTrue(client.client.is_closed)
+
+    @patch("mode_client.async_clients.asyncio.sleep")
+    def test_retries(self, mock_sleep):
+        responses = [httpx.Response(503), httpx.Response(200, json={"ok": True})]
+
+        async def handler(request):
+            return responses.pop(0)
+
+        client = AsyncModeClient(
+            "ws",
+            "token",
+            "password",
+            transport=httpx.MockTransport(handler),
+            retry=RetryPolicy(jitter=False),
+        )
+        response = asyncio.run(client.report.request("GET", "/reports/r"))
+        self.assertEqual(response, {"ok": True})
+        mock_sleep.assert_called_once_with(1.0)
@@ -0,0 +1,161 @@
+import asyncio
+import threading
+import unittest
+
+import httpx
+from conftest import fixture
+
+from mode_client import AsyncModeClient, ModeClient
+from mode_client.batch import chunk_tokens
+
+REPORT = fixture("report")
+QUERY = fixture("query")
+DEFINITION = fixture("definition")
+
+
+def report_response(request):
+    token = request.url.path.rsplit("/", 1)[-1]
+    if token.startswith("missing"):
+        return httpx.Response(404, json={"message": "not found"})
+    if "/queries/" in request.url.path:
+        return httpx.Response(200, json={**QUERY, "token": token})
+    return httpx.Response(200, json={**REPORT, "token": token})
+
+
+class TestGetMany(unittest.TestCase):
+    def setUp(self):
+        self.lock = threading.Lock()
+        self.paths = []
+
+        def handler(request):
+            with self.lock:
+                self.paths.append(request.url.path)
+            return report_response(request)
+
+        self.client = ModeClient(
+            "ws", "token", "password", transport=httpx.MockTransport(handler)
+        )
+
+    def test_partial_results_in_input_order(self):
+        tokens = ["r3", "missing1", "r1", "r3", "r2"]
+        batch = self.client.report.get_many(tokens, concurrency=3)
+
+        self.assertEqual(list(batch.results), ["r3", "r1", "r2"])
+        self.assertEqual([r.token for r in batch.results.values()], ["r3", "r1", "r2"])
+        self.assertEqual(list(batch.errors), ["missing1"])
+        self.assertIsInstance(batch.errors["missing1"], httpx.HTTPStatusError)
+        self.assertFalse(batch.ok)
+
+    def test_deduplicates_requests(self):
+        self.client.report.get_many(["r1", "r1", "r2", "r1"])
+        self.assertEqual(
+            sorted(self.paths), ["/api/ws/reports/r1", "/api/ws/reports/r2"]
+        )
+
+    def test_query_get_many(self):
+        batch = self.client.query.get_many("r1", ["q1", "q2"])
+        self.assertTrue(batch.ok)
+        self.assertEqual(
+            sorted(self.paths),
+            ["/api/ws/reports/r1/queries/q1", "/api/ws/reports/r1/queries/q2"],
+        )
+
+    def test_validation_errors_are_per_token(self):
+        def handler(request):
+            return httpx.Response(200, json={"token": "broken"})
+
+        client = ModeClient(
+            "ws", "token", "password", transport=httpx.MockTransport(handler)
+        )
+        batch = client.space.get_many(["s1"])
+        self.assertEqual(list(batch.errors), ["s1"])
+
+
+class TestAsyncGetMany(unittest.TestCase):
+    def test_bounded_concurrency(self):
+        in_flight = []
+        peak = []
+
+        async def handler(request):
+            in_flight.append(request)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.remove(request)
+            return report_response(request)
+
+        client = AsyncModeClient(
+            "ws", "token", "password", transport=httpx.MockTransport(handler)
+        )
+        tokens = [f"r{i}" for i in range(10)] + ["missing"]
+        batch = asyncio.run(client.report.get_many(tokens, concurrency=3))
+
+        self.assertEqual(list(batch.results), tokens[:-1])
+        self.assertEqual(list(batch.errors), ["missing"])
+        self.assertEqual(max(peak), 3)
+
+
+def definitions_handler(urls, known):
+    def handler(request):
+        urls.append(str(request.url))
+        tokens = request.url.params.get_list("tokens")
+        if "fail" in tokens:
+            return httpx.Response(500)
+        definitions = [{**DEFINITION, "token": t} for t in tokens if t in known]
+        return httpx.Response(200, json={"_embedded": {"definitions": definitions}})
+
+    return handler
+
+
+class TestGetByTokens(unittest.TestCase):
+    def test_chunk_tokens(self):
+        tokens = [f"{i:012x}" for i in range(100)]
+        chunks = list(chunk_tokens(tokens, "https://x/definitions?", 300))
+        self.assertEqual(sum(chunks, []), tokens)
+        for chunk in chunks:
+            query = "&".join(f"tokens={t}" for t in chunk)
+            self.assertLessEqual(len("https://x/definitions?") + len(query), 300)
+
+    def test_batches_lookup(self):
+        urls = []
+        tokens = [f"{i:012x}" for i in range(3000)]
+        known = set(tokens) - {tokens[5], tokens[2999]}
+        client = ModeClient(
+            "ws",
+            "token",
+            "password",
+            transport=httpx.MockTransport(definitions_handler(urls, known)),
+        )
+        batch = client.definition.get_by_tokens(tokens + tokens[:10])
+
+        self.assertEqual(len(batch.results), 2998)
+        self.assertEqual(list(batch.results)[:5], tokens[:5])
+        self.assertEqual(batch.missing, [tokens[5], tokens[2999]])
+        self.assertEqual(batch.errors, {})
+        self.assertLessEqual(len(urls), 40)
+        self.assertTrue(all(len(url) <= 2000 for url in urls))
+
+    def test_failed_chunk_is_reported_per_token(self):
+        urls = []
+        client = ModeClient(
+            "ws",
+            "token",
+            "password",
+            transport=httpx.MockTransport(definitions_handler(urls, {"a", "b"})),
+        )
+        batch = client.definition.get_by_tokens(["a", "b", "fail"])
+        self.assertEqual(list(batch.errors), ["a", "b", "fail"])
+        self.assertEqual(batch.missing, [])
+
+    def test_async_lookup(self):
+        urls = []
+        sync_handler = definitions_handler(urls, {"a"})
+
+        async def handler(request):
+            return sync_handler(request)
+
+        client = AsyncModeClient(
+            "ws", "token", "password", transport=httpx.MockTransport(handler)
+        )
+        batch = asyncio.run(client.definition.get_by_tokens(["a", "b"]))
+        self.assertEqual(list(batch.results), ["a"])
+        self.assertEqual(batch.missing, ["b"])
@@ -0,0 +1,171 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import httpx
+from conftest import fixture
+
+from mode_client import MemoryCache, ModeClient, SqliteCache, last_request_stats
+from mode_client.cache import Cache
+
+REPORT = fixture("report")
+SPACE = fixture("space")
+
+
+class FakeApi:
+    def __init__(self, etag=None):
+        self.etag = etag
+        self.requests = []
+
+    def __call__(self, request):
+        self.requests.append(request)
+        path = request.url.path
+        if request.method != "GET":
+            return httpx.Response(200, json=SPACE if "/spaces/" in path else REPORT)
+        if self.etag and request.headers.get("If-None-Match") == self.etag:
+            return httpx.Response(304)
+
+        headers = {"ETag": self.etag} if self.etag else {}
+        if path.endswith("/reports"):
+            body = {"_embedded": {"reports": [REPORT]}}
+        elif "/spaces/" in path:
+            body = SPACE
+        else:
+            body = REPORT
+        return httpx.Response(200, json=body, headers=headers)
+
+
+class CacheTests:
+    def make_cache(self, **kwargs):
+        raise NotImplementedError
+
+    def client(self, api, **kwargs):
+        self.cache = self.make_cache(**kwargs)
+        return ModeClient(
+            "ws",
+            "token",
+            "password",
+            transport=httpx.MockTransport(api),
+            cache=self.cache,
+        )
+
+    def test_fresh_hits_skip_the_network(self):
+        api = FakeApi()
+        client = self.client(api)
+        first = client.report.get("r1")
+        second = client.report.get("r1")
+
+        self.assertEqual(first, second)
+        self.assertEqual(len(api.requests), 1)
+        self.assertEqual(last_request_stats().cache, "hit")
+        self.assertEqual((self.cache.stats.hits, self.cache.stats.misses), (1, 1))
+
+    def test_params_are_part_of_the_key(self):
+        api = FakeApi()
+        client = self.client(api)
+        client.space.request("GET", "/spaces", params={"filter": "all"})
+        client.space.request("GET", "/spaces", params={"filter": "custom"})
+        self.assertEqual(len(api.requests), 2)
+
+    def test_per_resource_ttl(self):
+        api = FakeApi()
+        client = self.client(api, ttl=60, ttls={"reports": 0})
+        client.report.get("r1")
+        client.report.get("r1")
+        client.space.get("s1")
+        client.space.get("s1")
+        self.assertEqual(len(api.requests), 3)
+
+    def test_stale_entries_are_revalidated(self):
+        api = FakeApi(etag='"v1"')
+        client = self.client(api, ttl=0)
+        client.report.get("r1")
+        report = client.report.get("r1")
+
+        self.assertEqual(report.token, REPORT["token"])
+        self.assertEqual(api.requests[1].headers["If-None-Match"], '"v1"')
+        self.assertEqual(last_request_stats().cache, "revalidated")
+        self.assertEqual(self.cache.stats.revalidations, 1)
+
+    def test_mutations_invalidate_entity_and_listings(self):
+        api = FakeApi()
+        client = self.client(api)
+        client.report.get("r1")
+        client.report.get("r2")
+        client.report.list("s1")
+        client.report.update("r1", name="Renamed")
+
+        client.report.get("r1")
+        client.report.get("r2")
+        client.report.list("s1")
+        paths = [r.url.path for r in api.requests[4:]]
+        self.assertEqual(paths, ["/api/ws/reports/r1", "/api/ws/spaces/s1/reports"])
+        self.assertEqual(self.cache.stats.invalidations, 2)
+
+    def test_delete_and_archive_invalidate(self):
+        api = FakeApi()
+        client = self.client(api)
+        client.report.get("r1")
+        client.report.archive("r1")
+        client.report.get("r1")
+        client.space.get("s1")
+        client.space.update("s1", name="Renamed")
+        client.space.get("s1")
+        self.assertEqual(len(api.requests), 6)
+
+    @patch("mode_client.cache.time.time")
+    def test_expiry(self, mock_time):
+        mock_time.return_value = 1000.0
+        api = FakeApi()
+        client = self.client(api, ttl=30)
+        client.report.get("r1")
+        mock_time.return_value = 1029.0
+        client.report.get("r1")
+        mock_time.return_value = 1031.0
+        client.report.get("r1")
+        self.assertEqual(len(api.requests), 2)
+
+
+class TestCache(unittest.TestCase):
+    def test_base_class_is_abstract(self):
+        with self.assertRaises(TypeError):
+            Cache()
+
+
+class TestMemoryCache(CacheTests, unittest.TestCase):
+    def make_cache(self, **kwargs):
+        return MemoryCache(**kwargs)
+
+    def test_lru_eviction(self):
+        api = FakeApi()
+        client = self.client(api, maxsize=2)
+        client.report.get("r1")
+        client.report.get("r2")
+        client.report.get("r1")
+        client.report.get("r3")
+        client.report.get("r1")
+        client.report.get("r2")
+        self.assertEqual(
+            [r.url.path.rsplit("/", 1)[-1] for r in api.requests],
+            ["r1", "r2", "r3", "r2"],
+        )
+
+
+class TestSqliteCache(CacheTests, unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = str(Path(self.tmp.name) / "cache.sqlite")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def make_cache(self, **kwargs):
+        return SqliteCache(path=self.path, **kwargs)
+
+    def test_persists_between_clients(self):
+        api = FakeApi()
+        self.client(api).report.get("r1")
+        self.cache.close()
+        self.client(api).report.get("r1")
+        self.assertEqual(len(api.requests), 1)
@@ -1,7 +1,11 @@
 import unittest
 from unittest.mock import patch, MagicMock
+
+import httpx
+
 from mode_client.clients import (
     ModeBaseClient,
+    ModeClient,
     ModeAccountClient,
     ModeQueryClient,
     ModeReportClient,
@@ -462,3 +466,52 @@ class TestModeDefinitionClient(unittest.TestCase):
             mock_parse_obj.assert_called_once_with(
                 {"id": "definition_id", "status": "synced"}
             )
+
+
+class TestModeClient(unittest.TestCase):
+    def test_subclients_share_http_client(self):
+        client = ModeClient("workspace", "token", "password")
+        subclients = [
+            client.account,
+            client.query,
+            client.query_run,
+            client.report,
+            client.report_run,
+            client.space,
+            client.definition,
+        ]
+        self.assertTrue(all(c.client is client.client for c in subclients))
+
+    def test_request_urls(self):
+        urls = []
+
+        def handler(request):
+            urls.append(str(request.url))
+            return httpx.Response(200, json={})
+
+        client = ModeClient(
+            "workspace", "token", "password", transport=httpx.MockTransport(handler)
+        )
+        client.report.request("GET", "/reports/report_id")
+        client.account.request("GET", "/account")
+        self.assertEqual(
+            urls,
+            [
+                "https://app.mode.com/api/workspace/reports/report_id",
+                "https://app.mode.com/api/account",
+            ],
+        )
+
+    def test_context_manager_closes_pool(self):
+        with ModeClient("workspace", "token", "password") as client:
+            report_client = client.report
+            self.assertFalse(client.client.is_closed)
+
+        self.assertTrue(client.client.is_closed)
+        report_client.close()
+        self.assertTrue(report_client.client.is_closed)
+
+    def test_subclient_does_not_close_shared_pool(self):
+        client = ModeClient("workspace", "token", "password")
+        client.report.close()
+        self.assertFalse(client.client.is_closed)
@@ -0,0 +1,105 @@
+import asyncio
+import importlib.util
+import unittest
+from datetime import datetime
+
+import httpx
+from conftest import fixture
+
+from mode_client import AsyncModeClient, ModeClient
+from mode_client.columns import build_columns, model_columns
+from mode_client.models import Query, QueryRun, Report, ReportRun
+from mode_client.timestamps import parse_timestamp
+
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
+
+class TestBuildColumns(unittest.TestCase):
+    def test_matches_models(self):
+        for name, model in (("report", Report), ("report_run", ReportRun)):
+            with self.subTest(name):
+                data = fixture(name)
+                columns = build_columns(model, [data, data])
+                parsed = model.parse_obj(data).dict()
+
+                self.assertEqual(columns.num_rows, 2)
+                self.assertNotIn("links", columns)
+                for column in model_columns(model):
+                    expected = parsed[column.name]
+                    if column.kind == "timestamp" and expected is not None:
+                        expected = parse_timestamp(expected)
+                    self.assertEqual(columns[column.name][0], expected, column.name)
+
+    def test_kinds(self):
+        kinds = {column.name: column.kind for column in model_columns(ReportRun)}
+        self.assertEqual(kinds["created_at"], "timestamp")
+        self.assertEqual(kinds["completed_at"], "timestamp")
+        self.assertEqual(kinds["state"], "enum")
+        self.assertEqual(kinds["form_fields"], "json")
+
+        kinds = {column.name: column.kind for column in model_columns(QueryRun)}
+        self.assertEqual(kinds["state"], "enum")
+        self.assertEqual(kinds["parameters"], "json")
+
+    def test_coerces_int_ids(self):
+        for name, model in (("query", Query), ("query_run", QueryRun)):
+            with self.subTest(name):
+                data = {**fixture(name), "id": 18230194, "data_source_id": 71842}
+                columns = build_columns(model, [data])
+                parsed = model.parse_obj(data)
+
+                self.assertEqual(columns["id"], [parsed.id])
+                self.assertEqual(columns["data_source_id"], ["71842"])
+                if HAS_PYARROW:
+                    table = columns.to_arrow()
+                    self.assertEqual(
+                        table.column("data_source_id").to_pylist(), ["71842"]
+                    )
+
+    def test_missing_optionals(self):
+        data = fixture("report_run")
+        del data["completed_at"]
+        columns = build_columns(ReportRun, [data])
+        self.assertEqual(columns["completed_at"], [None])
+
+    @unittest.skipUnless(HAS_PYARROW, "requires pyarrow")
+    def test_to_arrow(self):
+        import pyarrow
+
+        data = fixture("report_run")
+        finished = {**data, "state": "failed", "completed_at": None}
+        table = build_columns(ReportRun, [data, finished]).to_arrow()
+
+        self.assertEqual(table.num_rows, 2)
+        self.assertEqual(table.schema.field("created_at").type.tz, "UTC")
+        self.assertTrue(
+            pyarrow.types.is_timestamp(table.schema.field("created_at").type)
+        )
+        self.assertTrue(pyarrow.types.is_dictionary(table.schema.field("state").type))
+        self.assertEqual(table.column("state").to_pylist(), [data["state"], "failed"])
+        self.assertIsNone(table.column("completed_at")[1].as_py())
+
+
+def fake_api(request):
+    return httpx.Response(200, json={"_embedded": {"reports": [fixture("report")] * 3}})
+
+
+class TestClientColumns(unittest.TestCase):
+    def test_sync(self):
+        client = ModeClient("ws", "t", "p", transport=httpx.MockTransport(fake_api))
+        columns = client.report.columns("s")
+
+        self.assertEqual(columns.num_rows, 3)
+        self.assertIsInstance(columns["created_at"][0], datetime)
+
+    def test_async(self):
+        async def handler(request):
+            return fake_api(request)
+
+        async def run():
+            client = AsyncModeClient(
+                "ws", "t", "p", transport=httpx.MockTransport(handler)
+            )
+            return await client.report.columns("s", max_items=2)
+
+        self.assertEqual(asyncio.run(run()).num_rows, 2)
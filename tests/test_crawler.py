@@ -0,0 +1,226 @@
+import asyncio
+import json
+import re
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+
+import httpx
+from conftest import fixture
+
+from mode_client import (
+    AsyncModeClient,
+    AsyncWorkspaceCrawler,
+    ModeClient,
+    WorkspaceCrawler,
+)
+from mode_client.snapshot import JsonlSnapshot, SnapshotWriter, SqliteSnapshot
+
+
+class Interrupted(Exception):
+    pass
+
+
+class FakeWorkspace:
+    """Two spaces with three reports each; every report has two queries and a
+    latest run with two query runs, plus two definitions."""
+
+    def __init__(self, fail=(), interrupt_after=None):
+        self.fail = set(fail)
+        self.interrupt_after = interrupt_after
+        self.requests = []
+
+    def __call__(self, request):
+        path = request.url.path.replace("/api/ws", "", 1)
+        self.requests.append(path)
+        if self.interrupt_after and len(self.requests) > self.interrupt_after:
+            raise Interrupted(path)
+        if path in self.fail:
+            return httpx.Response(500)
+
+        if path == "/spaces":
+            return self.listing("spaces", "space", ["s1", "s2"])
+        if path == "/definitions":
+            return self.listing("definitions", "definition", ["d1", "d2"])
+        if match := re.fullmatch(r"/spaces/(\w+)/reports", path):
+            space = match.group(1)
+            tokens = [f"{space}r{i}" for i in range(3)]
+            return self.listing(
+                "reports",
+                "report",
+                tokens,
+                last_successful_run_token=lambda token: f"{token}run",
+            )
+        if match := re.fullmatch(r"/reports/(\w+)/queries", path):
+            report = match.group(1)
+            return self.listing("queries", "query", [f"{report}q0", f"{report}q1"])
+        if match := re.fullmatch(r"/reports/(\w+)/runs/(\w+)/query_runs", path):
+            run = match.group(2)
+            return self.listing("query_runs", "query_run", [f"{run}qr0", f"{run}qr1"])
+        if match := re.fullmatch(r"/reports/(\w+)/runs/(\w+)", path):
+            return httpx.Response(
+                200, json={**fixture("report_run"), "token": match[2]}
+            )
+        return httpx.Response(404)
+
+    def listing(self, key, name, tokens, **fields):
+        items = []
+        for token in tokens:
+            item = {**fixture(name), "token": token}
+            for field, value in fields.items():
+                item[field] = value(token)
+            items.append(item)
+
+        return httpx.Response(200, json={"_embedded": {key: items}})
+
+
+EXPECTED = {
+    "space": 2,
+    "report": 6,
+    "query": 12,
+    "report_run": 6,
+    "query_run": 12,
+    "definition": 2,
+}
+
+
+def jsonl_records(path):
+    return [json.loads(line) for line in Path(path).read_text().splitlines()]
+
+
+def count_kinds(records):
+    counts = {}
+    for record in records:
+        counts[record["kind"]] = counts.get(record["kind"], 0) + 1
+    return counts
+
+
+class TestWorkspaceCrawler(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+
+    def crawl(self, workspace, snapshot, **kwargs):
+        client = ModeClient("ws", "t", "p", transport=httpx.MockTransport(workspace))
+        crawler = WorkspaceCrawler(client, snapshot, **kwargs)
+        try:
+            return crawler.run()
+        finally:
+            crawler.snapshot.close()
+
+    def test_crawls_the_workspace(self):
+        path = self.tmp / "snapshot.jsonl"
+        reports = []
+        progress = self.crawl(
+            FakeWorkspace(), path, concurrency=4, on_progress=reports.append
+        )
+
+        records = jsonl_records(path)
+        self.assertEqual(count_kinds(records), EXPECTED)
+        self.assertEqual(progress.records, sum(EXPECTED.values()))
+        self.assertEqual(progress.done, 22)
+        self.assertEqual(progress.pending, 0)
+        self.assertTrue(progress.ok)
+        self.assertIs(reports[-1], progress)
+        self.assertIn("22 tasks done", str(progress))
+
+        query_run = next(r for r in records if r["kind"] == "query_run")
+        self.assertTrue(query_run["parent"].endswith("run"))
+        self.assertNotIn("_links", query_run["data"])
+
+    def test_options(self):
+        path = self.tmp / "snapshot.jsonl"
+        self.crawl(FakeWorkspace(), path, definitions=False, runs=False)
+        self.assertEqual(
+            count_kinds(jsonl_records(path)), {"space": 2, "report": 6, "query": 12}
+        )
+
+    def test_errors_are_retried_on_resume(self):
+        path = self.tmp / "snapshot.jsonl"
+        progress = self.crawl(FakeWorkspace(fail={"/reports/s1r0/queries"}), path)
+
+        self.assertEqual(list(progress.errors), ["queries/s1r0"])
+        self.assertEqual(progress.records, sum(EXPECTED.values()) - 2)
+
+        workspace = FakeWorkspace()
+        progress = self.crawl(workspace, path)
+        self.assertTrue(progress.resumed)
+        self.assertEqual(workspace.requests, ["/reports/s1r0/queries"])
+        self.assertEqual(count_kinds(jsonl_records(path)), EXPECTED)
+
+    def test_interrupted_crawls_resume_without_duplicates(self):
+        for name in ("snapshot.jsonl", "snapshot.sqlite"):
+            with self.subTest(name):
+                path = self.tmp / name
+                with self.assertRaises(Interrupted):
+                    self.crawl(FakeWorkspace(interrupt_after=10), path, concurrency=2)
+
+                workspace = FakeWorkspace()
+                progress = self.crawl(workspace, path, concurrency=2)
+                self.assertTrue(progress.resumed)
+                self.assertLess(len(workspace.requests), 22)
+
+                if name.endswith(".jsonl"):
+                    records = jsonl_records(path)
+                    keys = [(r["kind"], r["token"]) for r in records]
+                    self.assertEqual(len(keys), len(set(keys)))
+                else:
+                    db = sqlite3.connect(path)
+                    rows = db.execute("SELECT kind, token FROM records").fetchall()
+                    records = [{"kind": kind} for kind, _ in rows]
+                    db.close()
+                self.assertEqual(count_kinds(records), EXPECTED)
+
+    def test_finished_crawls_do_nothing(self):
+        path = self.tmp / "snapshot.sqlite"
+        self.crawl(FakeWorkspace(), path)
+
+        workspace = FakeWorkspace()
+        progress = self.crawl(workspace, path)
+        self.assertEqual(workspace.requests, [])
+        self.assertEqual(progress.done, 0)
+
+
+class TestSnapshots(unittest.TestCase):
+    def test_writer_is_abstract(self):
+        with self.assertRaises(TypeError):
+            SnapshotWriter()
+
+    def test_jsonl_truncates_uncommitted_records(self):
+        path = Path(tempfile.mkdtemp()) / "snapshot.jsonl"
+        with JsonlSnapshot(path) as snapshot:
+            self.assertIsNone(snapshot.pending())
+        with open(path, "a") as f:
+            f.write('{"kind": "space", "tok')
+
+        with JsonlSnapshot(path) as snapshot:
+            self.assertEqual(snapshot.pending(), [])
+        self.assertEqual(path.read_text(), "")
+
+    def test_sqlite_pending(self):
+        path = Path(tempfile.mkdtemp()) / "snapshot.db"
+        with SqliteSnapshot(path) as snapshot:
+            self.assertIsNone(snapshot.pending())
+
+
+class TestAsyncWorkspaceCrawler(unittest.TestCase):
+    def test_crawls_the_workspace(self):
+        workspace = FakeWorkspace()
+        path = Path(tempfile.mkdtemp()) / "snapshot.jsonl"
+
+        async def handler(request):
+            return workspace(request)
+
+        async def run():
+            client = AsyncModeClient(
+                "ws", "t", "p", transport=httpx.MockTransport(handler)
+            )
+            crawler = AsyncWorkspaceCrawler(client, path, concurrency=3)
+            try:
+                return await crawler.run()
+            finally:
+                crawler.snapshot.close()
+
+        progress = asyncio.run(run())
+        self.assertEqual(progress.records, sum(EXPECTED.values()))
+        self.assertEqual(count_kinds(jsonl_records(path)), EXPECTED)
@@ -0,0 +1,218 @@
+import importlib.util
+import json
+import unittest
+from unittest import mock
+
+import httpx
+from conftest import fixture, fixture_bytes
+from pydantic import ValidationError
+
+from mode_client import MemoryCache, ModeClient
+from mode_client.decoders import (
+    DECODERS,
+    JsonDecoder,
+    MsgspecDecoder,
+    OrjsonDecoder,
+    get_decoder,
+)
+from mode_client.models import (
+    Account,
+    Definition,
+    Query,
+    QueryRun,
+    Report,
+    ReportRun,
+    Space,
+    TimedReportRun,
+)
+
+HAS_ORJSON = importlib.util.find_spec("orjson") is not None
+HAS_MSGSPEC = importlib.util.find_spec("msgspec") is not None
+MODELS = {
+    "account": Account,
+    "definition": Definition,
+    "query": Query,
+    "query_run": QueryRun,
+    "report": Report,
+    "report_run": ReportRun,
+    "space": Space,
+}
+
+
+def installed_decoders():
+    yield JsonDecoder()
+    if HAS_ORJSON:
+        yield OrjsonDecoder()
+    if HAS_MSGSPEC:
+        yield MsgspecDecoder()
+
+
+class Missing(JsonDecoder):
+    def __init__(self):
+        raise ImportError("missing")
+
+
+class TestGetDecoder(unittest.TestCase):
+    def test_by_name(self):
+        self.assertIs(type(get_decoder()), JsonDecoder)
+        for decoder in installed_decoders():
+            self.assertIs(type(get_decoder(decoder.name)), type(decoder))
+
+    def test_instances_pass_through(self):
+        decoder = JsonDecoder()
+        self.assertIs(get_decoder(decoder), decoder)
+
+    def test_auto_picks_the_fastest_installed(self):
+        with mock.patch.dict(DECODERS, {"msgspec": Missing}):
+            expected = "orjson" if HAS_ORJSON else "json"
+            self.assertEqual(get_decoder("auto").name, expected)
+
+        with mock.patch.dict(DECODERS, {"msgspec": Missing, "orjson": Missing}):
+            self.assertEqual(get_decoder("auto").name, "json")
+
+    def test_missing_backend_falls_back(self):
+        with mock.patch.dict(DECODERS, {"orjson": Missing}):
+            with self.assertWarns(RuntimeWarning):
+                decoder = get_decoder("orjson")
+        self.assertIs(type(decoder), JsonDecoder)
+
+
+class TestDecode(unittest.TestCase):
+    def test_backends_agree(self):
+        for decoder in installed_decoders():
+            for name in MODELS:
+                with self.subTest(decoder=decoder.name, fixture=name):
+                    content = fixture_bytes(name)
+                    self.assertEqual(decoder.decode(content), json.loads(content))
+
+    @unittest.skipUnless(HAS_MSGSPEC, "requires msgspec")
+    def test_decode_model_matches_pydantic(self):
+        decoder = MsgspecDecoder()
+        for name, model in MODELS.items():
+            with self.subTest(name):
+                content = fixture_bytes(name)
+                decoded = decoder.decode_model(content, model)
+
+                self.assertIsInstance(decoded, model)
+                self.assertEqual(decoded, model.parse_raw(content))
+
+    @unittest.skipUnless(HAS_MSGSPEC, "requires msgspec")
+    def test_decode_models_and_timed_models(self):
+        run = json.loads(fixture_bytes("report_run"))
+        content = json.dumps({"_embedded": {"report_runs": [run, run]}})
+        runs = MsgspecDecoder().decode_models(content, TimedReportRun, "report_runs")
+
+        self.assertEqual(len(runs), 2)
+        self.assertEqual(runs[0], TimedReportRun.parse_obj(run))
+
+    @unittest.skipUnless(HAS_MSGSPEC, "requires msgspec")
+    def test_int_ids_are_coerced_as_pydantic_does(self):
+        decoder = MsgspecDecoder()
+        for name, model in (("query", Query), ("query_run", QueryRun)):
+            with self.subTest(name):
+                data = json.loads(fixture_bytes(name))
+                content = json.dumps({**data, "id": 18230194, "data_source_id": 71842})
+                decoded = decoder.decode_model(content, model)
+
+                self.assertEqual(decoded, model.parse_raw(content))
+                self.assertEqual(decoded.data_source_id, "71842")
+
+                listing = json.dumps({"_embedded": {"items": [json.loads(content)]}})
+                [item] = decoder.decode_models(listing, model, "items")
+                self.assertEqual(item, decoded)
+
+    @unittest.skipUnless(HAS_MSGSPEC, "requires msgspec")
+    def test_invalid_documents_are_rejected(self):
+        import msgspec
+
+        data = {**json.loads(fixture_bytes("space")), "id": "not a number"}
+        with self.assertRaises(msgspec.ValidationError):
+            MsgspecDecoder().decode_model(json.dumps(data), Space)
+
+
+def fake_api(request):
+    if request.url.path.endswith("/text"):
+        return httpx.Response(200, text="not json")
+    return httpx.Response(200, content=fixture_bytes("report"))
+
+
+class TestClientDecoder(unittest.TestCase):
+    def test_clients_use_the_decoder(self):
+        for decoder in installed_decoders():
+            with self.subTest(decoder.name):
+                client = ModeClient(
+                    "ws",
+                    "t",
+                    "p",
+                    transport=httpx.MockTransport(fake_api),
+                    json_decoder=decoder.name,
+                )
+
+                self.assertIs(type(client.report.decoder), type(decoder))
+                self.assertEqual(
+                    client.report.get("r"), Report.parse_raw(fixture_bytes("report"))
+                )
+                self.assertEqual(client.report.request("GET", "/text"), "not json")
+
+
+def paged_api(request):
+    page = int(request.url.params.get("page", 1))
+    return httpx.Response(
+        200,
+        json={
+            "_embedded": {"queries": [{**fixture("query"), "token": f"q{page}"}]},
+            "pagination": {
+                "page": page,
+                "per_page": 1,
+                "count": 1,
+                "total_pages": 2,
+                "total_count": 2,
+            },
+        },
+    )
+
+
+@unittest.skipUnless(HAS_MSGSPEC, "requires msgspec")
+class TestTypedClientDecoding(unittest.TestCase):
+    def client(self, handler, **kwargs):
+        return ModeClient(
+            "ws",
+            "t",
+            "p",
+            transport=httpx.MockTransport(handler),
+            json_decoder="msgspec",
+            **kwargs,
+        )
+
+    def test_listings_skip_pydantic(self):
+        client = self.client(paged_api)
+        with mock.patch("mode_client.clients.parse_obj_as") as parse_obj_as:
+            queries = list(client.query.iter_queries("r"))
+
+        parse_obj_as.assert_not_called()
+        self.assertEqual([query.token for query in queries], ["q1", "q2"])
+        expected = Query.parse_obj({**fixture("query"), "token": "q1"})
+        self.assertEqual(queries[0], expected)
+        self.assertEqual(queries[0].data_source_id, "71842")
+
+    def test_entities_skip_pydantic(self):
+        client = self.client(fake_api)
+        with mock.patch.object(Report, "parse_obj") as parse_obj:
+            report = client.report.get("r")
+
+        parse_obj.assert_not_called()
+        self.assertEqual(report, Report.parse_raw(fixture_bytes("report")))
+
+    def test_invalid_documents_fall_back_to_pydantic(self):
+        def handler(request):
+            return httpx.Response(200, json={**fixture("space"), "id": "x"})
+
+        with self.assertRaises(ValidationError):
+            self.client(handler).space.get("s")
+
+    def test_cached_clients_decode_dicts(self):
+        client = self.client(fake_api, cache=MemoryCache())
+        for _ in range(2):
+            self.assertEqual(
+                client.report.get("r"), Report.parse_raw(fixture_bytes("report"))
+            )
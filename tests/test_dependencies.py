@@ -0,0 +1,150 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from conftest import fixture
+
+from mode_client.dependencies import DependencyGraph, definition_references
+from mode_client.models import Definition
+from mode_client.snapshot import SnapshotRecord, SqliteSnapshot, Task
+from mode_client.sync import SyncStore
+
+
+def definition(token, name, source="SELECT 1"):
+    return {**fixture("definition"), "token": token, "name": name, "source": source}
+
+
+def query(token, raw_query):
+    return {**fixture("query"), "token": token, "raw_query": raw_query}
+
+
+def report(token, schedules_count=0):
+    return {**fixture("report"), "token": token, "schedules_count": schedules_count}
+
+
+class TestDefinitionReferences(unittest.TestCase):
+    def test_references(self):
+        sql = """
+        -- {{ @retired }} is no longer used
+        SELECT * FROM {{ @Active_Users }} u JOIN {{@orders}} AS o USING (id)
+        WHERE u.plan = '{{ plan }}'
+        """
+        self.assertEqual(definition_references(sql), {"active_users", "orders"})
+        self.assertEqual(definition_references(None), set())
+
+
+class TestDependencyGraph(unittest.TestCase):
+    def setUp(self):
+        self.graph = DependencyGraph()
+        self.graph.add_definitions(
+            [
+                definition("d1", "Active Users"),
+                definition("d2", "paying_users", "SELECT * FROM {{ @active_users }}"),
+                definition("d3", "orders"),
+            ]
+        )
+        self.graph.add_queries(
+            [
+                query("q1", "SELECT * FROM {{ @active_users }}"),
+                query("q2", "SELECT * FROM {{ @paying_users }} JOIN {{ @orders }}"),
+            ],
+            report="r1",
+        )
+        self.graph.add_query(query("q3", "SELECT * FROM {{ @orders }}"), "r2")
+        self.graph.add_report(report("r1", schedules_count=2))
+        self.graph.add_report(report("r2"))
+
+    def test_transitive_impact(self):
+        impact = self.graph.impact("d1")
+        self.assertEqual(impact.definitions, {"d2"})
+        self.assertEqual(impact.queries, {"q1", "q2"})
+        self.assertEqual(impact.reports, {"r1"})
+        self.assertEqual(impact.scheduled_reports, {"r1"})
+
+        impact = self.graph.impact("orders")
+        self.assertEqual(impact.queries, {"q2", "q3"})
+        self.assertEqual(impact.reports, {"r1", "r2"})
+        self.assertEqual(impact.scheduled_reports, {"r1"})
+
+    def test_impact_is_cached_until_a_change(self):
+        impact = self.graph.impact("d3")
+        self.assertIs(self.graph.impact("d3"), impact)
+
+        self.graph.add_query(query("q3", "SELECT 1"), "r2")
+        self.assertEqual(self.graph.impact("d3").reports, {"r1"})
+
+    def test_references_of(self):
+        self.assertEqual(self.graph.references("query", "q2"), {"d2", "d3"})
+        self.assertEqual(self.graph.references("definition", "d2"), {"d1"})
+
+    def test_removals(self):
+        self.graph.remove_report("r1")
+        self.assertEqual(self.graph.impact("d1").queries, frozenset())
+        self.assertEqual(self.graph.impact("d3").reports, {"r2"})
+
+        self.graph.remove_definition("d2")
+        self.graph.add_query(query("q4", "SELECT * FROM {{ @paying_users }}"), "r3")
+        with self.assertRaises(KeyError):
+            self.graph.impact("paying_users")
+
+        # Queries referencing a definition added later are picked up.
+        self.graph.add_definition(
+            Definition.parse_obj(definition("d4", "paying_users"))
+        )
+        self.assertEqual(self.graph.impact("d4").reports, {"r3"})
+
+    def test_ambiguous_names(self):
+        self.graph.add_definition(definition("d5", "orders"))
+        with self.assertRaises(ValueError):
+            self.graph.impact("orders")
+        self.assertEqual(self.graph.impact("d5").queries, {"q2", "q3"})
+
+
+class TestFromStores(unittest.TestCase):
+    def test_from_snapshot(self):
+        path = Path(tempfile.mkdtemp()) / "snapshot.db"
+        with SqliteSnapshot(path) as snapshot:
+            snapshot.commit(
+                Task("definitions"),
+                [SnapshotRecord("definition", "d1", None, definition("d1", "users"))],
+                [],
+            )
+            snapshot.commit(
+                Task("reports", ("s1",)),
+                [SnapshotRecord("report", "r1", "s1", report("r1", 1))],
+                [],
+            )
+            snapshot.commit(
+                Task("queries", ("r1",)),
+                [SnapshotRecord("query", "q1", "r1", query("q1", "{{ @users }}"))],
+                [],
+            )
+
+        impact = DependencyGraph.from_snapshot(path).impact("users")
+        self.assertEqual(impact.scheduled_reports, {"r1"})
+
+    def test_apply_sync_deltas(self):
+        store = SyncStore(Path(tempfile.mkdtemp()) / "store.db")
+        self.addCleanup(store.close)
+        graph = DependencyGraph()
+
+        store.commit(
+            Task("definitions"),
+            [SnapshotRecord("definition", "d1", None, definition("d1", "users"))],
+            [],
+        )
+        store.commit(
+            Task("queries", ("r1",)),
+            [SnapshotRecord("query", "q1", "r1", query("q1", "{{ @users }}"))],
+            [],
+        )
+        last = graph.apply(store.deltas())
+        self.assertEqual(graph.impact("d1").queries, {"q1"})
+
+        store.commit(
+            Task("queries", ("r1",)),
+            [SnapshotRecord("query", "q2", "r1", query("q2", "{{ @users }}"))],
+            [],
+        )
+        graph.apply(store.deltas(last))
+        self.assertEqual(graph.impact("d1").queries, {"q2"})
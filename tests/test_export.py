@@ -0,0 +1,148 @@
+import asyncio
+import json
+import re
+import tempfile
+import unittest
+from pathlib import Path
+
+import httpx
+from conftest import fixture
+
+from mode_client import AsyncModeClient, ModeClient
+
+QUERY_RUN = fixture("query_run")
+
+RESULTS = {"qr1": b"id,name\n1,alpha\n2,beta\n", "qr2": b"id\n" + b"7\n" * 1000}
+STATES = {"qr1": "succeeded", "qr2": "succeeded", "qr3": "failed"}
+
+
+class FakeApi:
+    def __init__(self, honor_range=True, missing=()):
+        self.honor_range = honor_range
+        self.missing = set(missing)
+        self.requests = []
+
+    def __call__(self, request):
+        self.requests.append(request)
+        path = request.url.path
+        if path.endswith("/query_runs"):
+            query_runs = [
+                {**QUERY_RUN, "token": token, "state": state}
+                for token, state in STATES.items()
+            ]
+            return httpx.Response(200, json={"_embedded": {"query_runs": query_runs}})
+
+        token = re.search(r"/query_runs/(\w+)/results/", path).group(1)
+        if token in self.missing:
+            return httpx.Response(404)
+
+        body = RESULTS[token]
+        match = re.match(r"bytes=(\d+)-", request.headers.get("Range", ""))
+        if match and self.honor_range:
+            offset = int(match.group(1))
+            if offset >= len(body):
+                return httpx.Response(416)
+            return httpx.Response(206, content=body[offset:])
+        return httpx.Response(200, content=body)
+
+    def result_requests(self):
+        return [r for r in self.requests if "/results/" in r.url.path]
+
+
+class TestExportResults(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dest = Path(self.tmp.name) / "export"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def export(self, api, **kwargs):
+        client = ModeClient(
+            "ws", "token", "password", transport=httpx.MockTransport(api)
+        )
+        return client.report_run.export_results("r", "run", self.dest, **kwargs)
+
+    def assert_exported(self):
+        for token, body in RESULTS.items():
+            self.assertEqual((self.dest / f"{token}.csv").read_bytes(), body)
+        self.assertEqual(list(self.dest.glob("*.part")), [])
+
+    def test_exports_every_succeeded_query_run(self):
+        manifest = self.export(FakeApi(), concurrency=2)
+
+        self.assertTrue(manifest.ok)
+        self.assert_exported()
+        self.assertEqual(list(manifest.results), ["qr1", "qr2"])
+        self.assertEqual(manifest.skipped, {"qr3": "failed"})
+        self.assertEqual(manifest.bytes, sum(map(len, RESULTS.values())))
+
+        written = json.loads((self.dest / "manifest.json").read_text())
+        self.assertEqual(written["bytes"], manifest.bytes)
+        self.assertEqual(
+            [(r["query_run"], r["bytes"]) for r in written["results"]],
+            [("qr1", len(RESULTS["qr1"])), ("qr2", len(RESULTS["qr2"]))],
+        )
+
+    def test_resumes_partial_downloads(self):
+        self.dest.mkdir()
+        (self.dest / "qr2.csv.part").write_bytes(RESULTS["qr2"][:100])
+        api = FakeApi()
+        manifest = self.export(api)
+
+        self.assert_exported()
+        self.assertEqual(manifest.results["qr2"].resumed_from, 100)
+        self.assertEqual(manifest.results["qr2"].downloaded, len(RESULTS["qr2"]) - 100)
+        ranges = [r.headers.get("Range") for r in api.result_requests()]
+        self.assertIn("bytes=100-", ranges)
+
+    def test_restarts_when_range_is_ignored_or_unsatisfiable(self):
+        for api, partial in ((FakeApi(honor_range=False), 5), (FakeApi(), 10_000)):
+            with self.subTest(partial=partial):
+                self.dest.mkdir(exist_ok=True)
+                for path in self.dest.glob("*.csv"):
+                    path.unlink()
+                (self.dest / "qr2.csv.part").write_bytes(b"x" * partial)
+                manifest = self.export(api)
+
+                self.assert_exported()
+                self.assertEqual(manifest.results["qr2"].resumed_from, 0)
+
+    def test_reuses_complete_files(self):
+        self.dest.mkdir()
+        (self.dest / "qr1.csv").write_bytes(RESULTS["qr1"])
+        api = FakeApi()
+        manifest = self.export(api)
+
+        self.assertTrue(manifest.results["qr1"].reused)
+        self.assertEqual(
+            [r.url.path.split("/")[-3] for r in api.result_requests()], ["qr2"]
+        )
+
+    def test_failures_are_reported_per_query_run(self):
+        manifest = self.export(FakeApi(missing={"qr1"}))
+
+        self.assertFalse(manifest.ok)
+        self.assertIsInstance(manifest.errors["qr1"], httpx.HTTPStatusError)
+        self.assertEqual(list(manifest.results), ["qr2"])
+        self.assertFalse((self.dest / "qr1.csv").exists())
+
+    def test_async(self):
+        api = FakeApi()
+
+        async def handler(request):
+            return api(request)
+
+        async def run():
+            client = AsyncModeClient(
+                "ws", "token", "password", transport=httpx.MockTransport(handler)
+            )
+            return await client.report_run.export_results("r", "run", self.dest)
+
+        self.dest.mkdir()
+        (self.dest / "qr2.csv.part").write_bytes(RESULTS["qr2"][:100])
+        manifest = asyncio.run(run())
+
+        self.assert_exported()
+        self.assertEqual(manifest.results["qr2"].resumed_from, 100)
+        self.assertEqual(manifest.skipped, {"qr3": "failed"})
@@ -0,0 +1,263 @@
+import asyncio
+import io
+import unittest
+
+import httpx
+from conftest import fixture
+
+from mode_client import AsyncModeClient, MemoryCache, ModeClient, RetryPolicy
+from mode_client.instrumentation import (
+    Histogram,
+    Instrumentation,
+    prometheus_text,
+    trace_requests,
+)
+from mode_client.stats import last_request_stats
+
+try:
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+        InMemorySpanExporter,
+    )
+except ImportError:  # pragma: no cover
+    TracerProvider = None
+
+
+def report_run_handler(request):
+    return httpx.Response(200, json=fixture("report_run"))
+
+
+class Recorder:
+    def __init__(self, instrumentation):
+        self.events = []
+        for event in ("request", "response", "retry", "cache_hit", "parse"):
+            instrumentation.on(event, self)
+
+    def __call__(self, event, stats):
+        self.events.append((event, stats.template, stats.retries))
+
+
+class TestHistogram(unittest.TestCase):
+    def test_buckets_and_quantiles(self):
+        histogram = Histogram((0.1, 1.0, 10.0))
+        for value in (0.05, 0.1, 0.5, 2.0, 20.0):
+            histogram.observe(value)
+
+        self.assertEqual(histogram.counts, [2, 1, 1, 1])
+        self.assertEqual(histogram.count, 5)
+        self.assertAlmostEqual(histogram.mean, 22.65 / 5)
+        self.assertEqual(histogram.quantile(0.4), 0.1)
+        self.assertEqual(histogram.quantile(0.6), 1.0)
+        self.assertEqual(histogram.quantile(1.0), 20.0)
+        self.assertEqual(Histogram((1.0,)).quantile(0.5), 0.0)
+
+
+class TestClientInstrumentation(unittest.TestCase):
+    def client(self, handler, **kwargs):
+        return ModeClient(
+            "ws", "t", "p", transport=httpx.MockTransport(handler), **kwargs
+        )
+
+    def test_events_and_metrics(self):
+        instrumentation = Instrumentation()
+        recorder = Recorder(instrumentation)
+        client = self.client(report_run_handler, instrumentation=instrumentation)
+
+        client.report_run.get("r1", "run1")
+        client.report_run.get("r2", "run2")
+
+        template = "/reports/{report}/runs/{run}"
+        self.assertEqual(
+            recorder.events[:3],
+            [
+                ("request", template, 0),
+                ("response", template, 0),
+                ("parse", template, 0),
+            ],
+        )
+        stats = last_request_stats()
+        self.assertEqual(stats.resource, "/reports/r2/runs/run2")
+        self.assertGreater(stats.response_bytes, 0)
+        self.assertGreater(stats.parse_time, 0)
+
+        metrics = instrumentation.metrics
+        for name in ("request_seconds", "queue_wait_seconds", "parse_seconds"):
+            self.assertEqual(metrics.histogram(name, template).count, 2)
+        self.assertEqual(
+            metrics.histogram("response_bytes", template).sum,
+            2 * stats.response_bytes,
+        )
+        self.assertEqual(
+            metrics.counters["requests_total", ("GET", template, "200")], 2
+        )
+        self.assertEqual(
+            metrics.summary()["request_seconds"][f"GET {template}"]["count"], 2
+        )
+
+    def test_retries(self):
+        responses = iter([httpx.Response(503), httpx.Response(503)])
+
+        def handler(request):
+            return next(responses, None) or report_run_handler(request)
+
+        instrumentation = Instrumentation()
+        recorder = Recorder(instrumentation)
+        client = self.client(
+            handler,
+            instrumentation=instrumentation,
+            retry=RetryPolicy(backoff=0.001, jitter=False),
+        )
+        client.report_run.get("r1", "run1")
+
+        events = [(event, retries) for event, _, retries in recorder.events]
+        self.assertEqual(
+            events,
+            [("request", 0), ("retry", 1), ("retry", 2), ("response", 2), ("parse", 2)],
+        )
+        template = "/reports/{report}/runs/{run}"
+        self.assertEqual(
+            instrumentation.metrics.counters["retries_total", ("GET", template)], 2
+        )
+
+    def test_cache_hits(self):
+        instrumentation = Instrumentation()
+        recorder = Recorder(instrumentation)
+        client = self.client(
+            report_run_handler, instrumentation=instrumentation, cache=MemoryCache()
+        )
+        client.report_run.get("r1", "run1")
+        recorder.events.clear()
+        client.report_run.get("r1", "run1")
+
+        self.assertEqual(
+            [event for event, _, _ in recorder.events],
+            ["request", "cache_hit", "parse"],
+        )
+
+    def test_failed_requests_are_reported(self):
+        def handler(request):
+            raise httpx.ConnectError("down")
+
+        instrumentation = Instrumentation()
+        recorder = Recorder(instrumentation)
+        client = self.client(handler, instrumentation=instrumentation)
+        with self.assertRaises(httpx.ConnectError):
+            client.space.get("s1")
+
+        self.assertEqual(
+            [event for event, _, _ in recorder.events], ["request", "response"]
+        )
+        self.assertIn('status="None"', prometheus_text(instrumentation.metrics))
+
+    def test_streamed_results(self):
+        content = b"id,name\n" + b"1,alpha\n" * 1000
+
+        def handler(request):
+            # A stream, not content, so the body is downloaded as it's read.
+            return httpx.Response(200, stream=httpx.ByteStream(content))
+
+        instrumentation = Instrumentation()
+        recorder = Recorder(instrumentation)
+        client = self.client(handler, instrumentation=instrumentation)
+        client.query_run.stream_results("r", "run", "qr", io.BytesIO())
+        rows = list(client.query_run.iter_result_rows("r", "run", "qr"))
+
+        template = (
+            "/reports/{report}/runs/{run}/query_runs/{query_run}"
+            "/results/content.{format}"
+        )
+        self.assertEqual(len(rows), 1000)
+        self.assertEqual(
+            recorder.events, [("request", template, 0), ("response", template, 0)] * 2
+        )
+        histogram = instrumentation.metrics.histogram("response_bytes", template)
+        self.assertEqual(histogram.sum, 2 * len(content))
+        self.assertEqual(
+            instrumentation.metrics.counters[
+                "requests_total", ("GET", template, "200")
+            ],
+            2,
+        )
+
+    def test_hooks_without_metrics(self):
+        instrumentation = Instrumentation(metrics=False)
+        recorder = Recorder(instrumentation)
+        self.client(report_run_handler, instrumentation=instrumentation).report_run.get(
+            "r1", "run1"
+        )
+        self.assertEqual(len(recorder.events), 3)
+        self.assertIsNone(instrumentation.metrics)
+
+        instrumentation.off("parse", recorder)
+        self.client(report_run_handler, instrumentation=instrumentation).report_run.get(
+            "r1", "run1"
+        )
+        self.assertEqual(len(recorder.events), 5)
+
+    def test_async_events(self):
+        async def handler(request):
+            return report_run_handler(request)
+
+        instrumentation = Instrumentation()
+        recorder = Recorder(instrumentation)
+
+        async def get():
+            client = AsyncModeClient(
+                "ws",
+                "t",
+                "p",
+                transport=httpx.MockTransport(handler),
+                instrumentation=instrumentation,
+            )
+            await client.report_run.get("r1", "run1")
+            async for _ in client.query_run.iter_result_rows("r", "run", "qr"):
+                pass
+
+        asyncio.run(get())
+        self.assertEqual(
+            [event for event, _, _ in recorder.events],
+            ["request", "response", "parse", "request", "response"],
+        )
+
+
+class TestAdapters(unittest.TestCase):
+    def setUp(self):
+        self.instrumentation = Instrumentation()
+        self.client = ModeClient(
+            "ws",
+            "t",
+            "p",
+            transport=httpx.MockTransport(report_run_handler),
+            instrumentation=self.instrumentation,
+        )
+
+    def test_prometheus_text(self):
+        self.client.report_run.get("r1", "run1")
+        text = prometheus_text(self.instrumentation.metrics)
+
+        labels = 'method="GET",endpoint="/reports/{report}/runs/{run}"'
+        self.assertIn("# TYPE mode_client_request_seconds histogram", text)
+        self.assertIn(
+            f'mode_client_request_seconds_bucket{{{labels},le="+Inf"}} 1', text
+        )
+        self.assertIn(f"mode_client_parse_seconds_count{{{labels}}} 1", text)
+        self.assertIn(f'mode_client_requests_total{{{labels},status="200"}} 1', text)
+        self.assertNotIn("retries_total", text)
+
+    @unittest.skipIf(TracerProvider is None, "opentelemetry-sdk is not installed")
+    def test_opentelemetry_spans(self):
+        exporter = InMemorySpanExporter()
+        provider = TracerProvider()
+        provider.add_span_processor(SimpleSpanProcessor(exporter))
+        trace_requests(self.instrumentation, provider.get_tracer("test"))
+
+        self.client.report_run.get("r1", "run1")
+
+        request, parse = exporter.get_finished_spans()
+        self.assertEqual(request.name, "GET /reports/{report}/runs/{run}")
+        self.assertEqual(request.attributes["http.status_code"], 200)
+        self.assertEqual(
+            request.attributes["mode_client.resource"], "/reports/r1/runs/run1"
+        )
+        self.assertEqual(parse.name, "parse /reports/{report}/runs/{run}")
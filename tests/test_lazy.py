@@ -0,0 +1,112 @@
+import asyncio
+import json
+import unittest
+
+import httpx
+from conftest import fixture
+
+from mode_client import AsyncModeClient, ModeClient
+from mode_client.lazy import LazyLinks, construct_model
+from mode_client.models import (
+    Account,
+    Definition,
+    Query,
+    QueryRun,
+    Report,
+    ReportRun,
+    ReportRuns,
+    Space,
+)
+
+MODELS = {
+    "account": Account,
+    "definition": Definition,
+    "query": Query,
+    "query_run": QueryRun,
+    "report": Report,
+    "report_run": ReportRun,
+    "space": Space,
+}
+
+
+class TestConstructModel(unittest.TestCase):
+    def test_matches_validated_models(self):
+        for name, model in MODELS.items():
+            with self.subTest(name):
+                data = fixture(name)
+                lazy = construct_model(model, data)
+                validated = model.parse_obj(data)
+
+                self.assertIsInstance(lazy, model)
+                self.assertEqual(lazy, validated)
+                self.assertEqual(lazy.links.self.href, validated.links.self.href)
+                self.assertEqual(
+                    json.loads(lazy.json(by_alias=True)),
+                    json.loads(validated.json(by_alias=True)),
+                )
+
+    def test_links_are_parsed_on_first_access(self):
+        report = construct_model(Report, fixture("report"))
+
+        self.assertIsInstance(report.links, LazyLinks)
+        self.assertIsNone(report.links._parsed)
+        self.assertEqual(
+            report.links.queries.href, fixture("report")["_links"]["queries"]["href"]
+        )
+        self.assertIsNotNone(report.links._parsed)
+
+    def test_nested_lists_and_missing_optionals(self):
+        data = fixture("report_run")
+        del data["purge_started_at"]
+        runs = construct_model(
+            ReportRuns,
+            {
+                "pagination": {
+                    "page": 1,
+                    "per_page": 30,
+                    "count": 1,
+                    "total_pages": 1,
+                    "total_count": 1,
+                },
+                "report_runs": [data],
+            },
+        )
+
+        self.assertEqual(runs.pagination.total_count, 1)
+        self.assertIsInstance(runs.report_runs[0], ReportRun)
+        self.assertIsNone(runs.report_runs[0].purge_started_at)
+
+
+def fake_api(request):
+    if request.url.path.endswith("/reports"):
+        return httpx.Response(200, json={"_embedded": {"reports": [fixture("report")]}})
+    return httpx.Response(200, json=fixture("report"))
+
+
+class TestValidateOption(unittest.TestCase):
+    def test_client_constructs_without_validation(self):
+        client = ModeClient(
+            "ws", "t", "p", transport=httpx.MockTransport(fake_api), validate=False
+        )
+        report = client.report.get("r")
+        [listed] = client.report.list("s")
+
+        for model in (report, listed):
+            self.assertIsInstance(model.links, LazyLinks)
+            self.assertEqual(model, Report.parse_obj(fixture("report")))
+
+    def test_validation_stays_on_by_default(self):
+        client = ModeClient("ws", "t", "p", transport=httpx.MockTransport(fake_api))
+        self.assertNotIsInstance(client.report.get("r").links, LazyLinks)
+
+    def test_async(self):
+        async def handler(request):
+            return fake_api(request)
+
+        async def run():
+            client = AsyncModeClient(
+                "ws", "t", "p", transport=httpx.MockTransport(handler), validate=False
+            )
+            return await client.report.get("r")
+
+        self.assertIsInstance(asyncio.run(run()).links, LazyLinks)
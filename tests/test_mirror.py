@@ -0,0 +1,176 @@
+import re
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+from conftest import fixture
+
+from mode_client import ModeClient, WorkspaceCrawler
+from mode_client.mirror import Mirror
+from mode_client.records import ReportRecord
+from mode_client.snapshot import SnapshotRecord, SqliteSnapshot, Task
+
+NOW = datetime(2022, 9, 30, tzinfo=timezone.utc)
+
+
+class FakeWorkspace:
+    """A space with three reports. Report ``i`` has a query on data source
+    ``ds<i>``; report 0 ran recently, report 1 two months ago and report 2 a
+    year ago."""
+
+    def __init__(self):
+        self.reports = {}
+        for i, ran in enumerate(["2022-09-29T12:00:00Z", "2022-07-30T12:00:00Z"]):
+            self.add_report("s0", f"s0r{i}", f"ds{i}", ran)
+        self.add_report("s0", "s0r2", "ds2", "2021-09-30T12:00:00Z")
+
+    def add_report(self, space, token, data_source, ran):
+        self.reports[token] = {
+            **fixture("report"),
+            "token": token,
+            "space_token": space,
+            "last_successfully_run_at": ran,
+            "last_successful_run_token": f"{token}run",
+            "data_source": data_source,
+        }
+
+    def __call__(self, request):
+        path = request.url.path.replace("/api/ws", "", 1)
+        if path == "/spaces":
+            return self.listing("spaces", [{**fixture("space"), "token": "s0"}])
+        if path == "/definitions":
+            definition = {**fixture("definition"), "data_source_id": "ds0"}
+            return self.listing("definitions", [definition])
+        if match := re.fullmatch(r"/spaces/(\w+)/reports", path):
+            reports = [r for r in self.reports.values() if r["space_token"] == match[1]]
+            reports.sort(key=lambda report: report["updated_at"], reverse=True)
+            return self.listing("reports", reports)
+        if match := re.fullmatch(r"/reports/(\w+)/queries", path):
+            query = {
+                **fixture("query"),
+                "token": f"{match[1]}q",
+                "data_source_id": self.reports[match[1]]["data_source"],
+            }
+            return self.listing("queries", [query])
+        if match := re.fullmatch(r"/reports/\w+/runs/(\w+)/query_runs", path):
+            return self.listing("query_runs", [])
+        if match := re.fullmatch(r"/reports/\w+/runs/(\w+)", path):
+            return httpx.Response(
+                200, json={**fixture("report_run"), "token": match[1]}
+            )
+        return httpx.Response(404)
+
+    def listing(self, key, items):
+        return httpx.Response(200, json={"_embedded": {key: items}})
+
+
+class TestMirror(unittest.TestCase):
+    def setUp(self):
+        self.workspace = FakeWorkspace()
+        self.path = Path(tempfile.mkdtemp()) / "mirror.db"
+        self.client = ModeClient(
+            "ws", "t", "p", transport=httpx.MockTransport(self.workspace)
+        )
+        self.mirror = Mirror(self.path)
+        self.addCleanup(self.mirror.close)
+        self.mirror.refresh(self.client)
+
+    def tokens(self, records):
+        return [record.token for record in records]
+
+    def test_listings(self):
+        self.assertEqual(self.tokens(self.mirror.spaces()), ["s0"])
+        self.assertEqual(
+            self.tokens(self.mirror.reports("s0")), ["s0r0", "s0r1", "s0r2"]
+        )
+        self.assertEqual(self.tokens(self.mirror.queries("s0r1")), ["s0r1q"])
+        self.assertEqual(self.mirror.latest_run("s0r0").token, "s0r0run")
+        self.assertIsNone(self.mirror.latest_run("missing"))
+
+        report = self.mirror.reports("s0")[0]
+        self.assertIsInstance(report, ReportRecord)
+        self.assertIsNone(report.links)
+        self.assertEqual(report.to_model().token, "s0r0")
+
+    def test_data_source_usage(self):
+        self.assertEqual(self.tokens(self.mirror.reports_using("ds1")), ["s0r1"])
+        self.assertEqual(self.tokens(self.mirror.queries_using("ds2")), ["s0r2q"])
+        self.assertEqual(len(self.mirror.definitions_using("ds0")), 1)
+        self.assertEqual(self.mirror.reports_using("ds9"), [])
+
+    def test_int_data_source_ids(self):
+        # Snapshots keep the fields as the API sent them, with int ids.
+        path = Path(tempfile.mkdtemp()) / "snapshot.db"
+        report = fixture("report")
+        query = fixture("query")
+        with SqliteSnapshot(path) as snapshot:
+            snapshot.commit(
+                Task("queries", (report["token"],)),
+                [
+                    SnapshotRecord("report", report["token"], None, report),
+                    SnapshotRecord("query", query["token"], report["token"], query),
+                    SnapshotRecord("definition", "d", None, fixture("definition")),
+                ],
+                [],
+            )
+
+        self.assertIsInstance(query["data_source_id"], int)
+        with Mirror(path) as mirror:
+            for data_source_id in (71842, "71842"):
+                with self.subTest(data_source_id=data_source_id):
+                    reports = mirror.reports_using(data_source_id)
+                    self.assertEqual(self.tokens(reports), [report["token"]])
+                    queries = mirror.queries_using(data_source_id)
+                    self.assertEqual(self.tokens(queries), [query["token"]])
+                    self.assertEqual(queries[0].data_source_id, "71842")
+                    self.assertEqual(len(mirror.definitions_using(data_source_id)), 1)
+
+    def test_stale_reports(self):
+        self.assertEqual(
+            self.tokens(self.mirror.stale_reports(now=NOW)), ["s0r1", "s0r2"]
+        )
+        self.assertEqual(self.tokens(self.mirror.stale_reports(90, now=NOW)), ["s0r2"])
+
+    def test_reports_updated_since(self):
+        since = datetime(2022, 8, 30, 9, 0, tzinfo=timezone.utc)
+        self.assertEqual(len(self.mirror.reports_updated_since(since)), 3)
+        self.assertEqual(self.mirror.reports_updated_since(NOW), [])
+
+    def test_refresh_follows_changes(self):
+        self.workspace.reports["s0r0"].update(
+            data_source="ds9", updated_at="2022-09-01T00:00:00.000Z"
+        )
+        del self.workspace.reports["s0r2"]
+        self.mirror.refresh(self.client, full=True)
+
+        self.assertEqual(self.tokens(self.mirror.reports_using("ds9")), ["s0r0"])
+        self.assertEqual(self.mirror.reports_using("ds0"), [])
+        self.assertEqual(self.tokens(self.mirror.reports("s0")), ["s0r0", "s0r1"])
+        self.assertEqual(self.mirror.queries_using("ds2"), [])
+        self.assertIsNone(self.mirror.latest_run("s0r2"))
+
+    def test_indexed(self):
+        plan = self.mirror._db.execute(
+            "EXPLAIN QUERY PLAN SELECT report_token FROM queries "
+            "WHERE data_source_id = ?",
+            ("ds1",),
+        ).fetchall()
+        self.assertIn("queries_data_source_id", str(plan))
+
+        plan = self.mirror._db.execute(
+            "EXPLAIN QUERY PLAN SELECT token FROM reports "
+            "WHERE last_successfully_run_at < ?",
+            (0,),
+        ).fetchall()
+        self.assertIn("reports_last_successfully_run_at", str(plan))
+
+    def test_indexes_crawled_snapshot(self):
+        path = Path(tempfile.mkdtemp()) / "snapshot.db"
+        with SqliteSnapshot(path) as snapshot:
+            WorkspaceCrawler(self.client, snapshot).run()
+
+        with Mirror(path) as mirror:
+            self.assertEqual(self.tokens(mirror.reports_using("ds0")), ["s0r0"])
+            self.assertEqual(len(mirror.reports()), 3)
@@ -0,0 +1,220 @@
+import asyncio
+import threading
+import time
+import unittest
+
+import httpx
+from conftest import fixture
+
+from mode_client import AsyncModeClient, ModeClient
+from mode_client.pagination import link_resource
+
+REPORT_RUN = fixture("report_run")
+SPACE = fixture("space")
+
+
+def run_page(page, per_page, total_pages):
+    runs = [{**REPORT_RUN, "token": f"run{page}-{i}"} for i in range(per_page)]
+    return {
+        "pagination": {
+            "page": page,
+            "per_page": per_page,
+            "count": per_page,
+            "total_pages": total_pages,
+            "total_count": per_page * total_pages,
+        },
+        "_embedded": {"report_runs": runs},
+    }
+
+
+def runs_handler(requests, total_pages=3):
+    def handler(request):
+        requests.append(request)
+        page = int(request.url.params["page"])
+        per_page = int(request.url.params["per_page"])
+        return httpx.Response(200, json=run_page(page, per_page, total_pages))
+
+    return handler
+
+
+class TestIterRuns(unittest.TestCase):
+    def setUp(self):
+        self.requests = []
+        transport = httpx.MockTransport(runs_handler(self.requests))
+        self.client = ModeClient("ws", "token", "password", transport=transport)
+
+    def test_follows_pagination(self):
+        runs = list(self.client.report_run.iter_runs("r", per_page=2))
+        self.assertEqual(len(runs), 6)
+        self.assertEqual(runs[2].token, "run2-0")
+        self.assertEqual(
+            [dict(r.url.params) for r in self.requests],
+            [
+                {"order": "desc", "order_by": "updated_at", "page": p, "per_page": "2"}
+                for p in ("1", "2", "3")
+            ],
+        )
+
+    def test_max_items_stops_fetching(self):
+        runs = list(self.client.report_run.iter_runs("r", per_page=2, max_items=3))
+        self.assertEqual([r.token for r in runs], ["run1-0", "run1-1", "run2-0"])
+        self.assertEqual(len(self.requests), 2)
+
+    def test_lazy_until_consumed(self):
+        runs = self.client.report_run.iter_runs("r", per_page=2)
+        self.assertEqual(len(self.requests), 0)
+        next(runs)
+        runs.close()
+        self.assertEqual(len(self.requests), 1)
+
+
+class TestPrefetch(unittest.TestCase):
+    def test_prefetch_preserves_order(self):
+        requests = []
+        transport = httpx.MockTransport(runs_handler(requests, total_pages=20))
+        client = ModeClient("ws", "token", "password", transport=transport)
+
+        sequential = [r.token for r in client.report_run.iter_runs("r", per_page=3)]
+        prefetched = [
+            r.token for r in client.report_run.iter_runs("r", per_page=3, prefetch=4)
+        ]
+        self.assertEqual(len(prefetched), 60)
+        self.assertEqual(prefetched, sequential)
+
+    def test_prefetch_respects_max_items(self):
+        requests = []
+        transport = httpx.MockTransport(runs_handler(requests, total_pages=50))
+        client = ModeClient("ws", "token", "password", transport=transport)
+        runs = client.report_run.iter_runs("r", per_page=10, max_items=25, prefetch=8)
+        self.assertEqual(len(list(runs)), 25)
+        self.assertEqual(len(requests), 3)
+
+    def test_prefetch_runs_concurrently(self):
+        lock = threading.Lock()
+        in_flight = []
+        peak = []
+        handler = runs_handler([], total_pages=9)
+
+        def slow_handler(request):
+            with lock:
+                in_flight.append(request)
+                peak.append(len(in_flight))
+            time.sleep(0.02)
+            with lock:
+                in_flight.remove(request)
+            return handler(request)
+
+        client = ModeClient(
+            "ws", "token", "password", transport=httpx.MockTransport(slow_handler)
+        )
+        runs = list(client.report_run.iter_runs("r", per_page=1, prefetch=4))
+        self.assertEqual(len(runs), 9)
+        self.assertGreater(max(peak), 1)
+        self.assertLessEqual(max(peak), 4)
+
+    def test_prefetch_falls_back_without_pagination(self):
+        client = ModeClient(
+            "ws",
+            "token",
+            "password",
+            transport=httpx.MockTransport(
+                lambda request: httpx.Response(
+                    200, json={"_embedded": {"spaces": [SPACE]}}
+                )
+            ),
+        )
+        self.assertEqual(len(list(client.space.iter_spaces(prefetch=4))), 1)
+
+    def test_async_prefetch(self):
+        sync_handler = runs_handler([], total_pages=12)
+
+        async def handler(request):
+            await asyncio.sleep(0)
+            return sync_handler(request)
+
+        client = AsyncModeClient(
+            "ws", "token", "password", transport=httpx.MockTransport(handler)
+        )
+
+        async def collect():
+            runs = client.report_run.iter_runs("r", per_page=2, prefetch=3)
+            return [run.token async for run in runs]
+
+        tokens = asyncio.run(collect())
+        self.assertEqual(len(tokens), 24)
+        self.assertEqual(tokens[:3], ["run1-0", "run1-1", "run2-0"])
+        self.assertEqual(tokens[-1], "run12-1")
+
+
+class TestLinkPagination(unittest.TestCase):
+    def test_follows_next_links(self):
+        requests = []
+
+        def handler(request):
+            requests.append(str(request.url))
+            page = int(request.url.params.get("page", 1))
+            links = {"self": {"href": "/api/ws/spaces"}}
+            if page < 2:
+                links["next"] = {"href": "/api/ws/spaces?filter=all&page=2"}
+            body = {
+                "_links": links,
+                "_embedded": {"spaces": [{**SPACE, "token": f"s{page}"}]},
+            }
+            return httpx.Response(200, json=body)
+
+        client = ModeClient(
+            "ws", "token", "password", transport=httpx.MockTransport(handler)
+        )
+        spaces = list(client.space.iter_spaces("all"))
+        self.assertEqual([s.token for s in spaces], ["s1", "s2"])
+        self.assertEqual(
+            requests[1], "https://app.mode.com/api/ws/spaces?filter=all&page=2"
+        )
+
+    def test_single_page_without_pagination(self):
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, json={"_embedded": {"spaces": [SPACE]}})
+
+        client = ModeClient(
+            "ws", "token", "password", transport=httpx.MockTransport(handler)
+        )
+        self.assertEqual(len(list(client.space.iter_spaces())), 1)
+        self.assertEqual(len(requests), 1)
+
+    def test_link_resource(self):
+        self.assertEqual(
+            link_resource("/api/ws/reports/r/runs?page=2", "/ws"),
+            "/reports/r/runs?page=2",
+        )
+        self.assertEqual(
+            link_resource("https://app.mode.com/api/ws/spaces", "/ws"), "/spaces"
+        )
+        self.assertEqual(link_resource("/api/account", ""), "/account")
+
+
+class TestAsyncIterRuns(unittest.TestCase):
+    def test_async_iteration(self):
+        requests = []
+        sync_handler = runs_handler(requests)
+
+        async def handler(request):
+            return sync_handler(request)
+
+        client = AsyncModeClient(
+            "ws", "token", "password", transport=httpx.MockTransport(handler)
+        )
+
+        async def collect():
+            return [
+                run.token
+                async for run in client.report_run.iter_runs(
+                    "r", per_page=2, max_items=5
+                )
+            ]
+
+        tokens = asyncio.run(collect())
+        self.assertEqual(len(tokens), 5)
+        self.assertEqual(len(requests), 3)
@@ -0,0 +1,225 @@
+import asyncio
+import itertools
+import unittest
+
+import httpx
+from conftest import fixture
+
+from mode_client import AsyncModeClient, MemoryCache, ModeClient
+from mode_client.models import ReportRun
+from mode_client.polling import (
+    AsyncRunWaiter,
+    PollPolicy,
+    RunSchedule,
+    RunWaiter,
+    WaitTimeout,
+)
+
+REPORT = fixture("report")
+REPORT_RUN = fixture("report_run")
+
+FAST = PollPolicy(initial=0.001, min_interval=0, max_interval=0.01)
+
+
+def report_run(token, state):
+    return ReportRun.parse_obj({**REPORT_RUN, "token": token, "state": state})
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class FakeRuns:
+    """Runs that finish once the fake clock reaches their finish time."""
+
+    def __init__(self, clock, finish_at, final="succeeded"):
+        self.clock = clock
+        self.finish_at = finish_at
+        self.final = final
+        self.polls = []
+
+    def __call__(self, report, run):
+        self.polls.append((self.clock.now, run))
+        if run not in self.finish_at:
+            raise httpx.HTTPStatusError(
+                "404", request=httpx.Request("GET", "/"), response=httpx.Response(404)
+            )
+        done = self.clock.now >= self.finish_at[run]
+        return report_run(run, self.final if done else "running_notebook")
+
+
+class TestPollPolicy(unittest.TestCase):
+    def test_seeded_from_expected_runtime(self):
+        delays = PollPolicy().delays(expected_runtime=20)
+        self.assertEqual(list(itertools.islice(delays, 4)), [20, 5, 7.5, 11.25])
+
+    def test_unseeded_and_clamped(self):
+        policy = PollPolicy(initial=2, factor=2, max_interval=10)
+        self.assertEqual(list(itertools.islice(policy.delays(), 5)), [2, 4, 8, 10, 10])
+        self.assertEqual(next(policy.delays(expected_runtime=0.1)), 1)
+        self.assertEqual(next(policy.delays(expected_runtime=600)), 10)
+
+
+class TestRunSchedule(unittest.TestCase):
+    def test_pops_runs_in_due_order(self):
+        clock = FakeClock()
+        schedule = RunSchedule(PollPolicy(), clock)
+        schedule.add("r", "slow", expected_runtime=30)
+        schedule.add("r", "fast", expected_runtime=2)
+
+        self.assertEqual(schedule.pop()[1].run, "fast")
+        clock.now = 10
+        delay, pending = schedule.pop()
+        self.assertEqual((delay, pending.run), (20, "slow"))
+        self.assertEqual(len(schedule), 0)
+
+    def test_deadline_caps_the_next_poll(self):
+        clock = FakeClock()
+        schedule = RunSchedule(PollPolicy(), clock)
+        schedule.add("r", "run", expected_runtime=30, timeout=5)
+        delay, pending = schedule.pop()
+
+        self.assertEqual(delay, 5)
+        clock.now = 5
+        with self.assertRaises(WaitTimeout) as raised:
+            schedule.update(pending, report_run("run", "pending"))
+        self.assertEqual(raised.exception.last.state, "pending")
+
+
+class TestRunWaiter(unittest.TestCase):
+    def test_one_loop_tracks_many_runs(self):
+        clock = FakeClock()
+        finish_at = {f"run{i}": 5.0 * (i % 10) for i in range(200)}
+        fetch = FakeRuns(clock, finish_at)
+        waiter = RunWaiter(fetch, PollPolicy(), clock, clock.sleep)
+        for run in finish_at:
+            waiter.add("r", run, expected_runtime=4)
+
+        finished = [(clock.now, run.token) for run in waiter.as_completed()]
+
+        self.assertEqual(len(finished), 200)
+        self.assertEqual(waiter.errors, {})
+        # Runs come back in the order they finish, each right after finishing.
+        for now, token in finished:
+            self.assertLess(now - finish_at[token], 15)
+        times = [now for now, _ in finished]
+        self.assertEqual(sorted(times), times)
+        # Far fewer polls than polling each run every second.
+        every_second = sum(int(at) + 1 for at in finish_at.values())
+        self.assertLess(len(fetch.polls), every_second / 3)
+
+    def test_timeouts_and_errors_do_not_stop_other_runs(self):
+        clock = FakeClock()
+        fetch = FakeRuns(clock, {"ok": 3, "slow": 100})
+        waiter = RunWaiter(fetch, PollPolicy(), clock, clock.sleep)
+        waiter.add("r", "ok")
+        waiter.add("r", "slow", timeout=10)
+        waiter.add("r", "missing")
+
+        self.assertEqual(list(waiter.wait()), ["ok"])
+        self.assertIsInstance(waiter.errors["slow"], WaitTimeout)
+        self.assertIsInstance(waiter.errors["missing"], httpx.HTTPStatusError)
+
+    def test_runs_added_while_iterating(self):
+        clock = FakeClock()
+        fetch = FakeRuns(clock, {"a": 1, "b": 2})
+        waiter = RunWaiter(fetch, PollPolicy(), clock, clock.sleep)
+        waiter.add("r", "a")
+
+        finished = []
+        for run in waiter.as_completed():
+            finished.append(run.token)
+            if run.token == "a":
+                waiter.add("r", "b")
+
+        self.assertEqual(finished, ["a", "b"])
+
+    def test_async(self):
+        clock = FakeClock()
+        fetch = FakeRuns(clock, {"a": 8, "b": 2}, final="failed")
+
+        async def afetch(report, run):
+            return fetch(report, run)
+
+        async def asleep(seconds):
+            clock.sleep(seconds)
+
+        async def run():
+            waiter = AsyncRunWaiter(afetch, PollPolicy(), clock, asleep)
+            waiter.add("r", "a")
+            waiter.add("r", "b")
+            return [run.token async for run in waiter.as_completed()]
+
+        self.assertEqual(asyncio.run(run()), ["b", "a"])
+
+
+class FakeApi:
+    def __init__(self, states):
+        self.states = list(states)
+        self.requests = []
+
+    def __call__(self, request):
+        self.requests.append(request)
+        if request.url.path.endswith("/reports/r"):
+            return httpx.Response(200, json={**REPORT, "expected_runtime": 0.001})
+
+        state = self.states.pop(0) if len(self.states) > 1 else self.states[0]
+        return httpx.Response(200, json={**REPORT_RUN, "state": state})
+
+
+class TestWaitForCompletion(unittest.TestCase):
+    def test_polls_until_finished(self):
+        api = FakeApi(["pending", "enqueued", "running_notebook", "succeeded"])
+        client = ModeClient("ws", "t", "p", transport=httpx.MockTransport(api))
+        run = client.report_run.wait_for_completion("r", "run", policy=FAST)
+
+        self.assertEqual(run.state, "succeeded")
+        paths = [request.url.path for request in api.requests]
+        self.assertEqual(paths[0], "/api/ws/reports/r")
+        self.assertEqual(paths[1:], ["/api/ws/reports/r/runs/run"] * 4)
+
+    def test_polls_bypass_fresh_cache_entries(self):
+        api = FakeApi(["pending", "succeeded"])
+        client = ModeClient(
+            "ws", "t", "p", transport=httpx.MockTransport(api), cache=MemoryCache()
+        )
+        self.assertEqual(client.report_run.get("r", "run").state, "pending")
+        run = client.report_run.wait_for_completion(
+            "r", "run", expected_runtime=0.001, policy=FAST
+        )
+
+        self.assertEqual(run.state, "succeeded")
+        self.assertEqual(client.report_run.get("r", "run").state, "succeeded")
+
+    def test_timeout(self):
+        api = FakeApi(["pending"])
+        client = ModeClient("ws", "t", "p", transport=httpx.MockTransport(api))
+        with self.assertRaises(WaitTimeout) as raised:
+            client.report_run.wait_for_completion(
+                "r", "run", timeout=0.02, expected_runtime=0.001, policy=FAST
+            )
+
+        self.assertEqual(raised.exception.last.state, "pending")
+
+    def test_async(self):
+        api = FakeApi(["pending", "failed"])
+
+        async def handler(request):
+            return api(request)
+
+        async def run():
+            client = AsyncModeClient(
+                "ws", "t", "p", transport=httpx.MockTransport(handler)
+            )
+            return await client.report_run.wait_for_completion("r", "run", policy=FAST)
+
+        self.assertEqual(asyncio.run(run()).state, "failed")
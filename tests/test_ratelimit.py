@@ -0,0 +1,76 @@
+import asyncio
+import unittest
+from unittest.mock import patch
+
+import httpx
+
+from mode_client import ModeClient, TokenBucket, last_request_stats
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_burst_then_paced(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2.0, burst=2, clock=clock)
+        delays = [bucket.reserve() for _ in range(4)]
+        self.assertEqual(delays, [0.0, 0.0, 0.5, 1.0])
+        self.assertEqual(bucket.acquired, 4)
+        self.assertEqual(bucket.waited, 1.5)
+
+    def test_refills_up_to_burst(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=1.0, burst=2, clock=clock)
+        bucket.reserve()
+        bucket.reserve()
+        clock.now = 10.0
+        self.assertEqual([bucket.reserve() for _ in range(3)], [0.0, 0.0, 1.0])
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=0)
+        with self.assertRaises(ValueError):
+            TokenBucket(burst=0)
+
+    @patch("mode_client.ratelimit.time.sleep")
+    def test_acquire_sleeps(self, mock_sleep):
+        bucket = TokenBucket(rate=1.0, burst=1, clock=FakeClock())
+        bucket.acquire()
+        mock_sleep.assert_not_called()
+        self.assertEqual(bucket.acquire(), 1.0)
+        mock_sleep.assert_called_once_with(1.0)
+
+    @patch("mode_client.ratelimit.asyncio.sleep")
+    def test_acquire_async_sleeps(self, mock_sleep):
+        bucket = TokenBucket(rate=4.0, burst=1, clock=FakeClock())
+
+        async def acquire_twice():
+            return [await bucket.acquire_async(), await bucket.acquire_async()]
+
+        self.assertEqual(asyncio.run(acquire_twice()), [0.0, 0.25])
+        mock_sleep.assert_called_once_with(0.25)
+
+
+class TestModeClientRateLimit(unittest.TestCase):
+    @patch("mode_client.ratelimit.time.sleep")
+    def test_limiter_shared_by_subclients(self, mock_sleep):
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, json={}))
+        bucket = TokenBucket(rate=1.0, burst=1, clock=FakeClock())
+        client = ModeClient(
+            "workspace", "token", "password", transport=transport, rate_limiter=bucket
+        )
+
+        client.report.request("GET", "/reports/report_id")
+        self.assertEqual(last_request_stats().rate_limit_wait, 0.0)
+        client.space.request("GET", "/spaces/space_id")
+        stats = last_request_stats()
+        self.assertEqual(stats.rate_limit_wait, 1.0)
+        self.assertEqual(stats.resource, "/spaces/space_id")
+        self.assertEqual(stats.status_code, 200)
+        self.assertEqual(bucket.acquired, 2)
@@ -0,0 +1,107 @@
+import asyncio
+import unittest
+
+import httpx
+from conftest import fixture
+
+from mode_client import AsyncModeClient, ModeClient
+from mode_client.models import Report
+from mode_client.records import (
+    RECORD_MODELS,
+    DefinitionRecord,
+    QueryRecord,
+    QueryRunRecord,
+    ReportRecord,
+    ReportRunRecord,
+    SpaceRecord,
+    make_records,
+)
+
+RECORDS = {
+    "definition": DefinitionRecord,
+    "query": QueryRecord,
+    "query_run": QueryRunRecord,
+    "report": ReportRecord,
+    "report_run": ReportRunRecord,
+    "space": SpaceRecord,
+}
+
+
+class TestRecords(unittest.TestCase):
+    def test_fields_mirror_models(self):
+        for record, model in RECORD_MODELS.items():
+            with self.subTest(record.__name__):
+                self.assertEqual(list(record._fields), list(model.__fields__))
+                self.assertEqual(record._fields[-1], "links")
+
+    def test_values_match_validated_models(self):
+        for name, record in RECORDS.items():
+            with self.subTest(name):
+                data = fixture(name)
+                [item] = make_records(record, [data], links=True)
+                model = RECORD_MODELS[record].parse_obj(data)
+
+                for field in record._fields[:-1]:
+                    self.assertEqual(getattr(item, field), getattr(model, field))
+                self.assertEqual(item.links, data["_links"])
+
+    def test_links_are_dropped_by_default(self):
+        [item] = make_records(ReportRecord, [fixture("report")], links=False)
+        self.assertIsNone(item.links)
+
+    def test_to_model(self):
+        data = fixture("report")
+        [with_links] = make_records(ReportRecord, [data], links=True)
+        [without_links] = make_records(ReportRecord, [data], links=False)
+
+        self.assertEqual(with_links.to_model(), Report.parse_obj(data))
+        report = without_links.to_model()
+        self.assertIsInstance(report, Report)
+        self.assertIsNone(report.links)
+        self.assertEqual(report.name, data["name"])
+
+    def test_missing_optional_fields(self):
+        data = fixture("report_run")
+        del data["purge_started_at"]
+        [item] = make_records(ReportRunRecord, [data], links=False)
+        self.assertIsNone(item.purge_started_at)
+
+
+def fake_api(request):
+    pages = {
+        "1": {
+            "_embedded": {"reports": [fixture("report")] * 2},
+            "_links": {"next_page": {"href": "/api/ws/spaces/s/reports?page=2"}},
+        },
+        "2": {"_embedded": {"reports": [fixture("report")]}},
+    }
+    return httpx.Response(200, json=pages[request.url.params.get("page", "1")])
+
+
+class TestIterRecords(unittest.TestCase):
+    def test_sync(self):
+        client = ModeClient("ws", "t", "p", transport=httpx.MockTransport(fake_api))
+        records = list(client.report.iter_records("s"))
+
+        self.assertEqual(len(records), 3)
+        self.assertTrue(all(isinstance(r, ReportRecord) for r in records))
+        self.assertIsNone(records[0].links)
+
+    def test_keep_links(self):
+        client = ModeClient("ws", "t", "p", transport=httpx.MockTransport(fake_api))
+        [record] = client.report.iter_records("s", links=True, max_items=1)
+        self.assertEqual(record.to_model(), Report.parse_obj(fixture("report")))
+
+    def test_async(self):
+        async def handler(request):
+            return fake_api(request)
+
+        async def run():
+            client = AsyncModeClient(
+                "ws", "t", "p", transport=httpx.MockTransport(handler)
+            )
+            return [record async for record in client.report.iter_records("s")]
+
+        records = asyncio.run(run())
+        self.assertEqual(len(records), 3)
+        self.assertIsInstance(records[0], ReportRecord)
@@ -0,0 +1,148 @@
+import asyncio
+import io
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+import httpx
+
+from mode_client import AsyncModeClient, ModeClient
+from mode_client.results import CsvRowParser, JsonRowParser
+
+CSV = (
+    'id,name,notes\r\n1,alpha,"multi\nline, quoted ""text"""\r\n'
+    "2,beta,\r\n3,gamma,plain\r\n"
+)
+CSV_ROWS = [
+    {"id": "1", "name": "alpha", "notes": 'multi\nline, quoted "text"'},
+    {"id": "2", "name": "beta", "notes": ""},
+    {"id": "3", "name": "gamma", "notes": "plain"},
+]
+JSON_ROWS = [{"id": 1, "name": "älpha"}, {"id": 2, "name": "beta"}, 3.5]
+
+
+def chunks(data, size):
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+def parse(parser, data, size):
+    rows = []
+    for chunk in chunks(data, size):
+        rows.extend(parser.feed(chunk))
+    return rows + parser.close()
+
+
+class TestRowParsers(unittest.TestCase):
+    def test_csv_across_chunk_boundaries(self):
+        data = CSV.encode()
+        for size in (1, 2, 7, len(data)):
+            with self.subTest(size=size):
+                self.assertEqual(parse(CsvRowParser(), data, size), CSV_ROWS)
+
+    def test_csv_without_trailing_newline(self):
+        data = b"\xef\xbb\xbfa,b\n1,2\n\n3,4"
+        self.assertEqual(
+            parse(CsvRowParser(), data, 3), [{"a": "1", "b": "2"}, {"a": "3", "b": "4"}]
+        )
+
+    def test_json_array_and_lines(self):
+        array = json.dumps(JSON_ROWS, indent=2, ensure_ascii=False).encode()
+        lines = "\n".join(json.dumps(row) for row in JSON_ROWS).encode()
+        for data in (array, lines):
+            for size in (1, 5, len(data)):
+                with self.subTest(data=data[:10], size=size):
+                    self.assertEqual(parse(JsonRowParser(), data, size), JSON_ROWS)
+
+    def test_json_keeps_only_the_incomplete_tail(self):
+        rows = [{"id": i} for i in range(10_000)]
+        data = json.dumps(rows).encode()
+        cut = data.rindex(b"{") + 5
+        parser = JsonRowParser()
+        self.assertEqual(parser.feed(data[:cut]), rows[:-1])
+        self.assertEqual(parser._buffer, '{"id"')
+        self.assertEqual(parser.feed(data[cut:]) + parser.close(), rows[-1:])
+
+    def test_truncated_json_raises(self):
+        parser = JsonRowParser()
+        parser.feed(b'[{"id": 1}, {"id"')
+        with self.assertRaises(ValueError):
+            parser.close()
+
+
+class Api:
+    def __init__(self):
+        self.paths = []
+
+    def __call__(self, request):
+        self.paths.append(request.url.path)
+        body = CSV.encode() if request.url.path.endswith(".csv") else b"[]"
+        return httpx.Response(200, content=body)
+
+
+class TestStreamResults(unittest.TestCase):
+    def setUp(self):
+        self.api = Api()
+        self.client = ModeClient(
+            "ws", "token", "password", transport=httpx.MockTransport(self.api)
+        )
+
+    def test_stream_to_path(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "results.csv"
+            stats = self.client.query_run.stream_results("r", "run", "qr", path)
+            self.assertEqual(path.read_bytes(), CSV.encode())
+
+        self.assertEqual(stats.size, len(CSV.encode()))
+        self.assertGreater(stats.mb_per_s, 0)
+        self.assertEqual(
+            self.api.paths,
+            ["/api/ws/reports/r/runs/run/query_runs/qr/results/content.csv"],
+        )
+
+    def test_stream_to_file_object(self):
+        buffer = io.BytesIO()
+        self.client.query_run.stream_results(
+            "r", "run", "qr", buffer, format="json", chunk_size=1
+        )
+        self.assertEqual(buffer.getvalue(), b"[]")
+        self.assertTrue(self.api.paths[0].endswith("/content.json"))
+
+    def test_iter_result_rows(self):
+        rows = self.client.query_run.iter_result_rows("r", "run", "qr", chunk_size=4)
+        self.assertEqual(list(rows), CSV_ROWS)
+
+    def test_http_errors_raise(self):
+        client = ModeClient(
+            "ws",
+            "token",
+            "password",
+            transport=httpx.MockTransport(lambda request: httpx.Response(404)),
+        )
+        with self.assertRaises(httpx.HTTPStatusError):
+            client.query_run.stream_results("r", "run", "qr", io.BytesIO())
+
+    def test_async(self):
+        api = Api()
+
+        async def handler(request):
+            return api(request)
+
+        async def run():
+            client = AsyncModeClient(
+                "ws", "token", "password", transport=httpx.MockTransport(handler)
+            )
+            buffer = io.BytesIO()
+            stats = await client.query_run.stream_results("r", "run", "qr", buffer)
+            rows = [
+                row
+                async for row in client.query_run.iter_result_rows(
+                    "r", "run", "qr", chunk_size=3
+                )
+            ]
+            return buffer.getvalue(), stats, rows
+
+        content, stats, rows = asyncio.run(run())
+        self.assertEqual(content, CSV.encode())
+        self.assertEqual(stats.size, len(content))
+        self.assertEqual(rows, CSV_ROWS)
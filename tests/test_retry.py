@@ -0,0 +1,118 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from unittest.mock import patch
+
+import httpx
+
+from mode_client import ModeClient, RetryPolicy, last_request_stats
+from mode_client.retry import parse_retry_after
+
+
+def sequence_transport(*responses):
+    remaining = list(responses)
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        response = remaining.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    return httpx.MockTransport(handler), calls
+
+
+class TestRetryPolicy(unittest.TestCase):
+    def test_exponential_backoff_without_jitter(self):
+        policy = RetryPolicy(backoff=0.5, max_backoff=3.0, jitter=False)
+        delays = [policy.backoff_delay(attempt) for attempt in range(1, 6)]
+        self.assertEqual(delays, [0.5, 1.0, 2.0, 3.0, 3.0])
+
+    def test_jitter_stays_below_backoff(self):
+        policy = RetryPolicy(backoff=1.0)
+        for attempt in range(1, 5):
+            self.assertLessEqual(policy.backoff_delay(attempt), 2 ** (attempt - 1))
+
+    def test_retry_after_seconds(self):
+        response = httpx.Response(429, headers={"Retry-After": "7"})
+        self.assertEqual(RetryPolicy().backoff_delay(1, response), 7.0)
+
+    def test_retry_after_http_date(self):
+        retry_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+        response = httpx.Response(
+            503, headers={"Retry-After": format_datetime(retry_at, usegmt=True)}
+        )
+        self.assertAlmostEqual(parse_retry_after(response), 30, delta=2)
+
+    def test_invalid_retry_after_is_ignored(self):
+        response = httpx.Response(429, headers={"Retry-After": "soon"})
+        self.assertIsNone(parse_retry_after(response))
+
+    def test_only_safe_methods_by_default(self):
+        policy = RetryPolicy(jitter=False)
+        response = httpx.Response(502)
+        self.assertEqual(policy.retry_delay("GET", 1, 0.0, response), 1.0)
+        self.assertIsNone(policy.retry_delay("POST", 1, 0.0, response))
+        self.assertIsNone(policy.retry_delay("PATCH", 1, 0.0, response))
+
+        opt_in = RetryPolicy(methods=frozenset({"GET", "POST"}), jitter=False)
+        self.assertEqual(opt_in.retry_delay("POST", 1, 0.0, response), 1.0)
+
+    def test_stops_on_attempts_elapsed_and_status(self):
+        policy = RetryPolicy(max_attempts=3, max_elapsed=10.0, jitter=False)
+        self.assertIsNone(policy.retry_delay("GET", 3, 0.0, httpx.Response(502)))
+        self.assertIsNone(policy.retry_delay("GET", 1, 9.5, httpx.Response(502)))
+        self.assertIsNone(policy.retry_delay("GET", 1, 0.0, httpx.Response(404)))
+
+
+@patch("mode_client.clients.time.sleep")
+class TestModeBaseClientRetry(unittest.TestCase):
+    def client(self, transport, **policy):
+        retry = RetryPolicy(jitter=False, **policy)
+        return ModeClient(
+            "workspace", "token", "password", transport=transport, retry=retry
+        )
+
+    def test_retries_until_success(self, mock_sleep):
+        transport, calls = sequence_transport(
+            httpx.Response(429, headers={"Retry-After": "2"}),
+            httpx.Response(502),
+            httpx.Response(200, json={"ok": True}),
+        )
+        response = self.client(transport).report.request("GET", "/reports/r")
+
+        self.assertEqual(response, {"ok": True})
+        self.assertEqual(len(calls), 3)
+        self.assertEqual([c.args[0] for c in mock_sleep.call_args_list], [2.0, 2.0])
+        stats = last_request_stats()
+        self.assertEqual((stats.retries, stats.backoff), (2, 4.0))
+        self.assertEqual(stats.status_code, 200)
+
+    def test_retries_transport_errors(self, mock_sleep):
+        transport, calls = sequence_transport(
+            httpx.ConnectError("refused"), httpx.Response(200, json={})
+        )
+        self.client(transport).report.request("GET", "/reports/r")
+        self.assertEqual(len(calls), 2)
+
+    def test_gives_up_after_max_attempts(self, mock_sleep):
+        transport, calls = sequence_transport(*[httpx.Response(503)] * 3)
+        with self.assertRaises(httpx.HTTPStatusError):
+            self.client(transport, max_attempts=3).report.request("GET", "/reports/r")
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(last_request_stats().retries, 2)
+
+    def test_post_is_not_replayed_by_default(self, mock_sleep):
+        transport, calls = sequence_transport(httpx.Response(502))
+        with self.assertRaises(httpx.HTTPStatusError):
+            self.client(transport).report.request("POST", "/reports/r/runs")
+        self.assertEqual(len(calls), 1)
+        mock_sleep.assert_not_called()
+
+    def test_no_policy_raises_immediately(self, mock_sleep):
+        transport, calls = sequence_transport(httpx.Response(429))
+        client = ModeClient("workspace", "token", "password", transport=transport)
+        with self.assertRaises(httpx.HTTPStatusError):
+            client.report.request("GET", "/reports/r")
+        self.assertEqual(len(calls), 1)
@@ -0,0 +1,149 @@
+import asyncio
+import itertools
+import json
+import re
+import unittest
+
+import httpx
+from conftest import fixture
+
+from mode_client import AsyncModeClient, ModeClient, PollPolicy
+from mode_client.runner import RunJob
+
+REPORT_RUN = fixture("report_run")
+
+FAST = PollPolicy(initial=0.001, min_interval=0, max_interval=0.005)
+
+
+class FakeMode:
+    """Runs finish after a few polls; reports named ``fail*`` fail ``failures``
+    times before succeeding, and ``missing`` doesn't exist."""
+
+    def __init__(self, polls_to_finish=3, failures=1):
+        self.polls_to_finish = polls_to_finish
+        self.failures = failures
+        self.tokens = (f"run{i}" for i in itertools.count())
+        self.runs = {}
+        self.failed = {}
+        self.created = []
+        self.max_in_flight = 0
+
+    def __call__(self, request):
+        match = re.search(r"/reports/(\w+)/runs(?:/(\w+))?$", request.url.path)
+        report, token = match.groups()
+        if report == "missing":
+            return httpx.Response(404)
+
+        if request.method == "POST":
+            token = next(self.tokens)
+            self.runs[token] = [report, 0]
+            self.created.append((report, json.loads(request.content)))
+            in_flight = sum(polls >= 0 for _, polls in self.runs.values())
+            self.max_in_flight = max(self.max_in_flight, in_flight)
+            return self.respond(token, "pending")
+
+        run = self.runs[token]
+        run[1] += 1
+        if run[1] < self.polls_to_finish:
+            return self.respond(token, "running_notebook")
+
+        run[1] = -1
+        if report.startswith("fail") and self.failed.get(report, 0) < self.failures:
+            self.failed[report] = self.failed.get(report, 0) + 1
+            return self.respond(token, "failed")
+        return self.respond(token, "succeeded")
+
+    def respond(self, token, state):
+        return httpx.Response(200, json={**REPORT_RUN, "token": token, "state": state})
+
+
+class TestRunMany(unittest.TestCase):
+    def run_many(self, mode, jobs, **kwargs):
+        client = ModeClient("ws", "t", "p", transport=httpx.MockTransport(mode))
+        return list(client.report_run.run_many(jobs, policy=FAST, **kwargs))
+
+    def test_caps_in_flight_runs(self):
+        mode = FakeMode()
+        jobs = [(f"r{i}", {"day": i}) for i in range(25)]
+        outcomes = self.run_many(mode, jobs, max_in_flight=4)
+
+        self.assertEqual(len(outcomes), 25)
+        self.assertTrue(all(outcome.ok for outcome in outcomes))
+        self.assertEqual(mode.max_in_flight, 4)
+        self.assertEqual(
+            sorted(outcome.job for outcome in outcomes),
+            sorted(RunJob(*job) for job in jobs),
+        )
+        self.assertEqual(mode.created[3], ("r3", {"parameters": {"day": 3}}))
+
+    def test_jobs_are_consumed_lazily(self):
+        mode = FakeMode()
+        jobs = (RunJob(f"r{i}") for i in range(10))
+        client = ModeClient("ws", "t", "p", transport=httpx.MockTransport(mode))
+        outcomes = client.report_run.run_many(jobs, max_in_flight=2, policy=FAST)
+
+        next(outcomes)
+        self.assertLessEqual(len(mode.created), 3)
+
+    def test_jobs_without_parameters(self):
+        self.assertIsNone(RunJob("r").parameters)
+        mode = FakeMode()
+        self.run_many(mode, [RunJob("r1"), RunJob("r2")])
+        self.assertEqual(
+            sorted(mode.created),
+            [("r1", {"parameters": {}}), ("r2", {"parameters": {}})],
+        )
+
+    def test_retries_failed_runs(self):
+        mode = FakeMode(failures=1)
+        outcomes = self.run_many(mode, [("fail", {}), ("ok", {})], retries=2)
+        by_report = {outcome.job.report: outcome for outcome in outcomes}
+
+        self.assertTrue(by_report["fail"].ok)
+        self.assertEqual(by_report["fail"].attempts, 2)
+        self.assertEqual(by_report["ok"].attempts, 1)
+
+    def test_gives_up_after_retries(self):
+        mode = FakeMode(failures=5)
+        [outcome] = self.run_many(mode, [("fail", {})], retries=1)
+
+        self.assertFalse(outcome.ok)
+        self.assertEqual(outcome.run.state, "failed")
+        self.assertEqual(outcome.attempts, 2)
+
+    def test_errors_are_reported_per_job(self):
+        outcomes = self.run_many(FakeMode(), [("missing", {}), ("ok", {})])
+        by_report = {outcome.job.report: outcome for outcome in outcomes}
+
+        self.assertIsInstance(by_report["missing"].error, httpx.HTTPStatusError)
+        self.assertTrue(by_report["ok"].ok)
+
+    def test_timeouts(self):
+        mode = FakeMode(polls_to_finish=10**6)
+        [outcome] = self.run_many(mode, [("slow", {})], timeout=0.02)
+
+        self.assertFalse(outcome.ok)
+        self.assertIsInstance(outcome.error, TimeoutError)
+
+    def test_async(self):
+        mode = FakeMode()
+
+        async def handler(request):
+            return mode(request)
+
+        async def run():
+            client = AsyncModeClient(
+                "ws", "t", "p", transport=httpx.MockTransport(handler)
+            )
+            jobs = [(f"r{i}", {}) for i in range(6)] + [("fail", {})]
+            return [
+                outcome
+                async for outcome in client.report_run.run_many(
+                    jobs, max_in_flight=3, retries=1, policy=FAST
+                )
+            ]
+
+        outcomes = asyncio.run(run())
+        self.assertEqual(len(outcomes), 7)
+        self.assertTrue(all(outcome.ok for outcome in outcomes))
+        self.assertEqual(mode.max_in_flight, 3)
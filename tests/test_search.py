@@ -0,0 +1,171 @@
+import asyncio
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+import httpx
+from conftest import fixture
+
+from mode_client import AsyncModeClient, ModeClient
+from mode_client.models import Query
+from mode_client.search import SearchIndex, identifiers
+from mode_client.snapshot import SnapshotRecord, SqliteSnapshot, Task
+
+
+def query(token, raw_query, name="Query"):
+    return {**fixture("query"), "token": token, "raw_query": raw_query, "name": name}
+
+
+class TestIdentifiers(unittest.TestCase):
+    def test_dotted_names_and_suffixes(self):
+        self.assertEqual(
+            identifiers("SELECT o.id FROM analytics.public.orders o"),
+            {
+                "o.id",
+                "id",
+                "o",
+                "analytics.public.orders",
+                "public.orders",
+                "orders",
+            },
+        )
+
+    def test_skips_comments_strings_and_keywords(self):
+        sql = """
+        -- legacy.users is gone
+        /* so is legacy.accounts */
+        SELECT name FROM "Sales"."Leads" WHERE note = 'from legacy.orders'
+        """
+        self.assertEqual(identifiers(sql), {"name", "sales.leads", "leads", "note"})
+
+
+class TestSearchIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = SearchIndex()
+        self.addCleanup(self.index.close)
+        self.index.add_queries(
+            [
+                query("q1", "SELECT * FROM legacy.orders JOIN users USING (id)"),
+                query("q2", "SELECT count(*) FROM public.orders", name="Order count"),
+                query("q3", "SELECT * FROM users -- not legacy.orders"),
+            ],
+            report="r1",
+        )
+        self.index.add_definitions([fixture("definition")])
+
+    def tokens(self, hits):
+        return [hit.token for hit in hits]
+
+    def test_references(self):
+        self.assertEqual(self.tokens(self.index.references("legacy.orders")), ["q1"])
+        self.assertEqual(self.tokens(self.index.references("orders")), ["q1", "q2"])
+        self.assertEqual(self.tokens(self.index.references("USERS")), ["q1", "q3"])
+        self.assertEqual(
+            self.tokens(self.index.references("tutorial.dunder_mifflin_paper_sales")),
+            [fixture("definition")["token"]],
+        )
+        self.assertEqual(self.index.references("orders", kind="definition"), [])
+
+        hit = self.index.references("public.orders")[0]
+        self.assertEqual(
+            (hit.kind, hit.parent, hit.name), ("query", "r1", "Order count")
+        )
+
+    def test_search(self):
+        self.assertEqual(sorted(self.tokens(self.index.search("users"))), ["q1", "q3"])
+        self.assertEqual(self.tokens(self.index.search("legacy NOT users")), [])
+        hit = self.index.search("count")[0]
+        self.assertEqual(hit.token, "q2")
+        self.assertIn("[count]", hit.snippet)
+
+    def test_grep(self):
+        self.assertEqual(self.tokens(self.index.grep(r"from\s+legacy\.")), ["q1"])
+        self.assertEqual(
+            self.tokens(self.index.grep(r"amount > 0")),
+            [fixture("definition")["token"]],
+        )
+        self.assertEqual(self.index.grep("users", kind="definition"), [])
+
+    def test_updates_and_removals(self):
+        self.index.add_query(Query.parse_obj(query("q1", "SELECT 1 FROM fresh")), "r1")
+        self.index.remove("query", "q3")
+
+        self.assertEqual(self.index.references("legacy.orders"), [])
+        self.assertEqual(self.tokens(self.index.references("fresh")), ["q1"])
+        self.assertEqual(self.tokens(self.index.search("users")), [])
+        self.assertEqual(len(self.index), 3)
+
+    def test_add_snapshot(self):
+        path = Path(tempfile.mkdtemp()) / "snapshot.db"
+        with SqliteSnapshot(path) as snapshot:
+            snapshot.start([Task("queries", ("r9",))])
+            snapshot.commit(
+                Task("queries", ("r9",)),
+                [SnapshotRecord("query", "q9", "r9", query("q9", "SELECT * FROM x.y"))],
+                [],
+            )
+
+        self.assertEqual(self.index.add_snapshot(path), 1)
+        hit = self.index.references("x.y")[0]
+        self.assertEqual((hit.token, hit.parent), ("q9", "r9"))
+
+
+class Workspace:
+    """Answers query writes with the query as written."""
+
+    def __call__(self, request):
+        path = request.url.path.replace("/api/ws", "", 1)
+        if request.method == "DELETE":
+            return httpx.Response(204)
+
+        body = json.loads(request.content)["query"]
+        token = "new" if request.method == "POST" else path.rsplit("/", 1)[1]
+        return httpx.Response(200, json=query(token, body["raw_query"]))
+
+
+class TestClientUpdates(unittest.TestCase):
+    def setUp(self):
+        self.index = SearchIndex()
+        self.addCleanup(self.index.close)
+        self.index.add_queries([query("q1", "SELECT * FROM legacy.orders")], "r1")
+
+    def test_writes_through_the_client(self):
+        client = ModeClient(
+            "ws",
+            "t",
+            "p",
+            transport=httpx.MockTransport(Workspace()),
+            search_index=self.index,
+        )
+        client.query.update("r1", "q1", raw_query="SELECT * FROM orders_v2")
+        client.query.create("r1", "SELECT * FROM orders_v2 JOIN users", 1, "New")
+
+        self.assertEqual(self.index.references("legacy.orders"), [])
+        hits = self.index.references("orders_v2")
+        self.assertEqual(
+            [(h.token, h.parent) for h in hits], [("new", "r1"), ("q1", "r1")]
+        )
+
+        client.query.delete("r1", "q1")
+        self.assertEqual([h.token for h in self.index.references("orders_v2")], ["new"])
+
+        client.report.delete("r1")
+        self.assertEqual(len(self.index), 0)
+
+    def test_async_writes(self):
+        async def handler(request):
+            return Workspace()(request)
+
+        async def write():
+            client = AsyncModeClient(
+                "ws",
+                "t",
+                "p",
+                transport=httpx.MockTransport(handler),
+                search_index=self.index,
+            )
+            await client.query.update("r1", "q1", raw_query="SELECT 1 FROM fresh")
+
+        asyncio.run(write())
+        self.assertEqual([h.token for h in self.index.references("fresh")], ["q1"])
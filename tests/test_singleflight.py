@@ -0,0 +1,168 @@
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+from conftest import fixture
+
+from mode_client import AsyncModeClient, ModeClient
+from mode_client.models import Report
+from mode_client.records import ReportRecord
+from mode_client.singleflight import SingleFlight
+
+REPORT = fixture("report")
+
+
+class GatedApi:
+    """Holds every response until ``release`` is set so callers overlap."""
+
+    def __init__(self, status=200, body=REPORT):
+        self.status = status
+        self.body = body
+        self.release = threading.Event()
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def __call__(self, request):
+        with self.lock:
+            self.requests.append(request)
+        self.release.wait(5)
+        return httpx.Response(self.status, json=self.body)
+
+
+class TestSingleFlight(unittest.TestCase):
+    def test_concurrent_calls_share_result(self):
+        group = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def work():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return object()
+
+        with ThreadPoolExecutor(4) as executor:
+            leader = executor.submit(group.do, "key", work)
+            started.wait(5)
+            followers = [executor.submit(group.do, "key", work) for _ in range(3)]
+            while group.shared < 3:
+                time.sleep(0.001)
+            release.set()
+            results = [leader.result()] + [f.result() for f in followers]
+
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(r is results[0] for r in results))
+
+    def test_sequential_calls_are_not_shared(self):
+        group = SingleFlight()
+        self.assertEqual([group.do("key", lambda: n) for n in range(2)], [0, 1])
+
+
+class TestCoalescedClient(unittest.TestCase):
+    def run_concurrently(self, client, fn, n=8):
+        with ThreadPoolExecutor(n) as executor:
+            futures = [executor.submit(fn) for _ in range(n)]
+            while client.single_flight.shared < n - 1:
+                time.sleep(0.001)
+            self.api.release.set()
+            return [f.result() for f in futures]
+
+    def client(self, api):
+        self.api = api
+        return ModeClient(
+            "ws", "token", "password", transport=httpx.MockTransport(api), coalesce=True
+        )
+
+    def test_identical_gets_share_one_request(self):
+        client = self.client(GatedApi())
+        reports = self.run_concurrently(client, lambda: client.report.get("r1"))
+
+        self.assertEqual(len(self.api.requests), 1)
+        self.assertTrue(all(r is reports[0] for r in reports))
+
+    def test_errors_reach_every_caller(self):
+        client = self.client(GatedApi(status=404))
+
+        def get():
+            try:
+                client.report.get("r1")
+            except httpx.HTTPStatusError as error:
+                return error
+
+        errors = self.run_concurrently(client, get)
+        self.assertEqual(len(self.api.requests), 1)
+        self.assertTrue(all(isinstance(e, httpx.HTTPStatusError) for e in errors))
+
+    def test_different_urls_and_writes_are_not_coalesced(self):
+        api = GatedApi()
+        api.release.set()
+        client = self.client(api)
+        with ThreadPoolExecutor(4) as executor:
+            list(executor.map(client.report.get, ["r1", "r2"]))
+            list(executor.map(lambda _: client.report.archive("r1"), range(2)))
+        self.assertEqual(len(api.requests), 4)
+
+    def test_different_shapes_are_not_coalesced(self):
+        api = GatedApi(body={"_embedded": {"reports": [REPORT]}})
+        client = self.client(api)
+        with ThreadPoolExecutor(2) as executor:
+            models = executor.submit(lambda: list(client.report.iter_reports("s")))
+            records = executor.submit(lambda: list(client.report.iter_records("s")))
+            while len(api.requests) < 2 and client.single_flight.shared == 0:
+                time.sleep(0.001)
+            api.release.set()
+
+        self.assertEqual(len(api.requests), 2)
+        self.assertIsInstance(models.result()[0], Report)
+        self.assertIsInstance(records.result()[0], ReportRecord)
+
+    def test_refreshes_are_not_coalesced_with_gets(self):
+        api = GatedApi(body=fixture("report_run"))
+        client = self.client(api)
+        with ThreadPoolExecutor(2) as executor:
+            runs = [
+                executor.submit(client.report_run.get, "r1", "run1"),
+                executor.submit(client.report_run.poll, "r1", "run1"),
+            ]
+            while len(api.requests) < 2 and client.single_flight.shared == 0:
+                time.sleep(0.001)
+            api.release.set()
+
+        self.assertEqual(len(api.requests), 2)
+        self.assertEqual(runs[0].result(), runs[1].result())
+
+    def test_disabled_by_default(self):
+        client = ModeClient("ws", "token", "password")
+        self.assertIsNone(client.report.single_flight)
+
+
+class TestAsyncCoalescedClient(unittest.TestCase):
+    def test_identical_gets_share_one_request(self):
+        requests = []
+
+        async def handler(request):
+            requests.append(request)
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, json=REPORT)
+
+        client = AsyncModeClient(
+            "ws",
+            "token",
+            "password",
+            transport=httpx.MockTransport(handler),
+            coalesce=True,
+        )
+
+        async def run():
+            return await asyncio.gather(
+                *(client.report.get("r1") for _ in range(10)), client.report.get("r2")
+            )
+
+        reports = asyncio.run(run())
+        self.assertEqual(len(requests), 2)
+        self.assertTrue(all(r is reports[0] for r in reports[:10]))
+        self.assertEqual(client.single_flight.shared, 9)
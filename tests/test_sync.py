@@ -0,0 +1,230 @@
+import asyncio
+import re
+import tempfile
+import unittest
+from pathlib import Path
+
+import httpx
+from conftest import fixture
+
+from mode_client import AsyncModeClient, ModeClient
+from mode_client.sync import AsyncWorkspaceSync, SyncStore, WorkspaceSync
+
+
+def timestamp(minute):
+    return f"2022-08-30T09:{minute:02d}:00.000Z"
+
+
+class FakeWorkspace:
+    """Spaces of reports listed newest first in pages, each report with two
+    queries and a latest run with one query run."""
+
+    def __init__(self, spaces=2, reports=10):
+        self.spaces = {f"s{i}": {} for i in range(spaces)}
+        self.queries = {}
+        for space in self.spaces:
+            for i in range(reports):
+                self.add_report(space, f"{space}r{i}", minute=i)
+        self.requests = []
+
+    def add_report(self, space, token, minute, run="run0"):
+        self.spaces[space][token] = {
+            **fixture("report"),
+            "token": token,
+            "space_token": space,
+            "updated_at": timestamp(minute),
+            "last_successful_run_token": f"{token}{run}",
+        }
+        self.queries[token] = [f"{token}q0", f"{token}q1"]
+
+    def touch(self, space, token, minute, **fields):
+        self.spaces[space][token].update(updated_at=timestamp(minute), **fields)
+
+    def __call__(self, request):
+        path = request.url.path.replace("/api/ws", "", 1)
+        self.requests.append(path)
+        if path == "/spaces":
+            return self.listing("spaces", "space", list(self.spaces))
+        if path == "/definitions":
+            return self.listing("definitions", "definition", ["d0"])
+        if match := re.fullmatch(r"/spaces/(\w+)/reports", path):
+            reports = sorted(
+                self.spaces[match[1]].values(),
+                key=lambda report: report["updated_at"],
+                reverse=True,
+            )
+            page = int(request.url.params["page"])
+            per_page = int(request.url.params["per_page"])
+            body = {
+                "_embedded": {
+                    "reports": reports[(page - 1) * per_page : page * per_page]
+                }
+            }
+            if page * per_page < len(reports):
+                href = f"/api/ws{path}?page={page + 1}&per_page={per_page}"
+                body["_links"] = {"next_page": {"href": href}}
+            return httpx.Response(200, json=body)
+        if match := re.fullmatch(r"/reports/(\w+)/queries", path):
+            return self.listing("queries", "query", self.queries[match[1]])
+        if match := re.fullmatch(r"/reports/\w+/runs/(\w+)/query_runs", path):
+            return self.listing("query_runs", "query_run", [f"{match[1]}qr"])
+        if match := re.fullmatch(r"/reports/\w+/runs/(\w+)", path):
+            return httpx.Response(
+                200, json={**fixture("report_run"), "token": match[1]}
+            )
+        return httpx.Response(404)
+
+    def listing(self, key, name, tokens):
+        items = [{**fixture(name), "token": token} for token in tokens]
+        return httpx.Response(200, json={"_embedded": {key: items}})
+
+
+class TestWorkspaceSync(unittest.TestCase):
+    def setUp(self):
+        self.workspace = FakeWorkspace()
+        self.store = SyncStore(Path(tempfile.mkdtemp()) / "mirror.db")
+        self.addCleanup(self.store.close)
+
+    def sync(self, **kwargs):
+        self.workspace.requests.clear()
+        client = ModeClient(
+            "ws", "t", "p", transport=httpx.MockTransport(self.workspace)
+        )
+        return WorkspaceSync(client, self.store, per_page=4).run(**kwargs)
+
+    def count(self, kind):
+        return self.store._db.execute(
+            "SELECT COUNT(*) FROM records WHERE kind = ?", (kind,)
+        ).fetchone()[0]
+
+    def test_first_sync_lists_everything(self):
+        progress = self.sync()
+
+        self.assertTrue(progress.ok)
+        self.assertEqual(self.count("report"), 20)
+        self.assertEqual(self.count("query"), 40)
+        self.assertEqual(self.count("report_run"), 20)
+        self.assertEqual(self.count("query_run"), 20)
+        self.assertEqual(self.store.watermark("s0"), "2022-08-30T09:09:00+00:00")
+        self.assertEqual(len(self.store.deltas()), 2 + 20 + 40 + 20 + 20 + 1)
+
+    def test_unchanged_workspace(self):
+        self.sync()
+        last = self.store.deltas()[-1].id
+        self.sync()
+
+        # The spaces, one page of reports per space, and the definitions.
+        self.assertEqual(len(self.workspace.requests), 4)
+        self.assertEqual(self.store.deltas(last), [])
+
+    def test_changed_reports(self):
+        self.sync()
+        last = self.store.deltas()[-1].id
+        self.workspace.touch("s0", "s0r3", minute=30, name="Renamed")
+        self.workspace.queries["s0r3"].append("s0r3q2")
+        self.workspace.add_report("s1", "new", minute=31)
+        self.sync()
+
+        self.assertEqual(
+            sorted(self.workspace.requests),
+            [
+                "/definitions",
+                "/reports/new/queries",
+                "/reports/new/runs/newrun0",
+                "/reports/new/runs/newrun0/query_runs",
+                "/reports/s0r3/queries",
+                "/spaces",
+                "/spaces/s0/reports",
+                "/spaces/s1/reports",
+            ],
+        )
+        changes = {(d.op, d.kind, d.token) for d in self.store.deltas(last)}
+        self.assertEqual(
+            changes,
+            {
+                ("upsert", "report", "s0r3"),
+                ("upsert", "query", "s0r3q2"),
+                ("upsert", "report", "new"),
+                ("upsert", "query", "newq0"),
+                ("upsert", "query", "newq1"),
+                ("upsert", "report_run", "newrun0"),
+                ("upsert", "query_run", "newrun0qr"),
+            },
+        )
+        self.assertEqual(self.store.record("report", "s0r3")["name"], "Renamed")
+        self.assertEqual(self.store.watermark("s0"), "2022-08-30T09:30:00+00:00")
+
+    def test_new_runs_replace_old_ones(self):
+        self.sync()
+        last = self.store.deltas()[-1].id
+        self.workspace.touch(
+            "s0", "s0r1", minute=40, last_successful_run_token="s0r1run1"
+        )
+        self.sync()
+
+        changes = {(d.op, d.kind, d.token) for d in self.store.deltas(last)}
+        self.assertIn(("delete", "report_run", "s0r1run0"), changes)
+        self.assertIn(("delete", "query_run", "s0r1run0qr"), changes)
+        self.assertIn(("upsert", "report_run", "s0r1run1"), changes)
+        self.assertIn(("upsert", "query_run", "s0r1run1qr"), changes)
+
+    def test_full_sync_tombstones_deleted_reports(self):
+        self.sync()
+        last = self.store.deltas()[-1].id
+        del self.workspace.spaces["s1"]["s1r2"]
+
+        self.sync()
+        self.assertEqual(self.store.deltas(last), [])
+
+        self.sync(full=True)
+        changes = {(d.op, d.kind, d.token) for d in self.store.deltas(last)}
+        self.assertEqual(
+            changes,
+            {
+                ("delete", "report", "s1r2"),
+                ("delete", "query", "s1r2q0"),
+                ("delete", "query", "s1r2q1"),
+                ("delete", "report_run", "s1r2run0"),
+                ("delete", "query_run", "s1r2run0qr"),
+            },
+        )
+        self.assertIsNone(self.store.record("report", "s1r2"))
+
+    def test_deleted_spaces(self):
+        self.sync()
+        del self.workspace.spaces["s1"]
+        self.sync()
+
+        self.assertEqual(self.count("report"), 10)
+        self.assertEqual(self.count("query_run"), 10)
+        self.assertIsNone(self.store.watermark("s1"))
+
+    def test_full_listing_is_periodic(self):
+        self.sync()
+        client = ModeClient(
+            "ws", "t", "p", transport=httpx.MockTransport(self.workspace)
+        )
+        self.workspace.requests.clear()
+        WorkspaceSync(client, self.store, per_page=4, full_every=0).run()
+
+        pages = [r for r in self.workspace.requests if r.endswith("/reports")]
+        self.assertEqual(len(pages), 6)
+
+    def test_async(self):
+        async def handler(request):
+            return self.workspace(request)
+
+        async def run():
+            client = AsyncModeClient(
+                "ws", "t", "p", transport=httpx.MockTransport(handler)
+            )
+            sync = AsyncWorkspaceSync(client, self.store, per_page=4)
+            await sync.run()
+            self.workspace.touch("s0", "s0r5", minute=50)
+            self.workspace.requests.clear()
+            await sync.run()
+
+        asyncio.run(run())
+        self.assertEqual(self.count("report"), 20)
+        self.assertEqual(self.store.watermark("s0"), "2022-08-30T09:50:00+00:00")
+        self.assertIn("/reports/s0r5/queries", self.workspace.requests)
@@ -0,0 +1,110 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+
+import httpx
+from conftest import fixture
+
+from mode_client import ModeClient
+from mode_client.lazy import construct_model
+from mode_client.models import (
+    QueryRun,
+    Report,
+    ReportRun,
+    TimedQueryRun,
+    TimedReport,
+    TimedReportRun,
+)
+from mode_client.timestamps import parse_timestamp
+
+
+class TestParseTimestamp(unittest.TestCase):
+    def test_formats(self):
+        utc = timezone.utc
+        cases = {
+            "2022-08-30T09:01:55.216Z": datetime(2022, 8, 30, 9, 1, 55, 216000, utc),
+            "2022-08-30T09:01:55Z": datetime(2022, 8, 30, 9, 1, 55, tzinfo=utc),
+            "2022-08-30T09:01:55": datetime(2022, 8, 30, 9, 1, 55, tzinfo=utc),
+            "2022-08-30T11:01:55.2+02:00": datetime(2022, 8, 30, 9, 1, 55, 200000, utc),
+        }
+        for value, expected in cases.items():
+            with self.subTest(value):
+                self.assertEqual(parse_timestamp(value), expected)
+                self.assertIsNotNone(parse_timestamp(value).tzinfo)
+
+
+class TestTimedModels(unittest.TestCase):
+    def test_timestamps_are_datetimes(self):
+        data = fixture("report")
+        report = TimedReport.parse_obj(data)
+
+        self.assertIsInstance(report, Report)
+        self.assertEqual(report.created_at, parse_timestamp(data["created_at"]))
+        self.assertEqual(report.created_at.tzinfo, timezone.utc)
+        self.assertEqual(report.name, data["name"])
+
+    def test_constructed_without_validation(self):
+        data = fixture("report_run")
+        run = construct_model(TimedReportRun, data)
+        self.assertEqual(run, TimedReportRun.parse_obj(data))
+        self.assertIsInstance(run.completed_at, datetime)
+
+    def test_durations(self):
+        run = TimedReportRun.parse_obj(fixture("report_run"))
+        self.assertEqual(run.duration, run.completed_at - run.created_at)
+        self.assertEqual(run.elapsed(), run.duration)
+
+        data = {**fixture("query_run"), "completed_at": None}
+        query_run = TimedQueryRun.parse_obj(data)
+        later = query_run.created_at + timedelta(seconds=5)
+        self.assertIsNone(query_run.duration)
+        self.assertEqual(query_run.elapsed(later), timedelta(seconds=5))
+
+
+def fake_api(request):
+    if request.url.path.endswith("/runs"):
+        return httpx.Response(
+            200,
+            json={
+                "pagination": {
+                    "page": 1,
+                    "per_page": 30,
+                    "count": 1,
+                    "total_pages": 1,
+                    "total_count": 1,
+                },
+                "_embedded": {"report_runs": [fixture("report_run")]},
+            },
+        )
+    if request.url.path.endswith("/query_runs"):
+        return httpx.Response(
+            200, json={"_embedded": {"query_runs": [fixture("query_run")]}}
+        )
+    return httpx.Response(200, json=fixture("report_run"))
+
+
+class TestClientOption(unittest.TestCase):
+    def client(self, **kwargs):
+        transport = httpx.MockTransport(fake_api)
+        return ModeClient("ws", "t", "p", transport=transport, **kwargs)
+
+    def test_parse_timestamps(self):
+        for validate in (True, False):
+            with self.subTest(validate=validate):
+                client = self.client(parse_timestamps=True, validate=validate)
+                run = client.report_run.get("r", "run")
+                [listed] = client.report_run.list("r").report_runs
+
+                for model in (run, listed):
+                    self.assertIsInstance(model, TimedReportRun)
+                    self.assertIsInstance(model.created_at, datetime)
+
+    def test_strings_by_default(self):
+        run = self.client().report_run.get("r", "run")
+        self.assertIs(type(run), ReportRun)
+        self.assertIsInstance(run.created_at, str)
+
+    def test_lists(self):
+        client = self.client(parse_timestamps=True)
+        [query_run] = client.query_run.list("r", "run")
+        self.assertIsInstance(query_run, QueryRun)
+        self.assertIsInstance(query_run.duration, timedelta)